@@ -0,0 +1,74 @@
+"""
+Benchmark de arrays grandes: preenche e percorre arrays int, float e bool
+declarados com tamanho, em cada motor, com os arrays compactos (array.array)
+e com listas de objetos Python, como antes. Mostra o pico de memória da
+execução (tracemalloc) e o tempo, melhor de 3.
+
+Uso: python -m benchmarks.bench_arrays [tamanho]
+"""
+
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from unittest import mock
+from src import runtime
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.minilang import ENGINES
+
+PROGRAM = """
+int n = {size};
+int[{size}] inteiros;
+float[{size}] reais;
+bool[{size}] crivo;
+for (int i = 0; i < n; i = i + 1) {{
+    inteiros[i] = (i * 7919) % n;
+    reais[i] = i / 3;
+    crivo[i] = i % 3 == 0;
+}}
+float total = 0;
+for (int i = 0; i < n; i = i + 1) {{
+    if (crivo[i]) {{
+        total = total + inteiros[i] + reais[i];
+    }}
+}}
+print(total);
+"""
+
+def load_program(size):
+    ast = Parser(Lexer(PROGRAM.format(size=size)).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def run(engine, ast):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engine().interpret(ast)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+def peak_memory(engine, ast):
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine().interpret(ast)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    ast = load_program(size)
+    for name, engine in ENGINES.items():
+        for label, typed in (("compactos", runtime.TYPED_ARRAYS), ("listas", {})):
+            with mock.patch.object(runtime, 'TYPED_ARRAYS', typed):
+                memory = peak_memory(engine, ast)
+                best, result = min(run(engine, ast) for _ in range(3))
+            print(f"arrays de {size} [{name}, {label}]: {memory / 2**20:.1f} MiB, "
+                  f"{best:.3f}s  ({result})")
+
+if __name__ == "__main__":
+    main()
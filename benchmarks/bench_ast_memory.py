@@ -0,0 +1,85 @@
+"""
+Benchmark de memória da AST: bytes por nó e tamanho total da árvore de um
+programa gerado com ~1M de nós, com os nós atuais (__slots__) e com uma
+réplica das classes antigas (instâncias com __dict__).
+
+Uso: python -m benchmarks.bench_ast_memory [nós]
+"""
+
+import sys
+import tracemalloc
+from src import ast_nodes
+from src.lexer import Lexer
+from src.parser import Parser
+
+SNIPPET = """\
+x = a + b * (c - 1) / 2.5;
+if (x > 0 and not done) { print("x = " + x); } else { v[i] = f(x, -y); }
+"""
+
+def fields(node):
+    for cls in type(node).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            yield name, getattr(node, name)
+    yield from getattr(node, '__dict__', {}).items()
+
+def is_node(value):
+    return isinstance(value, (ast_nodes.ASTNode, ast_nodes.Parameter))
+
+def count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for _, value in fields(node):
+            if is_node(value):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if is_node(item))
+    return count
+
+# Réplica do layout anterior: classe comum, atributos no __dict__ da instância
+DICT_CLASSES = {}
+
+def dict_class(cls):
+    if cls not in DICT_CLASSES:
+        DICT_CLASSES[cls] = type(cls.__name__, (), {})
+    return DICT_CLASSES[cls]
+
+def to_dict_layout(node):
+    if isinstance(node, list):
+        return [to_dict_layout(item) for item in node]
+    if not is_node(node):
+        return node
+    copy = dict_class(type(node))()
+    for name, value in fields(node):
+        setattr(copy, name, to_dict_layout(value))
+    return copy
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    probe = Parser(Lexer(SNIPPET).tokenize()).parse()
+    repeats = max(1, target // (count_nodes(probe) - 1))
+    tokens = Lexer(SNIPPET * repeats).tokenize()
+    
+    program, slots_size = traced(lambda: Parser(tokens).parse())
+    nodes = count_nodes(program)
+    # Garante a criação das classes réplica fora da medição
+    to_dict_layout(probe)
+    _, dict_size = traced(lambda: to_dict_layout(program))
+    
+    print(f"{nodes} nós")
+    print(f"  __dict__ (antes):  {dict_size / 1e6:8.1f} MB  ({dict_size / nodes:6.1f} B/nó)")
+    print(f"  __slots__ (agora): {slots_size / 1e6:8.1f} MB  ({slots_size / nodes:6.1f} B/nó)")
+    print(f"  Redução: {dict_size / slots_size:.2f}x")
+
+if __name__ == "__main__":
+    main()
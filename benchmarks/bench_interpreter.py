@@ -0,0 +1,65 @@
+"""
+Benchmark do interpretador com as funções recursivas dos exemplos, em cada
+motor de execução: exemplos/fibonacci.ml com fibonacci(n) em vez de
+fibonacci(10) e exemplos/fatorial.ml com fatorial(50) repetido n * 100
+vezes. Mede só a execução (AST já analisada).
+
+O tempo de recursões profundas no CPython 3.11 depende de onde a pilha de
+frames cruza a fronteira de um bloco de memória (cada cruzamento aloca e
+libera um bloco). Para não medir esse artefato, cada rodada parte de uma
+profundidade de pilha Python diferente e o resultado é a melhor delas.
+
+Uso: python -m benchmarks.bench_interpreter [n]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.minilang import ENGINES
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'exemplos')
+
+# Exemplo, trecho substituído e substituto (com n)
+WORKLOADS = {
+    'fibonacci({n})': ('fibonacci.ml', 'fibonacci(10)', 'fibonacci({n})'),
+    'fatorial(50) x {calls}': (
+        'fatorial.ml', 'print("Fatorial de 5: " + fatorial(5));',
+        'int total = 0;\n'
+        'for (int i = 0; i < {calls}; i = i + 1) {{ total = total + fatorial(50) % 1009; }}\n'
+        'print(total);'),
+}
+
+def load_program(example, old, new):
+    with open(os.path.join(EXAMPLES, example), encoding='utf-8') as file:
+        source = file.read().replace(old, new)
+    ast = Parser(Lexer(source).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+STACK_OFFSETS = range(0, 64, 8)
+
+def run(engine, ast, depth=0):
+    if depth:
+        return run(engine, ast, depth - 1)
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engine().interpret(ast)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    sizes = {'n': n, 'calls': n * 100}
+    for title, (example, old, new) in WORKLOADS.items():
+        ast = load_program(example, old, new.format(**sizes))
+        for name, engine in ENGINES.items():
+            best, result = min(run(engine, ast, depth) for depth in STACK_OFFSETS)
+            print(f"{title.format(**sizes)} [{name}]: {best:.3f}s  ({result})")
+
+if __name__ == "__main__":
+    main()
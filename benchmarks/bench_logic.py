@@ -0,0 +1,89 @@
+"""
+Benchmark de and/or em guardas de laço e de if, com curto-circuito, e de
+expressões aritméticas e relacionais em laços. Mede só a execução de cada
+motor, melhor de 3.
+
+Uso: python -m benchmarks.bench_logic [escala]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.minilang import ENGINES
+
+PROGRAMS = {
+    # Busca linear: a guarda compara o índice e o elemento a cada passo
+    'guarda de laço': """
+int n = {size};
+int[{size}] values;
+for (int i = 0; i < n; i = i + 1) {{
+    values[i] = (i * 7919) % n;
+}}
+int total = 0;
+for (int target = 0; target < {searches}; target = target + 1) {{
+    int i = 0;
+    while (i < n and values[i] != target) {{
+        i = i + 1;
+    }}
+    total = total + i;
+}}
+print(total);
+""",
+    # O lado direito (uma chamada) só executa para um quarto dos valores
+    'filtro com chamada': """
+function primo(x) {{
+    if (x < 2) {{ return false; }}
+    for (int d = 2; d * d <= x; d = d + 1) {{
+        if (x % d == 0) {{ return false; }}
+    }}
+    return true;
+}}
+int count = 0;
+for (int i = 0; i < {filter}; i = i + 1) {{
+    if (i % 4 == 1 and primo(i)) {{
+        count = count + 1;
+    }}
+}}
+print(count);
+""",
+    'aritmética': """
+int total = 0;
+for (int i = 0; i < {loop}; i = i + 1) {{
+    for (int j = 0; j < {loop}; j = j + 1) {{
+        if (i * j % 7 < 3 or i - j > 10) {{
+            total = total + i * 3 - j % 5;
+        }}
+    }}
+}}
+print(total);
+""",
+}
+
+def load_program(source):
+    ast = Parser(Lexer(source).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def run(engine, ast):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engine().interpret(ast)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    sizes = {'size': int(2000 * scale), 'searches': int(200 * scale),
+             'filter': int(20000 * scale), 'loop': int(250 * scale)}
+    for title, template in PROGRAMS.items():
+        ast = load_program(template.format(**sizes))
+        for name, engine in ENGINES.items():
+            best, result = min(run(engine, ast) for _ in range(3))
+            print(f"{title} [{name}]: {best:.3f}s  ({result})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Micro-benchmark de laços: dois for aninhados dentro de uma função, com uma
+variável declarada no bloco interno a cada iteração, em cada motor de
+execução. Mede só a execução, melhor de 3.
+
+Uso: python -m benchmarks.bench_loops [n]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.minilang import ENGINES
+
+PROGRAM = """
+int scale = 3;
+function work(int n) {{
+    int total = 0;
+    for (int i = 0; i < n; i = i + 1) {{
+        for (int j = 0; j < n; j = j + 1) {{
+            int step = i * scale + j;
+            total = total + step;
+        }}
+    }}
+    return total;
+}}
+print(work({n}));
+"""
+
+def load_program(n):
+    ast = Parser(Lexer(PROGRAM.format(n=n)).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def run(engine, ast):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engine().interpret(ast)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    ast = load_program(n)
+    for name, engine in ENGINES.items():
+        best, result = min(run(engine, ast) for _ in range(3))
+        print(f"for aninhado {n}x{n} [{name}]: {best:.3f}s  ({result})")
+
+if __name__ == "__main__":
+    main()
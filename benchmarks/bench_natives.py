@@ -0,0 +1,73 @@
+"""
+Benchmark das funções nativas de arrays: soma, produto escalar e soma
+elemento a elemento escritos como laços do MiniLang e com sum, dot e add.
+Mede só a execução de cada motor, melhor de 3.
+
+Uso: python -m benchmarks.bench_natives [tamanho]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.minilang import ENGINES
+
+SETUP = """
+int n = {size};
+int[{size}] a;
+float[{size}] b;
+float[{size}] c;
+for (int i = 0; i < n; i = i + 1) {{
+    a[i] = (i * 7919) % 1000;
+    b[i] = i / 4;
+}}
+"""
+
+PROGRAMS = {
+    'laços': SETUP + """
+float total = 0;
+for (int i = 0; i < n; i = i + 1) {{
+    total = total + a[i];
+}}
+float produto = 0;
+for (int i = 0; i < n; i = i + 1) {{
+    produto = produto + a[i] * b[i];
+}}
+for (int i = 0; i < n; i = i + 1) {{
+    c[i] = a[i] + b[i];
+}}
+print(total + produto + c[n - 1]);
+""",
+    'nativas': SETUP + """
+float total = sum(a);
+float produto = dot(a, b);
+add(c, a, b);
+print(total + produto + c[n - 1]);
+""",
+}
+
+def load_program(source):
+    ast = Parser(Lexer(source).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def run(engine, ast):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engine().interpret(ast)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for title, template in PROGRAMS.items():
+        ast = load_program(template.format(size=size))
+        for name, engine in ENGINES.items():
+            best, result = min(run(engine, ast) for _ in range(3))
+            print(f"{title} [{name}]: {best:.3f}s  ({result})")
+
+if __name__ == "__main__":
+    main()
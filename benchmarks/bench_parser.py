@@ -0,0 +1,52 @@
+"""
+Benchmark de vazão do parser em código com muitas expressões e em código
+com muitos comandos curtos. Os tokens são gerados uma única vez; mede-se
+apenas Parser.parse().
+
+Uso: python -m benchmarks.bench_parser [linhas]
+"""
+
+import sys
+import time
+from src.lexer import Lexer
+from src.parser import Parser
+
+SNIPPET = """\
+x = a + b * c - (d / e) % f;
+ok = (a < b and c >= d) or not (e == f) or a != 1;
+v[i + 1] = f(a * 2, -b, [1, 2, 3][0]) + g(h(x)) * 3.5;
+print("t" + (a + 1) * (b - 2) / (c + 3));
+"""
+
+STATEMENT_SNIPPET = """\
+int a = 1;
+{ x = a; print(a); }
+if (ok) a = 2; else { b = 3; }
+while (ok) x = x;
+for (i = 0; i < 1; i = i + 1) { }
+bool ok = true;
+"""
+
+def generate_source(lines, snippet=SNIPPET):
+    repeats = max(1, lines // snippet.count('\n'))
+    return snippet * repeats
+
+def measure(name, source):
+    tokens = Lexer(source).tokenize()
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        program = Parser(tokens).parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    print(f"{name}: {len(program.statements)} comandos, {len(tokens)} tokens")
+    print(f"  Parser.parse(): {best:.3f}s  ({len(tokens) / best / 1e6:.2f} M tokens/s)")
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    measure("expressões", generate_source(lines))
+    measure("comandos", generate_source(lines, STATEMENT_SNIPPET))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark de memória dos tokens: lista de objetos Token versus
+CompactTokenStream (buffers array com valores e posições sob demanda).
+
+Uso: python -m benchmarks.bench_tokens [linhas]
+"""
+
+import sys
+import time
+import tracemalloc
+from src.lexer import Lexer
+from benchmarks.bench_lexer import generate_source
+
+def measure(source, method):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = method(Lexer(source))
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tokens, size, elapsed
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = generate_source(lines)
+    print(f"Fonte: {len(source) / 1e6:.1f} MB")
+    
+    tokens, list_size, list_time = measure(source, Lexer.tokenize)
+    count = len(tokens)
+    del tokens
+    stream, compact_size, compact_time = measure(source, Lexer.tokenize_compact)
+    
+    print(f"{count} tokens")
+    print(f"  list[Token]:        {list_size / 1e6:8.1f} MB  ({list_size / count:6.1f} B/token, {list_time:.2f}s)")
+    print(f"  CompactTokenStream: {compact_size / 1e6:8.1f} MB  ({compact_size / count:6.1f} B/token, {compact_time:.2f}s)")
+    print(f"  Redução: {list_size / compact_size:.1f}x")
+
+if __name__ == "__main__":
+    main()
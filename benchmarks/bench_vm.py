@@ -0,0 +1,79 @@
+"""
+Benchmark da máquina virtual de bytecode contra os outros motores em três
+cargas: recursão (fib), laços aninhados e acesso a arrays (bubble sort).
+Mede só a execução, melhor de 3.
+
+Uso: python -m benchmarks.bench_vm [escala]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.minilang import ENGINES
+
+PROGRAMS = {
+    'recursão': """
+function fib(n) {{
+    if (n < 2) {{ return n; }}
+    return fib(n - 1) + fib(n - 2);
+}}
+print(fib({fib}));
+""",
+    'laços': """
+function work(n) {{
+    int total = 0;
+    for (int i = 0; i < n; i = i + 1) {{
+        for (int j = 0; j < n; j = j + 1) {{
+            total = total + i * j % 7;
+        }}
+    }}
+    return total;
+}}
+print(work({loop}));
+""",
+    'arrays': """
+int n = {array};
+int[{array}] values;
+for (int i = 0; i < n; i = i + 1) {{
+    values[i] = (i * 7919) % n;
+}}
+for (int i = 0; i < n; i = i + 1) {{
+    for (int j = 0; j < n - i - 1; j = j + 1) {{
+        if (values[j] > values[j + 1]) {{
+            int tmp = values[j];
+            values[j] = values[j + 1];
+            values[j + 1] = tmp;
+        }}
+    }}
+}}
+print(values[0] + values[n - 1]);
+""",
+}
+
+def load_program(source):
+    ast = Parser(Lexer(source).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def run(engine, ast):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engine().interpret(ast)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    sizes = {'fib': int(20 + 2 * scale), 'loop': int(200 * scale), 'array': int(200 * scale)}
+    for title, template in PROGRAMS.items():
+        ast = load_program(template.format(**sizes))
+        for name, engine in ENGINES.items():
+            best, result = min(run(engine, ast) for _ in range(3))
+            print(f"{title} [{name}]: {best:.3f}s  ({result})")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
 
+# Os nós usam __slots__: a AST é a maior estrutura residente em programas
+# grandes, e cada instância dispensa o __dict__ próprio.
+
 class ASTNode(ABC):
     """Classe base para todos os nós da AST"""
+    __slots__ = ('line', 'column')
+    # Nome do método do Visitor que trata este tipo de nó
+    visit_method = None
+    
     def __init__(self, line=None, column=None):
         self.line = line
         self.column = column
@@ -13,9 +20,18 @@ class ASTNode(ABC):
 # Nós de Expressão
 class Expression(ASTNode):
     """Classe base para expressões"""
-    pass
+    # Tipo exato do valor, anotado pela análise semântica ('int', 'float',
+    # 'string' ou 'bool'); None quando não é garantido em tempo de execução
+    __slots__ = ('static_type',)
+    
+    def __init__(self, line=None, column=None):
+        super().__init__(line, column)
+        self.static_type = None
 
 class BinaryOp(Expression):
+    __slots__ = ('left', 'operator', 'right')
+    visit_method = 'visit_binary_op'
+    
     def __init__(self, left, operator, right, line=None, column=None):
         super().__init__(line, column)
         self.left = left
@@ -26,6 +42,9 @@ class BinaryOp(Expression):
         return visitor.visit_binary_op(self)
 
 class UnaryOp(Expression):
+    __slots__ = ('operator', 'operand')
+    visit_method = 'visit_unary_op'
+    
     def __init__(self, operator, operand, line=None, column=None):
         super().__init__(line, column)
         self.operator = operator
@@ -35,6 +54,9 @@ class UnaryOp(Expression):
         return visitor.visit_unary_op(self)
 
 class Literal(Expression):
+    __slots__ = ('value', 'type')
+    visit_method = 'visit_literal'
+    
     def __init__(self, value, type_, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -44,23 +66,43 @@ class Literal(Expression):
         return visitor.visit_literal(self)
 
 class Identifier(Expression):
+    # depth/slot: endereço léxico anotado pela análise semântica (número
+    # de escopos acima do atual e posição da variável nesse escopo)
+    __slots__ = ('name', 'depth', 'slot')
+    visit_method = 'visit_identifier'
+    
     def __init__(self, name, line=None, column=None):
         super().__init__(line, column)
         self.name = name
+        self.depth = None
+        self.slot = None
     
     def accept(self, visitor):
         return visitor.visit_identifier(self)
 
 class FunctionCall(Expression):
+    # tail: chamada em posição de cauda (return f(...)), anotada pela
+    # análise semântica; os motores a executam sem crescer a pilha.
+    # native: nome da função nativa chamada (natives.py), ou None
+    __slots__ = ('name', 'arguments', 'depth', 'slot', 'tail', 'native')
+    visit_method = 'visit_function_call'
+    
     def __init__(self, name, arguments, line=None, column=None):
         super().__init__(line, column)
         self.name = name
         self.arguments = arguments
+        self.depth = None
+        self.slot = None
+        self.tail = False
+        self.native = None
     
     def accept(self, visitor):
         return visitor.visit_function_call(self)
 
 class ArrayAccess(Expression):
+    __slots__ = ('array', 'index')
+    visit_method = 'visit_array_access'
+    
     def __init__(self, array, index, line=None, column=None):
         super().__init__(line, column)
         self.array = array
@@ -70,6 +112,9 @@ class ArrayAccess(Expression):
         return visitor.visit_array_access(self)
 
 class ArrayLiteral(Expression):
+    __slots__ = ('elements',)
+    visit_method = 'visit_array_literal'
+    
     def __init__(self, elements, line=None, column=None):
         super().__init__(line, column)
         self.elements = elements
@@ -80,9 +125,17 @@ class ArrayLiteral(Expression):
 # Nós de Declaração
 class Declaration(ASTNode):
     """Classe base para declarações"""
-    pass
+    # Posição da variável declarada no escopo atual (análise semântica)
+    __slots__ = ('slot',)
+    
+    def __init__(self, line=None, column=None):
+        super().__init__(line, column)
+        self.slot = None
 
 class VarDeclaration(Declaration):
+    __slots__ = ('type', 'name', 'initializer')
+    visit_method = 'visit_var_declaration'
+    
     def __init__(self, type_, name, initializer=None, line=None, column=None):
         super().__init__(line, column)
         self.type = type_
@@ -93,6 +146,9 @@ class VarDeclaration(Declaration):
         return visitor.visit_var_declaration(self)
 
 class ArrayDeclaration(Declaration):
+    __slots__ = ('element_type', 'name', 'size', 'initializer')
+    visit_method = 'visit_array_declaration'
+    
     def __init__(self, element_type, name, size=None, initializer=None, line=None, column=None):
         super().__init__(line, column)
         self.element_type = element_type
@@ -104,16 +160,26 @@ class ArrayDeclaration(Declaration):
         return visitor.visit_array_declaration(self)
 
 class FunctionDeclaration(Declaration):
+    # scope_names: variáveis do quadro da chamada (parâmetros e todas as
+    # locais dos blocos internos), na ordem das posições; pure: resultado
+    # depende só dos argumentos (anotado por purity.PurityAnalyzer)
+    __slots__ = ('name', 'parameters', 'body', 'scope_names', 'pure')
+    visit_method = 'visit_function_declaration'
+    
     def __init__(self, name, parameters, body, line=None, column=None):
         super().__init__(line, column)
         self.name = name
         self.parameters = parameters
         self.body = body
+        self.scope_names = None
+        self.pure = False
     
     def accept(self, visitor):
         return visitor.visit_function_declaration(self)
 
 class Parameter:
+    __slots__ = ('type', 'name', 'line', 'column')
+    
     def __init__(self, type_, name, line=None, column=None):
         self.type = type_
         self.name = name
@@ -123,18 +189,27 @@ class Parameter:
 # Nós de Comando
 class Statement(ASTNode):
     """Classe base para comandos"""
-    pass
+    __slots__ = ()
 
 class Assignment(Statement):
+    # rebinds_function: o alvo é o nome de uma função (f = g), anotado pela
+    # análise semântica; invalida os caches de chamada do interpretador
+    __slots__ = ('target', 'value', 'rebinds_function')
+    visit_method = 'visit_assignment'
+    
     def __init__(self, target, value, line=None, column=None):
         super().__init__(line, column)
         self.target = target
         self.value = value
+        self.rebinds_function = False
     
     def accept(self, visitor):
         return visitor.visit_assignment(self)
 
 class IfStatement(Statement):
+    __slots__ = ('condition', 'then_stmt', 'else_stmt')
+    visit_method = 'visit_if_statement'
+    
     def __init__(self, condition, then_stmt, else_stmt=None, line=None, column=None):
         super().__init__(line, column)
         self.condition = condition
@@ -145,6 +220,9 @@ class IfStatement(Statement):
         return visitor.visit_if_statement(self)
 
 class WhileStatement(Statement):
+    __slots__ = ('condition', 'body')
+    visit_method = 'visit_while_statement'
+    
     def __init__(self, condition, body, line=None, column=None):
         super().__init__(line, column)
         self.condition = condition
@@ -154,17 +232,27 @@ class WhileStatement(Statement):
         return visitor.visit_while_statement(self)
 
 class ForStatement(Statement):
+    # step: passo do laço contado (int i = a; i < b; i = i + passo), com
+    # limite invariante e i não alterado no corpo, anotado pela análise
+    # semântica; None se o for é executado na forma genérica
+    __slots__ = ('init', 'condition', 'update', 'body', 'step')
+    visit_method = 'visit_for_statement'
+    
     def __init__(self, init, condition, update, body, line=None, column=None):
         super().__init__(line, column)
         self.init = init
         self.condition = condition
         self.update = update
         self.body = body
+        self.step = None
     
     def accept(self, visitor):
         return visitor.visit_for_statement(self)
 
 class ReturnStatement(Statement):
+    __slots__ = ('value',)
+    visit_method = 'visit_return_statement'
+    
     def __init__(self, value=None, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -173,6 +261,9 @@ class ReturnStatement(Statement):
         return visitor.visit_return_statement(self)
 
 class PrintStatement(Statement):
+    __slots__ = ('expression',)
+    visit_method = 'visit_print_statement'
+    
     def __init__(self, expression, line=None, column=None):
         super().__init__(line, column)
         self.expression = expression
@@ -181,6 +272,9 @@ class PrintStatement(Statement):
         return visitor.visit_print_statement(self)
 
 class ExpressionStatement(Statement):
+    __slots__ = ('expression',)
+    visit_method = 'visit_expression_statement'
+    
     def __init__(self, expression, line=None, column=None):
         super().__init__(line, column)
         self.expression = expression
@@ -189,6 +283,9 @@ class ExpressionStatement(Statement):
         return visitor.visit_expression_statement(self)
 
 class Block(Statement):
+    __slots__ = ('statements',)
+    visit_method = 'visit_block'
+    
     def __init__(self, statements, line=None, column=None):
         super().__init__(line, column)
         self.statements = statements
@@ -198,17 +295,52 @@ class Block(Statement):
 
 # Nó raiz do programa
 class Program(ASTNode):
+    __slots__ = ('statements', 'scope_names')
+    visit_method = 'visit_program'
+    
     def __init__(self, statements, line=None, column=None):
         super().__init__(line, column)
         self.statements = statements
+        self.scope_names = None
     
     def accept(self, visitor):
         return visitor.visit_program(self)
 
 # Interface Visitor
+def node_classes(base=ASTNode):
+    """Todas as classes concretas de nós (com visit_method)"""
+    for subclass in base.__subclasses__():
+        if subclass.visit_method is not None:
+            yield subclass
+        yield from node_classes(subclass)
+
 class Visitor(ABC):
     """Interface para implementar o padrão Visitor"""
     
+    def __init__(self):
+        # Em vez de node.accept(visitor) -> visitor.visit_xxx(node), os
+        # visitors chamam self.dispatch[type(node)](node): uma busca em
+        # dicionário e uma única chamada por nó. É um dict simples (não uma
+        # subclasse) para manter o acesso especializado do CPython.
+        self.dispatch = {}
+        for node_class in node_classes():
+            self.register(node_class)
+    
+    def register(self, node_class):
+        """Resolve o método de visita da classe e o guarda na tabela"""
+        name = node_class.visit_method
+        if name is None:
+            raise TypeError(f"Nó sem método de visita: {node_class.__name__}")
+        handler = self.dispatch[node_class] = getattr(self, name)
+        return handler
+    
+    def visit(self, node):
+        handler = self.dispatch.get(type(node))
+        if handler is None:
+            # Classes criadas depois da construção do visitor
+            handler = self.register(type(node))
+        return handler(node)
+    
     @abstractmethod
     def visit_binary_op(self, node): pass
     
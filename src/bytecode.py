@@ -0,0 +1,406 @@
+"""
+Compilador de AST para bytecode e desmontador.
+
+Cada função (e o programa principal) vira um CodeObject: as instruções ficam
+num array de inteiros com largura fixa (opcode, operando), ao lado de uma
+tabela de constantes e de uma tabela de linhas que associa cada instrução à
+posição do nó de origem, usada nas mensagens de erro em tempo de execução.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from .ast_nodes import Visitor, FunctionCall
+from .errors import RuntimeError
+from .runtime import COERCIONS
+from .natives import NATIVES
+
+# Opcodes (operando entre parênteses; sem operando usa 0)
+OPCODES = [
+    'LOAD_CONST',       # (constante) empilha a constante
+    'LOAD_LOCAL',       # (posição) empilha a variável do quadro atual
+    'LOAD_DEREF',       # (constante (depth, posição)) variável de um quadro externo
+    'STORE_LOCAL',      # (posição) desempilha para a variável do quadro atual
+    'STORE_DEREF',      # (constante (depth, posição)) desempilha para quadro externo
+    'RAISE_UNDEFINED',  # (constante nome) erro de variável não definida
+    'RAISE_ERROR',      # (constante erro) lança o erro pré-construído
+    'ADD',
+    'ADD_FAST',         # soma sem checagem de string (tipos estáticos)
+    'SUB',
+    'MUL',
+    'DIV',
+    'MOD',
+    'LT',
+    'GT',
+    'LE',
+    'GE',
+    'EQ',
+    'NE',
+    'NEG',
+    'NOT',
+    'TO_BOOL',          # converte o topo em bool (verdade do MiniLang)
+    'JUMP',             # (destino)
+    'JUMP_IF_FALSE',    # (destino) desempilha a condição
+    'JUMP_IF_FALSE_OR_POP',  # (destino) and: salta com false no topo ou desempilha
+    'JUMP_IF_TRUE_OR_POP',   # (destino) or: salta com true no topo ou desempilha
+    'FOR_RANGE',        # (constante (comparação, passo)) desempilha início e limite, empilha os valores do for contado e um iterador
+    'FOR_NEXT',         # (destino) empilha o próximo valor ou, no fim, troca os dois pelo valor final e salta
+    'POP',
+    'PRINT',
+    'COERCE',           # (constante função de conversão)
+    'NEW_ARRAY',        # (constante tipo do elemento) desempilha o tamanho
+    'BUILD_ARRAY',      # (quantidade de elementos)
+    'INDEX',            # desempilha índice e array
+    'STORE_INDEX',      # desempilha índice, array e valor
+    'MAKE_FUNCTION',    # (constante CodeObject)
+    'CHECK_FUNCTION',   # (constante nome) verifica o topo antes dos argumentos
+    'CALL',             # (quantidade de argumentos)
+    'CALL_NATIVE',      # (constante Native) desempilha os argumentos da nativa
+    'RETURN',
+    'TAIL_CALL',        # (quantidade de argumentos) chamada que substitui a atual
+]
+
+(LOAD_CONST, LOAD_LOCAL, LOAD_DEREF, STORE_LOCAL, STORE_DEREF,
+ RAISE_UNDEFINED, RAISE_ERROR, ADD, ADD_FAST, SUB, MUL, DIV, MOD, LT, GT,
+ LE, GE, EQ, NE, NEG, NOT, TO_BOOL, JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP,
+ JUMP_IF_TRUE_OR_POP, FOR_RANGE, FOR_NEXT, POP, PRINT,
+ COERCE, NEW_ARRAY, BUILD_ARRAY, INDEX, STORE_INDEX, MAKE_FUNCTION,
+ CHECK_FUNCTION, CALL, CALL_NATIVE, RETURN, TAIL_CALL) = range(len(OPCODES))
+
+# Instruções cujo operando é um destino de salto ou índice de constante
+JUMPS = (JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, FOR_NEXT)
+CONSTANT_ARGUMENTS = (LOAD_CONST, LOAD_DEREF, STORE_DEREF, RAISE_UNDEFINED, RAISE_ERROR,
+                      COERCE, NEW_ARRAY, MAKE_FUNCTION, CHECK_FUNCTION, FOR_RANGE, CALL_NATIVE)
+
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV, '%': MOD,
+    '<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE,
+}
+# and/or saltam sobre o lado direito quando o esquerdo decide o valor
+LOGICAL_JUMPS = {'and': JUMP_IF_FALSE_OR_POP, 'or': JUMP_IF_TRUE_OR_POP}
+
+class CodeObject:
+    def __init__(self, name, names, parameter_count=0):
+        self.name = name
+        # Nomes das posições do quadro (scope_names da análise semântica)
+        self.names = names
+        self.frame_size = len(names)
+        self.parameter_count = parameter_count
+        self.code = array('l')
+        self.constants = []
+        # Tabela de linhas: a partir de cada offset vale a posição indicada
+        self.line_offsets = array('l')
+        self.lines = array('l')
+        self.columns = array('l')
+        # Forma decodificada usada pela máquina virtual, montada na primeira execução
+        self.instructions = None
+        # Função pura (FunctionDeclaration.pure), memoizável com --memoize
+        self.pure = False
+
+    def position(self, offset):
+        """Linha e coluna do nó que gerou a instrução em offset"""
+        index = bisect_right(self.line_offsets, offset) - 1
+        if index < 0:
+            return 0, 0
+        return self.lines[index], self.columns[index]
+
+    def __repr__(self):
+        return f"<CodeObject {self.name}: {len(self.code) // 2} instruções>"
+
+class BytecodeCompiler(Visitor):
+    def __init__(self):
+        super().__init__()
+        self.code_object = None
+        self.constant_index = {}
+
+    def compile(self, ast):
+        """Compila o programa para o CodeObject principal"""
+        return self.compile_unit('<programa>', ast.scope_names, 0, ast.statements)
+
+    def compile_unit(self, name, names, parameter_count, statements):
+        outer = self.code_object, self.constant_index
+        self.code_object = CodeObject(name, names, parameter_count)
+        self.constant_index = {}
+        try:
+            self.compile_statements(statements)
+            self.emit(LOAD_CONST, self.constant(None))
+            self.emit(RETURN)
+            return self.code_object
+        finally:
+            self.code_object, self.constant_index = outer
+
+    def compile_statements(self, statements):
+        dispatch = self.dispatch
+        for statement in statements:
+            self.mark(statement)
+            dispatch[type(statement)](statement)
+
+    def mark(self, node):
+        """Associa as próximas instruções à posição do nó na tabela de linhas"""
+        if node.line is None:
+            return
+        code_object = self.code_object
+        offset = len(code_object.code)
+        if code_object.line_offsets and code_object.line_offsets[-1] == offset:
+            code_object.lines[-1] = node.line
+            code_object.columns[-1] = node.column
+        elif not code_object.line_offsets or \
+                (code_object.lines[-1], code_object.columns[-1]) != (node.line, node.column):
+            code_object.line_offsets.append(offset)
+            code_object.lines.append(node.line)
+            code_object.columns.append(node.column)
+
+    def emit(self, opcode, argument=0, node=None):
+        """Acrescenta uma instrução e devolve seu offset"""
+        code_object = self.code_object
+        if node is not None:
+            self.mark(node)
+        code_object.code.append(opcode)
+        code_object.code.append(argument)
+        return len(code_object.code) - 2
+
+    def patch(self, offset, target=None):
+        """Aponta o salto em offset para target (padrão: a próxima instrução)"""
+        if target is None:
+            target = len(self.code_object.code)
+        self.code_object.code[offset + 1] = target
+
+    def constant(self, value):
+        # O tipo faz parte da chave: True, 1 e 1.0 são constantes distintas;
+        # o sinal também, pois 0.0 == -0.0
+        try:
+            if type(value) is float:
+                key = (float, value, math.copysign(1.0, value))
+            else:
+                key = (type(value), value)
+            index = self.constant_index.get(key)
+        except TypeError:
+            key, index = None, None
+        if index is None:
+            index = len(self.code_object.constants)
+            self.code_object.constants.append(value)
+            if key is not None:
+                self.constant_index[key] = index
+        return index
+
+    def emit_load(self, node):
+        if node.depth is None:
+            self.emit(RAISE_UNDEFINED, self.constant(node.name))
+        elif node.depth == 0:
+            self.emit(LOAD_LOCAL, node.slot + 1)
+        else:
+            self.emit(LOAD_DEREF, self.constant((node.depth, node.slot + 1)))
+
+    def emit_store(self, node):
+        if node.depth is None:
+            self.emit(RAISE_UNDEFINED, self.constant(node.name))
+        elif node.depth == 0:
+            self.emit(STORE_LOCAL, node.slot + 1)
+        else:
+            self.emit(STORE_DEREF, self.constant((node.depth, node.slot + 1)))
+
+    def visit_program(self, node):
+        self.compile_statements(node.statements)
+
+    def visit_var_declaration(self, node):
+        initializer = node.initializer
+        if initializer:
+            self.visit(initializer)
+            conversion = COERCIONS.get(node.type)
+            if conversion is not None and initializer.static_type != node.type:
+                self.emit(COERCE, self.constant(conversion))
+        else:
+            self.emit(LOAD_CONST, self.constant(None))
+        self.emit(STORE_LOCAL, node.slot + 1)
+
+    def visit_array_declaration(self, node):
+        if node.size:
+            self.visit(node.size)
+            self.emit(NEW_ARRAY, self.constant(node.element_type), node)
+        elif node.initializer:
+            self.visit(node.initializer)
+        else:
+            self.emit(BUILD_ARRAY, 0)
+        self.emit(STORE_LOCAL, node.slot + 1)
+
+    def visit_function_declaration(self, node):
+        code_object = self.compile_unit(node.name, node.scope_names, len(node.parameters),
+                                        node.body.statements)
+        code_object.pure = node.pure
+        self.emit(MAKE_FUNCTION, self.constant(code_object), node)
+        self.emit(STORE_LOCAL, node.slot + 1)
+
+    def visit_assignment(self, node):
+        self.visit(node.value)
+        target = node.target
+        if hasattr(target, 'name'):
+            self.emit_store(target)
+        else:
+            self.visit(target.array)
+            self.visit(target.index)
+            self.emit(STORE_INDEX, 0, node)
+
+    def visit_if_statement(self, node):
+        self.visit(node.condition)
+        skip_then = self.emit(JUMP_IF_FALSE)
+        self.visit(node.then_stmt)
+        if node.else_stmt:
+            skip_else = self.emit(JUMP)
+            self.patch(skip_then)
+            self.visit(node.else_stmt)
+            self.patch(skip_else)
+        else:
+            self.patch(skip_then)
+
+    def visit_while_statement(self, node):
+        start = len(self.code_object.code)
+        self.visit(node.condition)
+        exit_jump = self.emit(JUMP_IF_FALSE)
+        self.visit(node.body)
+        self.emit(JUMP, start)
+        self.patch(exit_jump)
+
+    def visit_for_statement(self, node):
+        if node.init:
+            self.visit(node.init)
+        if node.step is not None:
+            self.counted_for(node)
+            return
+        start = len(self.code_object.code)
+        exit_jump = None
+        if node.condition:
+            self.visit(node.condition)
+            exit_jump = self.emit(JUMP_IF_FALSE)
+        self.visit(node.body)
+        if node.update:
+            self.visit(node.update)
+        self.emit(JUMP, start)
+        if exit_jump is not None:
+            self.patch(exit_jump)
+
+    def counted_for(self, node):
+        """Laço contado: FOR_NEXT entrega cada valor da variável, sem condição nem atualização"""
+        slot = node.init.slot + 1
+        self.emit(LOAD_LOCAL, slot)
+        self.visit(node.condition.right)
+        self.emit(FOR_RANGE, self.constant((node.condition.operator, node.step)), node)
+        start = self.emit(FOR_NEXT)
+        self.emit(STORE_LOCAL, slot)
+        self.visit(node.body)
+        self.emit(JUMP, start)
+        self.patch(start)
+        # Ao fim, a variável fica com o primeiro valor que não passa na condição
+        self.emit(STORE_LOCAL, slot)
+
+    def visit_return_statement(self, node):
+        if node.value:
+            self.visit(node.value)
+            if type(node.value) is FunctionCall and node.value.tail:
+                # TAIL_CALL não volta para este código
+                return
+        else:
+            self.emit(LOAD_CONST, self.constant(None))
+        self.emit(RETURN)
+
+    def visit_print_statement(self, node):
+        self.visit(node.expression)
+        self.emit(PRINT)
+
+    def visit_expression_statement(self, node):
+        self.visit(node.expression)
+        self.emit(POP)
+
+    def visit_block(self, node):
+        self.compile_statements(node.statements)
+
+    def visit_binary_op(self, node):
+        self.visit(node.left)
+        if node.operator in LOGICAL_JUMPS:
+            skip_right = self.emit(LOGICAL_JUMPS[node.operator])
+            self.visit(node.right)
+            if node.right.static_type != 'bool':
+                self.emit(TO_BOOL)
+            self.patch(skip_right)
+            return
+        self.visit(node.right)
+        opcode = BINARY_OPCODES.get(node.operator)
+        if opcode is None:
+            error = RuntimeError(f"Operador binário desconhecido: {node.operator}", node.line, node.column)
+            self.emit(RAISE_ERROR, self.constant(error))
+            return
+        if opcode == ADD and (node.static_type in ('int', 'float') or
+                              node.left.static_type == node.right.static_type == 'string'):
+            opcode = ADD_FAST
+        self.emit(opcode, 0, node)
+
+    def visit_unary_op(self, node):
+        self.visit(node.operand)
+        if node.operator == '-':
+            self.emit(NEG)
+        elif node.operator == 'not':
+            self.emit(NOT)
+        else:
+            error = RuntimeError(f"Operador unário desconhecido: {node.operator}", node.line, node.column)
+            self.emit(RAISE_ERROR, self.constant(error))
+
+    def visit_literal(self, node):
+        self.emit(LOAD_CONST, self.constant(node.value))
+
+    def visit_identifier(self, node):
+        self.emit_load(node)
+
+    def visit_function_call(self, node):
+        if node.native is not None:
+            for argument in node.arguments:
+                self.visit(argument)
+            self.emit(CALL_NATIVE, self.constant(NATIVES[node.native]), node)
+            return
+        self.emit_load(node)
+        self.emit(CHECK_FUNCTION, self.constant(node.name), node)
+        for argument in node.arguments:
+            self.visit(argument)
+        self.emit(TAIL_CALL if node.tail else CALL, len(node.arguments), node)
+
+    def visit_array_access(self, node):
+        self.visit(node.array)
+        self.visit(node.index)
+        self.emit(INDEX, 0, node)
+
+    def visit_array_literal(self, node):
+        for element in node.elements:
+            self.visit(element)
+        self.emit(BUILD_ARRAY, len(node.elements))
+
+def describe_argument(code_object, opcode, argument):
+    if opcode in CONSTANT_ARGUMENTS:
+        value = code_object.constants[argument]
+        if callable(value):
+            value = value.__name__
+        return f"{argument} ({value!r})"
+    if opcode in JUMPS:
+        return f"-> {argument}"
+    if opcode in (LOAD_LOCAL, STORE_LOCAL):
+        return f"{argument} ({code_object.names[argument - 1]})"
+    if opcode in (BUILD_ARRAY, CALL, TAIL_CALL):
+        return str(argument)
+    return ""
+
+def disassemble(code_object):
+    """Listagem legível do CodeObject e das funções aninhadas"""
+    lines = [f"Código de {code_object.name} ({code_object.frame_size} posições, "
+             f"{code_object.parameter_count} parâmetros):"]
+    code = code_object.code
+    previous_line = None
+    for offset in range(0, len(code), 2):
+        opcode, argument = code[offset], code[offset + 1]
+        line, _ = code_object.position(offset)
+        line_text = f"{line:>4}" if line != previous_line else "    "
+        previous_line = line
+        description = describe_argument(code_object, opcode, argument)
+        lines.append(f"{line_text} {offset:>6} {OPCODES[opcode]:<16}{description}".rstrip())
+
+    for constant in code_object.constants:
+        if isinstance(constant, CodeObject):
+            lines.append("")
+            lines.append(disassemble(constant))
+    return "\n".join(lines)
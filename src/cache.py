@@ -0,0 +1,127 @@
+"""
+Cache em disco de programas já analisados (no estilo do __pycache__).
+
+Cada entrada guarda a AST validada pela análise semântica, serializada com
+pickle, e é identificada pelo hash do conteúdo do fonte combinado com a
+versão do interpretador. Alterar o fonte ou atualizar o interpretador muda
+a chave; entradas antigas do mesmo script são removidas ao gravar a nova e
+o diretório respeita um limite de tamanho com remoção LRU.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from . import __version__
+
+CACHE_DIRNAME = '__mlcache__'
+CACHE_SUFFIX = '.astc'
+# Incrementar sempre que a estrutura ou as anotações da AST mudarem
+CACHE_FORMAT = 10
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def source_key(source):
+    """Chave da entrada: hash do fonte (str ou bytes/mmap) e da versão"""
+    digest = hashlib.sha256()
+    version = f"minilang {__version__} formato {CACHE_FORMAT} python {sys.version_info[0]}.{sys.version_info[1]}"
+    digest.update(version.encode('utf-8') + b'\0')
+    digest.update(source.encode('utf-8') if isinstance(source, str) else source)
+    return digest.hexdigest()
+
+class ASTCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+    
+    @classmethod
+    def for_script(cls, filename, max_bytes=DEFAULT_MAX_BYTES):
+        """Cache no diretório __mlcache__ ao lado do script"""
+        directory = os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIRNAME)
+        return cls(directory, max_bytes)
+    
+    def entry_path(self, name, key):
+        return os.path.join(self.directory, f"{name}.{key}{CACHE_SUFFIX}")
+    
+    def entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, entry) for entry in names if entry.endswith(CACHE_SUFFIX)]
+    
+    def load(self, name, key):
+        """Devolve a AST guardada, ou None se não houver entrada válida"""
+        path = self.entry_path(name, key)
+        try:
+            with open(path, 'rb') as file:
+                ast = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Entrada corrompida ou incompatível: descarta
+            self.remove(path)
+            return None
+        # Marca como usada recentemente (ordem LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ast
+    
+    def store(self, name, key, ast):
+        """Grava a AST; devolve False se ela não puder ser serializada"""
+        try:
+            data = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError):
+            return False
+        
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Escrita atômica: arquivo temporário + rename
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            path = self.entry_path(name, key)
+            os.replace(temp_path, path)
+        except OSError:
+            return False
+        
+        # Versões anteriores do mesmo script ficam obsoletas
+        prefix = os.path.join(self.directory, f"{name}.")
+        for entry in self.entries():
+            if entry != path and entry.startswith(prefix) and \
+                    len(os.path.basename(entry)) == len(os.path.basename(path)):
+                self.remove(entry)
+        
+        self.evict(keep=path)
+        return True
+    
+    def evict(self, keep=None):
+        """Remove as entradas menos usadas até caber em max_bytes"""
+        stats = []
+        for entry in self.entries():
+            try:
+                stats.append((os.stat(entry), entry))
+            except OSError:
+                continue
+        
+        total = sum(stat.st_size for stat, _ in stats)
+        stats.sort(key=lambda item: item[0].st_mtime)
+        for stat, entry in stats:
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            self.remove(entry)
+            total -= stat.st_size
+    
+    def clear(self):
+        for entry in self.entries():
+            self.remove(entry)
+    
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,446 @@
+"""
+Motor de execução por compilação para closures.
+
+O programa já validado pela análise semântica é percorrido uma única vez e
+cada nó vira uma função Python especializada, com os avaliadores dos filhos,
+o operador e o endereço das variáveis fixados na compilação. Executar é só
+chamar essas funções, sem despacho do Visitor nem cadeias de if/elif.
+
+Cada quadro (global ou de chamada) é uma lista: a posição 0 guarda o quadro
+pai e a variável de slot s fica em s + 1. Expressões compiladas recebem o
+quadro e devolvem o valor; comandos devolvem None ou, ao executar um return,
+a tupla (valor,), que interrompe os blocos até a chamada da função. Um
+return f(...) devolve um TailCall, executado em laço por CompiledFunction.call.
+"""
+
+from .ast_nodes import Visitor, FunctionCall
+from .errors import RuntimeError
+from .runtime import (is_truthy, stringify, COERCIONS, new_array, check_index,
+                      undefined_variable, counted_values, loop_end, GlobalsView, TailCall)
+from .natives import NATIVES
+
+class CompiledFunction:
+    def __init__(self, name, parameter_count, frame_size, body, closure):
+        self.name = name
+        self.parameter_count = parameter_count
+        self.frame_size = frame_size
+        self.body = body
+        self.closure = closure
+
+    def call(self, arguments):
+        function = self
+        while True:
+            frame = [function.closure]
+            frame += arguments[:function.parameter_count]
+            frame += [None] * (function.frame_size + 1 - len(frame))
+            result = function.body(frame)
+            if type(result) is TailCall:
+                # Trampolim: a chamada de cauda reusa este nível da pilha
+                function, arguments = result.function, result.arguments
+                continue
+            if result is not None:
+                return result[0]
+            return None
+
+class MemoizedFunction(CompiledFunction):
+    """Função pura com os resultados guardados numa MemoCache (--memoize)"""
+    
+    def __init__(self, memo, *arguments):
+        super().__init__(*arguments)
+        self.memo = memo
+
+    def call(self, arguments):
+        return self.memo.call(CompiledFunction.call, arguments, self)
+
+def run_statements(statements):
+    """Executa uma sequência de comandos compilados, propagando o return"""
+    if not statements:
+        return lambda frame: None
+    if len(statements) == 1:
+        return statements[0]
+
+    def run(frame):
+        for statement in statements:
+            result = statement(frame)
+            if result is not None:
+                return result
+    return run
+
+def load(depth, slot):
+    """Leitura da variável no endereço léxico (depth, slot)"""
+    slot += 1
+    if depth == 0:
+        return lambda frame: frame[slot]
+    if depth == 1:
+        return lambda frame: frame[0][slot]
+
+    def load_outer(frame):
+        for _ in range(depth):
+            frame = frame[0]
+        return frame[slot]
+    return load_outer
+
+def scope(depth):
+    """Função que devolve o quadro depth níveis acima do atual"""
+    if depth == 0:
+        return lambda frame: frame
+    if depth == 1:
+        return lambda frame: frame[0]
+
+    def outer(frame):
+        for _ in range(depth):
+            frame = frame[0]
+        return frame
+    return outer
+
+def fail(error):
+    def raise_error(frame):
+        raise error
+    return raise_error
+
+class ClosureCompiler(Visitor):
+    def __init__(self, memoizer=None):
+        super().__init__()
+        self.globals = None
+        self.memoizer = memoizer
+
+    def compile(self, ast):
+        """Compila o programa para uma função que recebe o quadro global"""
+        return self.visit(ast)
+
+    def interpret(self, ast):
+        program = self.compile(ast)
+        frame = [None] * (len(ast.scope_names) + 1)
+        self.globals = GlobalsView(ast.scope_names, frame)
+        try:
+            program(frame)
+        except RuntimeError as e:
+            print(f"Erro em tempo de execução: {e}")
+            raise
+
+    def compile_statements(self, statements):
+        dispatch = self.dispatch
+        return run_statements([dispatch[type(statement)](statement) for statement in statements])
+
+    def visit_program(self, node):
+        return self.compile_statements(node.statements)
+
+    def visit_var_declaration(self, node):
+        slot = node.slot + 1
+        initializer = node.initializer
+        if not initializer:
+            def declare(frame):
+                frame[slot] = None
+            return declare
+        
+        evaluate = self.visit(initializer)
+        conversion = COERCIONS.get(node.type)
+        if conversion is None or initializer.static_type == node.type:
+            def declare(frame):
+                frame[slot] = evaluate(frame)
+        else:
+            def declare(frame):
+                frame[slot] = conversion(evaluate(frame))
+        return declare
+
+    def visit_array_declaration(self, node):
+        slot = node.slot + 1
+        element_type, line, column = node.element_type, node.line, node.column
+        if node.size:
+            size = self.visit(node.size)
+            def declare(frame):
+                frame[slot] = new_array(element_type, size(frame), line, column)
+        elif node.initializer:
+            initializer = self.visit(node.initializer)
+            def declare(frame):
+                frame[slot] = initializer(frame)
+        else:
+            def declare(frame):
+                frame[slot] = []
+        return declare
+
+    def visit_function_declaration(self, node):
+        slot = node.slot + 1
+        name = node.name
+        parameter_count = len(node.parameters)
+        frame_size = len(node.scope_names)
+        body = self.compile_statements(node.body.statements)
+        
+        if node.pure and self.memoizer is not None:
+            memo = self.memoizer.cache(node)
+            def declare(frame):
+                frame[slot] = MemoizedFunction(memo, name, parameter_count, frame_size,
+                                               body, frame)
+            return declare
+        
+        def declare(frame):
+            frame[slot] = CompiledFunction(name, parameter_count, frame_size, body, frame)
+        return declare
+
+    def visit_assignment(self, node):
+        value = self.visit(node.value)
+        target = node.target
+        
+        if hasattr(target, 'name'):
+            if target.depth is None:
+                error = undefined_variable(target.name)
+                def assign(frame):
+                    value(frame)
+                    raise error
+                return assign
+            
+            slot = target.slot + 1
+            if target.depth == 0:
+                def assign(frame):
+                    frame[slot] = value(frame)
+            else:
+                outer = scope(target.depth)
+                def assign(frame):
+                    result = value(frame)
+                    outer(frame)[slot] = result
+            return assign
+        
+        array = self.visit(target.array)
+        index = self.visit(target.index)
+        line, column = node.line, node.column
+        
+        def assign_element(frame):
+            result = value(frame)
+            items = array(frame)
+            position = index(frame)
+            check_index(items, position, line, column)
+            items[position] = result
+        return assign_element
+
+    def visit_if_statement(self, node):
+        condition = self.visit(node.condition)
+        then_stmt = self.visit(node.then_stmt)
+        
+        if node.else_stmt is None:
+            def run_if(frame):
+                test = condition(frame)
+                if test is not None and test is not False:
+                    return then_stmt(frame)
+            return run_if
+        
+        else_stmt = self.visit(node.else_stmt)
+        def run_if_else(frame):
+            test = condition(frame)
+            if test is not None and test is not False:
+                return then_stmt(frame)
+            return else_stmt(frame)
+        return run_if_else
+
+    def visit_while_statement(self, node):
+        condition = self.visit(node.condition)
+        body = self.visit(node.body)
+        
+        def run_while(frame):
+            while True:
+                test = condition(frame)
+                if test is None or test is False:
+                    return None
+                result = body(frame)
+                if result is not None:
+                    return result
+        return run_while
+
+    def visit_for_statement(self, node):
+        init = self.visit(node.init) if node.init else None
+        body = self.visit(node.body)
+        if node.step is not None:
+            return self.counted_for(node, init, body)
+        
+        condition = self.visit(node.condition) if node.condition else None
+        update = self.visit(node.update) if node.update else None
+        
+        def run_for(frame):
+            if init is not None:
+                init(frame)
+            while True:
+                if condition is not None:
+                    test = condition(frame)
+                    if test is None or test is False:
+                        return None
+                result = body(frame)
+                if result is not None:
+                    return result
+                if update is not None:
+                    update(frame)
+        return run_for
+
+    def counted_for(self, node, init, body):
+        """Laço contado: a variável percorre um range, sem condição nem atualização"""
+        slot = node.init.slot + 1
+        bound = self.visit(node.condition.right)
+        comparison, step = node.condition.operator, node.step
+        
+        def run_counted_for(frame):
+            init(frame)
+            values = counted_values(frame[slot], bound(frame), comparison, step)
+            for value in values:
+                frame[slot] = value
+                result = body(frame)
+                if result is not None:
+                    return result
+            frame[slot] = loop_end(values)
+        return run_counted_for
+
+    def visit_return_statement(self, node):
+        if not node.value:
+            return lambda frame: (None,)
+        value = self.visit(node.value)
+        if type(node.value) is FunctionCall and node.value.tail:
+            # A chamada compilada já devolve o TailCall
+            return value
+        return lambda frame: (value(frame),)
+
+    def visit_print_statement(self, node):
+        expression = self.visit(node.expression)
+        
+        def run_print(frame):
+            print(stringify(expression(frame)))
+        return run_print
+
+    def visit_expression_statement(self, node):
+        expression = self.visit(node.expression)
+        
+        def run_expression(frame):
+            expression(frame)
+        return run_expression
+
+    def visit_block(self, node):
+        return self.compile_statements(node.statements)
+
+    def visit_binary_op(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        operator = node.operator
+        
+        if operator == '+':
+            if node.static_type in ('int', 'float') or \
+                    (node.left.static_type == 'string' and node.right.static_type == 'string'):
+                return lambda frame: left(frame) + right(frame)
+            
+            def add(frame):
+                a = left(frame)
+                b = right(frame)
+                if isinstance(a, str) or isinstance(b, str):
+                    return str(a) + str(b)
+                return a + b
+            return add
+        if operator == '-':
+            return lambda frame: left(frame) - right(frame)
+        if operator == '*':
+            return lambda frame: left(frame) * right(frame)
+        if operator == '/':
+            line, column = node.line, node.column
+            def divide(frame):
+                a = left(frame)
+                b = right(frame)
+                if b == 0:
+                    raise RuntimeError("Divisão por zero", line, column)
+                return a / b
+            return divide
+        if operator == '%':
+            return lambda frame: left(frame) % right(frame)
+        if operator == '<':
+            return lambda frame: left(frame) < right(frame)
+        if operator == '>':
+            return lambda frame: left(frame) > right(frame)
+        if operator == '<=':
+            return lambda frame: left(frame) <= right(frame)
+        if operator == '>=':
+            return lambda frame: left(frame) >= right(frame)
+        if operator == '==':
+            return lambda frame: left(frame) == right(frame)
+        if operator == '!=':
+            return lambda frame: left(frame) != right(frame)
+        if operator in ('and', 'or'):
+            # Curto-circuito: o lado direito só é avaliado se decidir o valor
+            if node.left.static_type == node.right.static_type == 'bool':
+                if operator == 'and':
+                    return lambda frame: left(frame) and right(frame)
+                return lambda frame: left(frame) or right(frame)
+            if operator == 'and':
+                return lambda frame: is_truthy(left(frame)) and is_truthy(right(frame))
+            return lambda frame: is_truthy(left(frame)) or is_truthy(right(frame))
+        
+        error = RuntimeError(f"Operador binário desconhecido: {operator}", node.line, node.column)
+        def unknown(frame):
+            left(frame)
+            right(frame)
+            raise error
+        return unknown
+
+    def visit_unary_op(self, node):
+        operand = self.visit(node.operand)
+        
+        if node.operator == '-':
+            return lambda frame: -operand(frame)
+        if node.operator == 'not':
+            return lambda frame: not is_truthy(operand(frame))
+        
+        error = RuntimeError(f"Operador unário desconhecido: {node.operator}", node.line, node.column)
+        def unknown(frame):
+            operand(frame)
+            raise error
+        return unknown
+
+    def visit_literal(self, node):
+        value = node.value
+        return lambda frame: value
+
+    def visit_identifier(self, node):
+        if node.depth is None:
+            return fail(undefined_variable(node.name))
+        return load(node.depth, node.slot)
+
+    def visit_function_call(self, node):
+        arguments = [self.visit(argument) for argument in node.arguments]
+        if node.native is not None:
+            return self.native_call(node, arguments)
+        if node.depth is None:
+            return fail(undefined_variable(node.name))
+        
+        callee = load(node.depth, node.slot)
+        name, line, column = node.name, node.line, node.column
+        
+        if node.tail:
+            def tail_call(frame):
+                function = callee(frame)
+                if not isinstance(function, CompiledFunction):
+                    raise RuntimeError(f"'{name}' não é uma função", line, column)
+                return TailCall(function, [argument(frame) for argument in arguments])
+            return tail_call
+        
+        def call(frame):
+            function = callee(frame)
+            if not isinstance(function, CompiledFunction):
+                raise RuntimeError(f"'{name}' não é uma função", line, column)
+            return function.call([argument(frame) for argument in arguments])
+        return call
+
+    def native_call(self, node, arguments):
+        function = NATIVES[node.native].function
+        line, column = node.line, node.column
+        if len(arguments) == 1:
+            [argument] = arguments
+            return lambda frame: function(argument(frame), line, column)
+        return lambda frame: function(*[argument(frame) for argument in arguments], line, column)
+
+    def visit_array_access(self, node):
+        array = self.visit(node.array)
+        index = self.visit(node.index)
+        line, column = node.line, node.column
+        
+        def access(frame):
+            items = array(frame)
+            position = index(frame)
+            check_index(items, position, line, column)
+            return items[position]
+        return access
+
+    def visit_array_literal(self, node):
+        elements = [self.visit(element) for element in node.elements]
+        return lambda frame: [element(frame) for element in elements]
@@ -1,33 +1,67 @@
+import operator
 from .ast_nodes import Visitor
 from .errors import RuntimeError
+from .runtime import (is_truthy, stringify, add, coerce, new_array, check_index,
+                      undefined_variable, counted_values, loop_end, TailCall)
+from .natives import NATIVES
 
-class ReturnException(Exception):
-    def __init__(self, value):
-        self.value = value
+# Operadores binários que são o operador Python equivalente
+BINARY_OPERATIONS = {
+    '-': operator.sub,
+    '*': operator.mul,
+    '%': operator.mod,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
 
 class Environment:
-    def __init__(self, parent=None):
-        self.values = {}
+    """Quadro de execução (global ou de uma chamada) com posições fixas"""
+    
+    def __init__(self, parent=None, names=(), values=None):
+        # names: nomes das posições, calculados pela análise semântica, com
+        # as variáveis de todos os blocos internos; o interpretador acessa
+        # values[slot] diretamente pelo endereço léxico
+        self.names = names
+        self.values = [None] * len(names) if values is None else values
         self.parent = parent
+        # Muda a cada nova ligação de uma função neste quadro; no global,
+        # valida os caches de chamada do interpretador
+        self.version = 0
+
+    def reserve(self, names):
+        """Acrescenta as posições de names que ainda não existem"""
+        for name in names[len(self.names):]:
+            self.names += (name,)
+            self.values.append(None)
 
     def define(self, name, value):
-        self.values[name] = value
+        if name not in self.names:
+            self.reserve(self.names + (name,))
+        self.values[self.names.index(name)] = value
+        self.version += 1
 
+    # Acesso por nome: usado fora dos caminhos quentes (testes, depuração).
+    # Com nomes repetidos (sombreamento em blocos) vale a primeira posição.
     def get(self, name):
-        if name in self.values:
-            return self.values[name]
+        if name in self.names:
+            return self.values[self.names.index(name)]
         if self.parent:
             return self.parent.get(name)
-        raise RuntimeError(f"Variável '{name}' não definida", 0, 0)
+        raise undefined_variable(name)
 
     def set(self, name, value):
-        if name in self.values:
-            self.values[name] = value
+        if name in self.names:
+            self.values[self.names.index(name)] = value
+            self.version += 1
             return
         if self.parent:
             self.parent.set(name, value)
             return
-        raise RuntimeError(f"Variável '{name}' não definida", 0, 0)
+        raise undefined_variable(name)
 
 class Function:
     def __init__(self, declaration, closure):
@@ -35,28 +69,58 @@ class Function:
         self.closure = closure
 
     def call(self, interpreter, arguments):
-        environment = Environment(self.closure)
-        
-        for i, param in enumerate(self.declaration.parameters):
-            if i < len(arguments):
-                environment.define(param.name, arguments[i])
-            else:
-                environment.define(param.name, None)        
-        try:
-            interpreter.execute_block(self.declaration.body.statements, environment)
-        except ReturnException as ret:
-            return ret.value
-        
-        return None
+        function = self
+        while True:
+            # Os parâmetros ocupam as primeiras posições do ambiente da chamada
+            declaration = function.declaration
+            names = declaration.scope_names
+            values = arguments[:len(declaration.parameters)]
+            values.extend([None] * (len(names) - len(values)))
+            environment = Environment(function.closure, names, values)
+            
+            result = interpreter.execute_block(declaration.body.statements, environment)
+            if type(result) is TailCall:
+                # Trampolim: a chamada de cauda reusa este nível da pilha
+                function, arguments = result.function, result.arguments
+                continue
+            if result is not None:
+                return result[0]
+            return None
+
+class MemoizedFunction(Function):
+    """Função pura com os resultados guardados numa MemoCache (--memoize)"""
+    
+    def __init__(self, declaration, closure, memo):
+        super().__init__(declaration, closure)
+        self.memo = memo
+
+    def call(self, interpreter, arguments):
+        return self.memo.call(Function.call, arguments, self, interpreter)
 
 class Interpreter(Visitor):
-    def __init__(self):
+    """
+    Executa a AST diretamente.
+    
+    Os métodos de comando devolvem None ou, quando um return foi executado,
+    a tupla (valor,). Blocos, if e laços repassam esse resultado até
+    Function.call, sem exceção nem desempilhamento da pilha Python. Um
+    return f(...) devolve um TailCall, que Function.call executa em laço.
+    """
+    
+    def __init__(self, memoizer=None):
+        super().__init__()
         self.globals = Environment()
         self.environment = self.globals
+        self.memoizer = memoizer
+        # BinaryOp -> função (esquerda, direita), montada na primeira avaliação
+        self.operations = {}
+        # FunctionCall -> (versão dos globais, função global chamada): cache
+        # em linha de cada chamada, sem percorrer quadros nem verificar o tipo
+        self.call_sites = {}
 
     def interpret(self, ast):
         try:
-            ast.accept(self)
+            self.visit(ast)
         except RuntimeError as e:
             print(f"Erro em tempo de execução: {e}")
             raise
@@ -65,167 +129,194 @@ class Interpreter(Visitor):
         previous = self.environment
         try:
             self.environment = environment
+            dispatch = self.dispatch
             for statement in statements:
-                statement.accept(self)
+                result = dispatch[type(statement)](statement)
+                if result is not None:
+                    return result
         finally:
             self.environment = previous
 
     def visit_program(self, node):
+        self.globals.reserve(node.scope_names)
+        dispatch = self.dispatch
         for statement in node.statements:
-            statement.accept(self)
+            dispatch[type(statement)](statement)
 
     def visit_var_declaration(self, node):
         value = None
-        if node.initializer:
-            value = node.initializer.accept(self)
+        initializer = node.initializer
+        if initializer:
+            value = self.dispatch[type(initializer)](initializer)
+            if initializer.static_type == node.type:
+                # Tipo garantido pela análise semântica: dispensa a conversão
+                self.environment.values[node.slot] = value
+                return
         
-        if node.type == 'int' and isinstance(value, float):
-            value = int(value)
-        elif node.type == 'float' and isinstance(value, int):
-            value = float(value)
-        elif node.type == 'string' and value is not None:
-            value = str(value)
-        elif node.type == 'bool' and value is not None:
-            value = bool(value)
-        
-        self.environment.define(node.name, value)
+        self.environment.values[node.slot] = coerce(node.type, value)
 
     def visit_array_declaration(self, node):
         value = []
         if node.size:
-            size = node.size.accept(self)
-            if not isinstance(size, int) or size < 0:
-                raise RuntimeError("Tamanho do array deve ser um inteiro não negativo", node.line, node.column)
-            
-            default_value = None
-            if node.element_type == 'int':
-                default_value = 0
-            elif node.element_type == 'float':
-                default_value = 0.0
-            elif node.element_type == 'bool':
-                default_value = False
-            elif node.element_type == 'string':
-                default_value = ""
-            
-            value = [default_value] * size
+            size = self.visit(node.size)
+            value = new_array(node.element_type, size, node.line, node.column)
         elif node.initializer:
-            value = node.initializer.accept(self)
+            value = self.visit(node.initializer)
         
-        self.environment.define(node.name, value)
+        self.environment.values[node.slot] = value
     def visit_function_declaration(self, node):
-        function = Function(node, self.environment)
-        self.environment.define(node.name, function)
+        if node.pure and self.memoizer is not None:
+            function = MemoizedFunction(node, self.environment, self.memoizer.cache(node))
+        else:
+            function = Function(node, self.environment)
+        self.environment.values[node.slot] = function
+        self.environment.version += 1
 
     def visit_assignment(self, node):
-        value = node.value.accept(self)
+        value = node.value
+        value = self.dispatch[type(value)](value)
         
         if hasattr(node.target, 'name'):
-            self.environment.set(node.target.name, value)
+            environment = self.scope_of(node.target)
+            environment.values[node.target.slot] = value
+            if node.rebinds_function:
+                environment.version += 1
         elif hasattr(node.target, 'array'):
-            array = node.target.array.accept(self)
-            index = node.target.index.accept(self)
-            
-            if not isinstance(array, list):
-                raise RuntimeError("Tentativa de indexar não-array", node.line, node.column)
-            
-            if not isinstance(index, int):
-                raise RuntimeError("Índice deve ser inteiro", node.line, node.column)
-            
-            if index < 0 or index >= len(array):
-                raise RuntimeError("Índice fora dos limites", node.line, node.column)
-            
+            array = self.visit(node.target.array)
+            index = self.visit(node.target.index)
+            check_index(array, index, node.line, node.column)
             array[index] = value
 
     def visit_if_statement(self, node):
-        condition = node.condition.accept(self)
+        dispatch = self.dispatch
+        condition = node.condition
         
-        if self.is_truthy(condition):
-            node.then_stmt.accept(self)
+        if self.is_truthy(dispatch[type(condition)](condition)):
+            branch = node.then_stmt
         elif node.else_stmt:
-            node.else_stmt.accept(self)
+            branch = node.else_stmt
+        else:
+            return None
+        return dispatch[type(branch)](branch)
 
     def visit_while_statement(self, node):
-        while self.is_truthy(node.condition.accept(self)):
-            node.body.accept(self)
+        condition = node.condition
+        evaluate = self.dispatch[type(condition)]
+        body = node.body
+        execute = self.dispatch[type(body)]
+        while self.is_truthy(evaluate(condition)):
+            result = execute(body)
+            if result is not None:
+                return result
 
     def visit_for_statement(self, node):
-        environment = Environment(self.environment)
+        # As variáveis do for ocupam posições no quadro atual
+        if node.init:
+            self.visit(node.init)
         
-        previous = self.environment
-        try:
-            self.environment = environment
+        dispatch = self.dispatch
+        condition = node.condition
+        body = node.body
+        if node.step is not None:
+            # Laço contado: a variável percorre um range, sem avaliar a
+            # condição e a atualização a cada volta
+            values = self.environment.values
+            slot = node.init.slot
+            bound = condition.right
+            counted = counted_values(values[slot], dispatch[type(bound)](bound),
+                                     condition.operator, node.step)
+            for value in counted:
+                values[slot] = value
+                result = dispatch[type(body)](body)
+                if result is not None:
+                    return result
+            values[slot] = loop_end(counted)
+            return None
+        
+        update = node.update
+        while True:
+            if condition:
+                if not self.is_truthy(dispatch[type(condition)](condition)):
+                    break
             
-            if node.init:
-                node.init.accept(self)
+            result = dispatch[type(body)](body)
+            if result is not None:
+                return result
             
-            while True:
-                if node.condition:
-                    if not self.is_truthy(node.condition.accept(self)):
-                        break
-                
-                node.body.accept(self)
-                
-                if node.update:
-                    node.update.accept(self)
-        finally:
-            self.environment = previous
+            if update:
+                dispatch[type(update)](update)
 
     def visit_return_statement(self, node):
-        value = None
-        if node.value:
-            value = node.value.accept(self)
+        value = node.value
+        if value:
+            value = self.dispatch[type(value)](value)
+            if type(value) is TailCall:
+                return value
         
-        raise ReturnException(value)
+        return (value,)
 
     def visit_print_statement(self, node):
-        value = node.expression.accept(self)
+        value = self.visit(node.expression)
         print(self.stringify(value))
 
     def visit_expression_statement(self, node):
-        node.expression.accept(self)
+        expression = node.expression
+        self.dispatch[type(expression)](expression)
 
     def visit_block(self, node):
-        self.execute_block(node.statements, Environment(self.environment))
+        # Sem ambiente novo: as variáveis do bloco já têm posição no quadro
+        dispatch = self.dispatch
+        for statement in node.statements:
+            result = dispatch[type(statement)](statement)
+            if result is not None:
+                return result
 
     def visit_binary_op(self, node):
-        left = node.left.accept(self)
-        right = node.right.accept(self)
+        dispatch = self.dispatch
+        left = node.left
+        left = dispatch[type(left)](left)
+        right = node.right
         
-        if node.operator == '+':
-            if isinstance(left, str) or isinstance(right, str):
-                return str(left) + str(right)
-            return left + right
-        elif node.operator == '-':
-            return left - right
-        elif node.operator == '*':
-            return left * right
-        elif node.operator == '/':
-            if right == 0:
-                raise RuntimeError("Divisão por zero", node.line, node.column)
-            return left / right
-        elif node.operator == '%':
-            return left % right
-        elif node.operator == '<':
-            return left < right
-        elif node.operator == '>':
-            return left > right
-        elif node.operator == '<=':
-            return left <= right
-        elif node.operator == '>=':
-            return left >= right
-        elif node.operator == '==':
-            return left == right
-        elif node.operator == '!=':
-            return left != right
-        elif node.operator == 'and':
-            return self.is_truthy(left) and self.is_truthy(right)
-        elif node.operator == 'or':
-            return self.is_truthy(left) or self.is_truthy(right)
+        symbol = node.operator
+        if symbol == 'and':
+            # Curto-circuito: o lado direito só é avaliado se decidir o valor
+            return self.is_truthy(left) and self.is_truthy(dispatch[type(right)](right))
+        if symbol == 'or':
+            return self.is_truthy(left) or self.is_truthy(dispatch[type(right)](right))
         
-        raise RuntimeError(f"Operador binário desconhecido: {node.operator}", node.line, node.column)
+        operation = self.operations.get(node)
+        if operation is None:
+            operation = self.operations[node] = self.binary_operation(node)
+        return operation(left, dispatch[type(right)](right))
+
+    def binary_operation(self, node):
+        """Função que aplica o operador de node aos valores dos operandos"""
+        symbol = node.operator
+        if symbol == '+':
+            # Sem checagem de string quando a análise semântica garante os tipos
+            if node.static_type in ('int', 'float') or \
+                    node.left.static_type == node.right.static_type == 'string':
+                return operator.add
+            return add
+        if symbol == '/':
+            line, column = node.line, node.column
+            def divide(left, right):
+                if right == 0:
+                    raise RuntimeError("Divisão por zero", line, column)
+                return left / right
+            return divide
+        
+        operation = BINARY_OPERATIONS.get(symbol)
+        if operation is None:
+            error = RuntimeError(f"Operador binário desconhecido: {symbol}", node.line, node.column)
+            def unknown(left, right):
+                raise error
+            return unknown
+        return operation
 
     def visit_unary_op(self, node):
-        operand = node.operand.accept(self)
+        operand = node.operand
+        operand = self.dispatch[type(operand)](operand)
         
         if node.operator == '-':
             return -operand
@@ -238,57 +329,81 @@ class Interpreter(Visitor):
         return node.value
 
     def visit_identifier(self, node):
-        return self.environment.get(node.name)
+        depth = node.depth
+        environment = self.environment
+        if depth:
+            while depth:
+                environment = environment.parent
+                depth -= 1
+        elif depth is None:
+            raise undefined_variable(node.name)
+        return environment.values[node.slot]
+
+    def scope_of(self, node):
+        """Ambiente que contém a variável endereçada por node (depth, slot)"""
+        depth = node.depth
+        if depth is None:
+            raise undefined_variable(node.name)
+        environment = self.environment
+        while depth:
+            environment = environment.parent
+            depth -= 1
+        return environment
 
     def visit_function_call(self, node):
-        callee = self.environment.get(node.name)
-        
-        if not isinstance(callee, Function):
-            raise RuntimeError(f"'{node.name}' não é uma função", node.line, node.column)
+        cached = self.call_sites.get(node)
+        if cached is not None and cached[0] == self.globals.version:
+            callee = cached[1]
+        elif node.native is not None:
+            dispatch = self.dispatch
+            arguments = [dispatch[type(arg)](arg) for arg in node.arguments]
+            return NATIVES[node.native].function(*arguments, node.line, node.column)
+        else:
+            callee = self.resolve_callee(node)
         
-        arguments = []
-        for arg in node.arguments:
-            arguments.append(arg.accept(self))
+        dispatch = self.dispatch
+        arguments = [dispatch[type(arg)](arg) for arg in node.arguments]
         
+        if node.tail:
+            # Em return f(...): quem executa é o Function.call do chamador
+            return TailCall(callee, arguments)
         return callee.call(self, arguments)
 
-    def visit_array_access(self, node):
-        array = node.array.accept(self)
-        index = node.index.accept(self)
-        
-        if not isinstance(array, list):
-            raise RuntimeError("Tentativa de indexar não-array", node.line, node.column)
-        
-        if not isinstance(index, int):
-            raise RuntimeError("Índice deve ser inteiro", node.line, node.column)
-        
-        if index < 0 or index >= len(array):
-            raise RuntimeError("Índice fora dos limites", node.line, node.column)
+    def resolve_callee(self, node):
+        """Função chamada por node, guardada no cache se for global"""
+        depth = node.depth
+        environment = self.environment
+        if depth:
+            while depth:
+                environment = environment.parent
+                depth -= 1
+        elif depth is None:
+            raise undefined_variable(node.name)
+        callee = environment.values[node.slot]
         
+        if not isinstance(callee, Function):
+            raise RuntimeError(f"'{node.name}' não é uma função", node.line, node.column)
+        # Só funções globais: o quadro de uma função aninhada muda a cada chamada
+        if environment is self.globals:
+            self.call_sites[node] = (environment.version, callee)
+        return callee
+
+    def visit_array_access(self, node):
+        dispatch = self.dispatch
+        array = node.array
+        array = dispatch[type(array)](array)
+        index = node.index
+        index = dispatch[type(index)](index)
+        check_index(array, index, node.line, node.column)
         return array[index]
 
     def visit_array_literal(self, node):
         elements = []
         for element in node.elements:
-            elements.append(element.accept(self))
+            elements.append(self.visit(element))
         return elements
 
-    def is_truthy(self, value):
-        if value is None:
-            return False
-        if isinstance(value, bool):
-            return value
-        return True
-
-    def stringify(self, value):
-        if value is None:
-            return "null"
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        if isinstance(value, float):
-            text = str(value)
-            if text.endswith(".0"):
-                return text[:-2]
-            return text
-        return str(value)
+    # Semântica compartilhada com os outros motores (runtime.py)
+    is_truthy = staticmethod(is_truthy)
+    stringify = staticmethod(stringify)
 
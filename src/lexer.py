@@ -1,4 +1,6 @@
 import re
+from array import array
+from bisect import bisect_right
 from enum import Enum
 from .errors import LexerError
 
@@ -51,6 +53,90 @@ class TokenType(Enum):
     EOF = "EOF"
     NEWLINE = "NEWLINE"
 
+KEYWORDS = {
+    'if': TokenType.IF,
+    'else': TokenType.ELSE,
+    'while': TokenType.WHILE,
+    'for': TokenType.FOR,
+    'function': TokenType.FUNCTION,
+    'return': TokenType.RETURN,
+    'print': TokenType.PRINT,
+    'int': TokenType.INT,
+    'float': TokenType.FLOAT,
+    'string': TokenType.STRING_TYPE,
+    'bool': TokenType.BOOL,
+    'true': TokenType.TRUE,
+    'false': TokenType.FALSE,
+    'and': TokenType.AND,
+    'or': TokenType.OR,
+    'not': TokenType.NOT,
+}
+
+OPERATORS = {
+    '==': TokenType.EQUAL,
+    '!=': TokenType.NOT_EQUAL,
+    '<=': TokenType.LESS_EQUAL,
+    '>=': TokenType.GREATER_EQUAL,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '%': TokenType.MODULO,
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LESS,
+    '>': TokenType.GREATER,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    ';': TokenType.SEMICOLON,
+    ',': TokenType.COMMA,
+}
+
+# Padrão mestre: cada alternativa nomeada corresponde a uma classe de lexema.
+# A ordem importa: comentários antes de '/', strings completas antes de aspas soltas.
+TOKEN_PATTERN = re.compile(r"""
+    (?P<WHITESPACE>[ \t\r\n]+)
+  | (?P<COMMENT>//[^\n]*)
+  | (?P<OPERATOR>==|!=|<=|>=|[-+*/%=<>(){}\[\];,])
+  | (?P<IDENTIFIER>[^\W\d]\w*)
+  | (?P<NUMBER>\d+(?:\.\d+)?)
+  | (?P<STRING>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')
+  | (?P<UNTERMINATED>["'])
+  | (?P<INVALID>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Mesmo padrão sobre bytes (ex.: arquivo mapeado em memória). Bytes não-ASCII
+# entram no grupo IDENTIFIER e são decodificados como UTF-8 ao serem emitidos.
+BYTES_TOKEN_PATTERN = re.compile(rb"""
+    (?P<WHITESPACE>[ \t\r\n]+)
+  | (?P<COMMENT>//[^\n]*)
+  | (?P<OPERATOR>==|!=|<=|>=|[-+*/%=<>(){}\[\];,])
+  | (?P<IDENTIFIER>[A-Za-z_\x80-\xff][A-Za-z0-9_\x80-\xff]*)
+  | (?P<NUMBER>[0-9]+(?:\.[0-9]+)?)
+  | (?P<STRING>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')
+  | (?P<UNTERMINATED>["'])
+  | (?P<INVALID>.)
+""", re.VERBOSE | re.DOTALL)
+
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+def unescape(body):
+    """Resolve as sequências de escape do corpo de uma string"""
+    if '\\' not in body:
+        return body
+    return ESCAPE_PATTERN.sub(lambda m: ESCAPES.get(m.group(1), m.group(1)), body)
+
+LEXER_ENGINES = ('regex', 'classic')
+
+# Códigos compactos (um byte) para cada TokenType
+TOKEN_TYPES = list(TokenType)
+TOKEN_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
 class Token:
     def __init__(self, type_, value, line, column):
         self.type = type_
@@ -61,8 +147,95 @@ class Token:
     def __repr__(self):
         return f"Token({self.type}, {self.value}, {self.line}:{self.column})"
 
-class Lexer:
+class CompactToken:
+    """Token materializado a partir de um CompactTokenStream; linha e coluna
+    só são calculadas quando acessadas"""
+    __slots__ = ('type', 'value', 'stream', 'index')
+    
+    def __init__(self, type_, value, stream, index):
+        self.type = type_
+        self.value = value
+        self.stream = stream
+        self.index = index
+    
+    @property
+    def line(self):
+        return self.stream.position(self.index)[0]
+    
+    @property
+    def column(self):
+        return self.stream.position(self.index)[1]
+    
+    def __repr__(self):
+        return f"Token({self.type}, {self.value}, {self.line}:{self.column})"
+
+def offset_typecode(size):
+    """Menor typecode de array capaz de guardar offsets até `size`"""
+    return 'I' if size < 2 ** 32 else 'Q'
+
+class CompactTokenStream:
+    """Sequência de tokens em buffers paralelos: códigos de tipo em array('B')
+    e offsets de início/fim no fonte em array('I'). Valores são recortados do
+    fonte sob demanda e (linha, coluna) resolvidos por busca binária no índice
+    de inícios de linha."""
+    
     def __init__(self, text):
+        typecode = offset_typecode(len(text))
+        self.text = text
+        self.types = array('B')
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self.line_starts = array(typecode, [0])
+        self.last_index = None
+        self.last_token = None
+    
+    def __len__(self):
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if index == self.last_index:
+            return self.last_token
+        token = CompactToken(TOKEN_TYPES[self.types[index]], self.value(index), self, index)
+        self.last_index = index
+        self.last_token = token
+        return token
+    
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
+    
+    def value(self, index):
+        token_type = TOKEN_TYPES[self.types[index]]
+        if token_type == TokenType.EOF:
+            return None
+        start = self.starts[index]
+        end = self.ends[index]
+        if token_type == TokenType.STRING:
+            return unescape(self.text[start + 1:end - 1])
+        return self.text[start:end]
+    
+    def locate(self, offset):
+        """Converte um offset do fonte em (linha, coluna)"""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+    
+    def position(self, index):
+        start = self.starts[index]
+        line, column = self.locate(start)
+        if self.types[index] == TOKEN_CODES[TokenType.STRING]:
+            # Como no lexer clássico, strings multilinha ficam na linha do fechamento
+            line = bisect_right(self.line_starts, self.ends[index] - 1)
+        return line, column
+
+class Lexer:
+    def __init__(self, text, engine='regex'):
+        if engine not in LEXER_ENGINES:
+            raise ValueError(f"Motor léxico desconhecido: {engine}")
+        if engine == 'classic' and not isinstance(text, str):
+            raise ValueError("O lexer clássico só aceita texto (str)")
+        self.engine = engine
         self.text = text
         self.pos = 0
         self.line = 1
@@ -176,6 +349,190 @@ class Lexer:
         return Token(token_type, value, self.line, start_column)
     
     def tokenize(self):
+        if self.engine == 'classic':
+            return self.tokenize_classic()
+        return self.tokenize_regex()
+    
+    def tokenize_regex(self):
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+    
+    def iter_tokens(self):
+        """Gera os tokens sob demanda, sem materializar a lista completa"""
+        if self.engine == 'classic':
+            yield from self.tokenize_classic()
+            return
+        if not isinstance(self.text, str):
+            yield from self.iter_tokens_bytes()
+            return
+        
+        # Varredura única sobre o padrão mestre; linha e coluna vêm dos offsets
+        text = self.text
+        keywords = KEYWORDS
+        operators = OPERATORS
+        identifier = TokenType.IDENTIFIER
+        line = 1
+        line_start = 0
+        
+        for match in TOKEN_PATTERN.finditer(text):
+            kind = match.lastgroup
+            
+            if kind == 'OPERATOR':
+                value = match[0]
+                yield Token(operators[value], value, line, match.start() - line_start + 1)
+            elif kind == 'IDENTIFIER':
+                value = match[0]
+                yield Token(keywords.get(value, identifier), value, line, match.start() - line_start + 1)
+            elif kind == 'WHITESPACE':
+                start, end = match.span()
+                newlines = text.count('\n', start, end)
+                if newlines:
+                    line += newlines
+                    line_start = text.rindex('\n', start, end) + 1
+            elif kind == 'NUMBER':
+                yield Token(TokenType.NUMBER, match[0], line, match.start() - line_start + 1)
+            elif kind == 'STRING':
+                start, end = match.span()
+                column = start - line_start + 1
+                # Strings com quebra de linha: o token fica na linha do fechamento
+                newlines = text.count('\n', start, end)
+                if newlines:
+                    line += newlines
+                    line_start = text.rindex('\n', start, end) + 1
+                yield Token(TokenType.STRING, unescape(text[start + 1:end - 1]), line, column)
+            elif kind == 'COMMENT':
+                continue
+            elif kind == 'UNTERMINATED':
+                start = match.start()
+                line += text.count('\n', start)
+                raise LexerError("String não terminada", line, start - line_start + 1)
+            else:
+                raise LexerError(f"Caractere inválido: '{match[0]}'", line, match.start() - line_start + 1)
+        
+        yield Token(TokenType.EOF, None, line, len(text) - line_start + 1)
+    
+    def iter_tokens_bytes(self):
+        """Gera tokens diretamente sobre um buffer de bytes UTF-8 (bytes, mmap),
+        sem decodificar o fonte inteiro. Colunas continuam contadas em caracteres."""
+        text = self.text
+        keywords = KEYWORDS
+        operators = OPERATORS
+        identifier = TokenType.IDENTIFIER
+        line = 1
+        line_start = 0
+        # Bytes de continuação UTF-8 já vistos na linha atual (ajuste da coluna)
+        extra = 0
+        
+        for match in BYTES_TOKEN_PATTERN.finditer(text):
+            kind = match.lastgroup
+            
+            if kind == 'OPERATOR':
+                value = match[0].decode('ascii')
+                yield Token(operators[value], value, line, match.start() - line_start - extra + 1)
+            elif kind == 'IDENTIFIER':
+                chunk = match[0]
+                column = match.start() - line_start - extra + 1
+                if chunk.isascii():
+                    value = chunk.decode('ascii')
+                    yield Token(keywords.get(value, identifier), value, line, column)
+                    continue
+                # Trecho com caracteres não-ASCII: reaplica as regras do lexer de texto
+                decoded = chunk.decode('utf-8', 'replace')
+                extra += len(chunk) - len(decoded)
+                for sub in TOKEN_PATTERN.finditer(decoded):
+                    value = sub[0]
+                    if sub.lastgroup == 'IDENTIFIER':
+                        yield Token(keywords.get(value, identifier), value, line, column + sub.start())
+                    elif sub.lastgroup == 'NUMBER':
+                        yield Token(TokenType.NUMBER, value, line, column + sub.start())
+                    else:
+                        raise LexerError(f"Caractere inválido: '{value}'", line, column + sub.start())
+            elif kind == 'WHITESPACE':
+                chunk = match[0]
+                newlines = chunk.count(b'\n')
+                if newlines:
+                    line += newlines
+                    line_start = match.start() + chunk.rindex(b'\n') + 1
+                    extra = 0
+            elif kind == 'NUMBER':
+                yield Token(TokenType.NUMBER, match[0].decode('ascii'), line, match.start() - line_start - extra + 1)
+            elif kind == 'STRING':
+                chunk = match[0]
+                decoded = chunk.decode('utf-8')
+                column = match.start() - line_start - extra + 1
+                newlines = chunk.count(b'\n')
+                if newlines:
+                    line += newlines
+                    tail = chunk.rindex(b'\n') + 1
+                    line_start = match.start() + tail
+                    extra = len(chunk) - tail - len(decoded) + decoded.rindex('\n') + 1
+                else:
+                    extra += len(chunk) - len(decoded)
+                yield Token(TokenType.STRING, unescape(decoded[1:-1]), line, column)
+            elif kind == 'COMMENT':
+                chunk = match[0]
+                extra += len(chunk) - len(chunk.decode('utf-8', 'replace'))
+            elif kind == 'UNTERMINATED':
+                start = match.start()
+                column = start - line_start - extra + 1
+                line += bytes(text[start:]).count(b'\n')
+                raise LexerError("String não terminada", line, column)
+            else:
+                column = match.start() - line_start - extra + 1
+                raise LexerError(f"Caractere inválido: '{match[0].decode('ascii')}'", line, column)
+        
+        yield Token(TokenType.EOF, None, line, len(text) - line_start - extra + 1)
+    
+    def tokenize_compact(self):
+        """Tokeniza para um CompactTokenStream, sem criar objetos Token"""
+        text = self.text
+        stream = CompactTokenStream(text)
+        add_type = stream.types.append
+        add_start = stream.starts.append
+        add_end = stream.ends.append
+        add_line = stream.line_starts.append
+        codes = {value: TOKEN_CODES[token_type] for value, token_type in OPERATORS.items()}
+        codes.update((value, TOKEN_CODES[token_type]) for value, token_type in KEYWORDS.items())
+        identifier = TOKEN_CODES[TokenType.IDENTIFIER]
+        number = TOKEN_CODES[TokenType.NUMBER]
+        string = TOKEN_CODES[TokenType.STRING]
+        
+        for match in TOKEN_PATTERN.finditer(text):
+            kind = match.lastgroup
+            
+            if kind == 'OPERATOR' or kind == 'IDENTIFIER':
+                add_type(codes.get(match[0], identifier))
+            elif kind == 'NUMBER':
+                add_type(number)
+            elif kind == 'WHITESPACE' or kind == 'STRING':
+                start, end = match.span()
+                newline = text.find('\n', start, end)
+                while newline != -1:
+                    add_line(newline + 1)
+                    newline = text.find('\n', newline + 1, end)
+                if kind == 'WHITESPACE':
+                    continue
+                add_type(string)
+            elif kind == 'COMMENT':
+                continue
+            elif kind == 'UNTERMINATED':
+                line, column = stream.locate(match.start())
+                line += text.count('\n', match.start())
+                raise LexerError("String não terminada", line, column)
+            else:
+                line, column = stream.locate(match.start())
+                raise LexerError(f"Caractere inválido: '{match[0]}'", line, column)
+            
+            start, end = match.span()
+            add_start(start)
+            add_end(end)
+        
+        add_type(TOKEN_CODES[TokenType.EOF])
+        add_start(len(text))
+        add_end(len(text))
+        return stream
+    
+    def tokenize_classic(self):
         while self.pos < len(self.text):
             self.skip_whitespace()
             
@@ -8,15 +8,42 @@ Autores: João Victor Felix Moreira, Pedro Everton
 
 import sys
 import os
+import mmap
+import argparse
+from . import __version__
+from .cache import ASTCache, source_key
 from .lexer import Lexer
-from .parser import Parser
+from .parser import StreamingParser
 from .semantic import SemanticAnalyzer
+from .optimizer import Optimizer, OptimizationStats
+from .purity import PurityAnalyzer
+from .runtime import Memoizer, DEFAULT_MEMO_SIZE
 from .interpreter import Interpreter
+from .closure_compiler import ClosureCompiler
+from .bytecode import BytecodeCompiler, disassemble
+from .vm import VirtualMachine
+from .transpiler import PythonTranspiler
 from .errors import LexerError, ParserError, SemanticError, RuntimeError
 
-def read_file(filename):
-    """Lê o conteúdo de um arquivo"""
+# Motores de execução selecionáveis com --engine
+ENGINES = {
+    'tree': Interpreter,
+    'closure': ClosureCompiler,
+    'vm': VirtualMachine,
+    'python': PythonTranspiler,
+}
+DEFAULT_ENGINE = 'tree'
+
+# Acima deste tamanho o fonte é mapeado em memória e tokenizado como bytes
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+def read_file(filename, mmap_threshold=MMAP_THRESHOLD):
+    """Lê o conteúdo de um arquivo (mapeado em memória se for muito grande)"""
     try:
+        size = os.path.getsize(filename)
+        if size and size >= mmap_threshold:
+            with open(filename, 'rb') as file:
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
         with open(filename, 'r', encoding='utf-8') as file:
             return file.read()
     except FileNotFoundError:
@@ -26,24 +53,59 @@ def read_file(filename):
         print(f"Erro ao ler arquivo '{filename}': {e}")
         sys.exit(1)
 
-def run_code(source_code, filename="<stdin>"):
+def compile_source(source_code, optimize=True, stats=None):
+    """Executa as análises léxica, sintática e semântica e devolve a AST"""
+    # Análise Léxica e Sintática: os tokens são consumidos sob demanda
+    lexer = Lexer(source_code)
+    parser = StreamingParser(lexer.iter_tokens())
+    ast = parser.parse()
+    
+    # Análise Semântica
+    semantic_analyzer = SemanticAnalyzer()
+    semantic_analyzer.analyze(ast)
+    
+    # Otimização; se algo mudou, uma nova análise refaz endereços e tipos
+    if optimize:
+        if Optimizer(semantic_analyzer, stats).optimize(ast).total:
+            SemanticAnalyzer().analyze(ast)
+    
+    # Funções puras, que --memoize pode memoizar
+    PurityAnalyzer().analyze(ast)
+    return ast
+
+def load_program(source_code, filename, cache=None, stats=None):
+    """Obtém a AST do cache em disco ou compila o fonte e a guarda nele"""
+    if cache is None:
+        return compile_source(source_code, stats=stats)
+    
+    name = os.path.basename(filename)
+    key = source_key(source_code)
+    ast = cache.load(name, key)
+    if ast is None:
+        ast = compile_source(source_code, stats=stats)
+        cache.store(name, key, ast)
+    return ast
+
+def run_code(source_code, filename="<stdin>", cache=None, engine=DEFAULT_ENGINE,
+             show_bytecode=False, show_stats=False, memoizer=None):
     """Executa código MiniLang"""
     try:
-        # Análise Léxica
-        lexer = Lexer(source_code)
-        tokens = lexer.tokenize()
-        
-        # Análise Sintática
-        parser = Parser(tokens)
-        ast = parser.parse()
+        stats = OptimizationStats() if show_stats else None
+        ast = load_program(source_code, filename, cache, stats)
+        if stats is not None:
+            print(stats.report(), file=sys.stderr)
         
-        # Análise Semântica
-        semantic_analyzer = SemanticAnalyzer()
-        semantic_analyzer.analyze(ast)
+        if show_bytecode:
+            print(disassemble(BytecodeCompiler().compile(ast)))
+            return
         
         # Interpretação
-        interpreter = Interpreter()
-        interpreter.interpret(ast)
+        interpreter = ENGINES[engine](memoizer)
+        try:
+            interpreter.interpret(ast)
+        finally:
+            if show_stats and memoizer is not None:
+                print(memoizer.report(), file=sys.stderr)
         
     except LexerError as e:
         print(f"Erro Léxico em {filename}: {e}")
@@ -61,9 +123,9 @@ def run_code(source_code, filename="<stdin>"):
         print(f"Erro inesperado em {filename}: {e}")
         sys.exit(1)
 
-def run_interactive():
+def run_interactive(engine=DEFAULT_ENGINE):
     """Executa o interpretador em modo interativo"""
-    print("MiniLang Interpretador v1.0")
+    print(f"MiniLang Interpretador v{__version__}")
     print("Digite 'exit' para sair")
     print()
     
@@ -73,33 +135,70 @@ def run_interactive():
             if line.strip().lower() == 'exit':
                 break
             if line.strip():
-                run_code(line, "<interactive>")
+                run_code(line, "<interactive>", engine=engine)
         except KeyboardInterrupt:
             print("\nSaindo...")
             break
         except EOFError:
             break
 
-def main():
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: {text}")
+    return value
+
+def build_arg_parser():
+    """Define os argumentos de linha de comando"""
+    arg_parser = argparse.ArgumentParser(
+        prog='minilang',
+        description='Interpretador da linguagem MiniLang (sem arquivo: modo interativo)')
+    arg_parser.add_argument('arquivo', nargs='?',
+                            help='arquivo de código MiniLang para executar')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='não lê nem grava o cache de compilação (__mlcache__)')
+    arg_parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE,
+                            help='motor de execução: tree (percorre a AST), closure '
+                                 '(compila para closures), vm (bytecode numa máquina de '
+                                 'pilha) ou python (traduz para Python); '
+                                 f'padrão: {DEFAULT_ENGINE}')
+    arg_parser.add_argument('--disassemble', action='store_true',
+                            help='mostra o bytecode do programa em vez de executá-lo')
+    arg_parser.add_argument('--stats', action='store_true',
+                            help='mostra em stderr o que o otimizador fez (ignora o cache) '
+                                 'e, com --memoize, os acertos da memoização')
+    arg_parser.add_argument('--memoize', action='store_true',
+                            help='guarda os resultados das funções puras pelos argumentos')
+    arg_parser.add_argument('--memoize-size', type=positive_int, default=DEFAULT_MEMO_SIZE,
+                            metavar='N',
+                            help='resultados guardados por função com --memoize, '
+                                 f'descartando os usados há mais tempo; padrão: {DEFAULT_MEMO_SIZE}')
+    return arg_parser
+
+def main(argv=None):
     """Função principal"""
-    if len(sys.argv) == 1:
+    args = build_arg_parser().parse_args(argv)
+    if args.arquivo is None:
         # Modo interativo
-        run_interactive()
-    elif len(sys.argv) == 2:
-        # Executa arquivo
-        filename = sys.argv[1]
-        if not os.path.exists(filename):
-            print(f"Erro: Arquivo '{filename}' não encontrado.")
-            sys.exit(1)
-        
-        source_code = read_file(filename)
-        run_code(source_code, filename)
-    else:
-        print("Uso: python3 minilang.py [arquivo.ml]")
-        print("  arquivo.ml - arquivo de código MiniLang para executar")
-        print("  (sem argumentos) - modo interativo")
+        run_interactive(args.engine)
+        return
+    
+    # Executa arquivo
+    filename = args.arquivo
+    if not os.path.exists(filename):
+        print(f"Erro: Arquivo '{filename}' não encontrado.")
         sys.exit(1)
+    
+    # Com --stats o programa é sempre compilado, para haver o que mostrar
+    cache = None if args.no_cache or args.stats else ASTCache.for_script(filename)
+    source_code = read_file(filename)
+    try:
+        memoizer = Memoizer(args.memoize_size) if args.memoize else None
+        run_code(source_code, filename, cache, args.engine, args.disassemble, args.stats,
+                 memoizer)
+    finally:
+        if isinstance(source_code, mmap.mmap):
+            source_code.close()
 
 if __name__ == "__main__":
     main()
-
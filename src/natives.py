@@ -0,0 +1,150 @@
+"""
+Funções nativas do MiniLang: operações sobre arrays inteiros executadas de
+uma vez em Python (len, fill, copy, sum, min, max, sort, dot, add e mul), em
+vez de laços interpretados com um acesso verificado por elemento.
+
+Cada nativa tem uma assinatura, usada pela análise semântica para conferir
+os argumentos e o tipo do resultado, e uma implementação que recebe os
+argumentos seguidos da linha e da coluna da chamada, para os erros. Uma
+declaração do programa com o mesmo nome esconde a nativa.
+
+Tipos dos parâmetros: 'array' (qualquer array), 'numbers' (array de int ou
+float) e 'element' (valor do tipo dos elementos do primeiro argumento).
+Tipos do resultado: 'int', 'array' (o tipo do primeiro argumento),
+'element', 'number' (int ou float, conforme os elementos) ou None, para as
+nativas que só alteram o array e não devolvem valor.
+"""
+
+import operator
+from .errors import RuntimeError
+from .runtime import add as add_values, ARRAY_TYPES, IntArray, FloatArray
+
+class Native:
+    """Função nativa: assinatura, implementação e se é pura (não altera arrays)"""
+
+    __slots__ = ('name', 'parameters', 'result', 'function', 'pure')
+
+    def __init__(self, name, parameters, result, function, pure):
+        self.name = name
+        self.parameters = parameters
+        self.result = result
+        self.function = function
+        self.pure = pure
+
+    def __repr__(self):
+        return f"<nativa {self.name}>"
+
+NATIVES = {}
+
+def native(name, parameters, result, pure=True):
+    """Registra a função decorada como a nativa name"""
+    def register(function):
+        NATIVES[name] = Native(name, parameters, result, function, pure)
+        return function
+    return register
+
+def check_array(name, items, line, column):
+    if type(items) not in ARRAY_TYPES:
+        raise RuntimeError(f"'{name}' espera um array", line, column)
+
+def check_lengths(name, arrays, line, column):
+    for items in arrays:
+        check_array(name, items, line, column)
+    if len({len(items) for items in arrays}) > 1:
+        raise RuntimeError(f"'{name}' espera arrays do mesmo tamanho", line, column)
+
+def replace(items, values):
+    """Troca todos os elementos de items por values"""
+    if type(items) is list:
+        items[:] = values
+    else:
+        items.assign(values)
+
+def elements(items):
+    """Elementos de items para as funções do Python: o buffer direto, se ele
+    já devolve os valores do programa (arrays compactos de números)"""
+    if type(items) is IntArray or type(items) is FloatArray:
+        return items.items
+    return items
+
+@native('len', ('array',), 'int')
+def native_len(items, line, column):
+    check_array('len', items, line, column)
+    return len(items)
+
+@native('fill', ('array', 'element'), None, pure=False)
+def native_fill(items, value, line, column):
+    check_array('fill', items, line, column)
+    replace(items, [value] * len(items))
+
+@native('copy', ('array',), 'array')
+def native_copy(items, line, column):
+    check_array('copy', items, line, column)
+    return items.copy()
+
+@native('sum', ('numbers',), 'number')
+def native_sum(items, line, column):
+    check_array('sum', items, line, column)
+    try:
+        return sum(elements(items))
+    except TypeError:
+        raise RuntimeError("'sum' espera um array de números", line, column) from None
+
+def extreme(name, choose, items, line, column):
+    check_array(name, items, line, column)
+    if not items:
+        raise RuntimeError(f"'{name}' de array vazio", line, column)
+    try:
+        return choose(elements(items))
+    except TypeError:
+        raise RuntimeError(f"'{name}' com elementos que não se comparam", line, column) from None
+
+@native('min', ('array',), 'element')
+def native_min(items, line, column):
+    return extreme('min', min, items, line, column)
+
+@native('max', ('array',), 'element')
+def native_max(items, line, column):
+    return extreme('max', max, items, line, column)
+
+@native('sort', ('array',), None, pure=False)
+def native_sort(items, line, column):
+    check_array('sort', items, line, column)
+    try:
+        if type(items) is list:
+            items.sort()
+        else:
+            items.assign(sorted(elements(items)))
+    except TypeError:
+        raise RuntimeError("'sort' com elementos que não se comparam", line, column) from None
+
+def numeric(arrays):
+    """Se os arrays são compactos de números, em que o + do Python basta"""
+    return all(type(items) in (IntArray, FloatArray) and type(items.items) is not list
+               for items in arrays)
+
+@native('dot', ('numbers', 'numbers'), 'number')
+def native_dot(left, right, line, column):
+    check_lengths('dot', (left, right), line, column)
+    try:
+        return sum(map(operator.mul, elements(left), elements(right)))
+    except TypeError:
+        raise RuntimeError("'dot' espera arrays de números", line, column) from None
+
+def elementwise(name, operation, target, left, right, line, column):
+    check_lengths(name, (target, left, right), line, column)
+    try:
+        values = list(map(operation, elements(left), elements(right)))
+    except TypeError:
+        raise RuntimeError(f"'{name}' espera arrays de números", line, column) from None
+    replace(target, values)
+
+@native('add', ('numbers', 'numbers', 'numbers'), None, pure=False)
+def native_add(target, left, right, line, column):
+    # Com strings em arrays sem tipo, + do MiniLang concatena
+    operation = operator.add if numeric((left, right)) else add_values
+    elementwise('add', operation, target, left, right, line, column)
+
+@native('mul', ('numbers', 'numbers', 'numbers'), None, pure=False)
+def native_mul(target, left, right, line, column):
+    elementwise('mul', operator.mul, target, left, right, line, column)
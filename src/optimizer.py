@@ -0,0 +1,279 @@
+"""
+Otimizador da AST, executado entre a análise semântica e a execução.
+
+Usa as ligações feitas pela análise (identificador -> símbolo) para:
+- dobrar expressões cujos operandos são literais, inclusive concatenação
+  de strings, com as mesmas operações usadas em tempo de execução, e
+  and/or cujo lado esquerdo é literal (curto-circuito);
+- propagar o valor de variáveis declaradas com inicializador constante e
+  nunca reatribuídas;
+- remover if/while/for com condição constante falsa (e o if verdadeiro vira
+  o próprio ramo);
+- remover comandos inalcançáveis depois de um return.
+
+Expressões que falhariam em execução (divisão por zero, tipos incompatíveis)
+nunca são dobradas: o erro continua acontecendo no mesmo ponto.
+"""
+
+from .ast_nodes import Visitor, Literal, Identifier, IfStatement, ReturnStatement, Block
+from .runtime import is_truthy, coerce
+
+# Tipo MiniLang dos valores que podem virar literais
+LITERAL_TYPES = {bool: 'bool', int: 'int', float: 'float', str: 'string'}
+
+def fold_binary(operator, a, b):
+    """Valor de a operator b, com a semântica de execução"""
+    if operator == '+':
+        if isinstance(a, str) or isinstance(b, str):
+            return str(a) + str(b)
+        return a + b
+    if operator == '-':
+        return a - b
+    if operator == '*':
+        return a * b
+    if operator == '/':
+        if b == 0:
+            raise ZeroDivisionError
+        return a / b
+    if operator == '%':
+        return a % b
+    if operator == '<':
+        return a < b
+    if operator == '>':
+        return a > b
+    if operator == '<=':
+        return a <= b
+    if operator == '>=':
+        return a >= b
+    if operator == '==':
+        return a == b
+    if operator == '!=':
+        return a != b
+    if operator == 'and':
+        return is_truthy(a) and is_truthy(b)
+    if operator == 'or':
+        return is_truthy(a) or is_truthy(b)
+    raise ValueError(operator)
+
+def fold_unary(operator, value):
+    if operator == '-':
+        return -value
+    if operator == 'not':
+        return not is_truthy(value)
+    raise ValueError(operator)
+
+def always_returns(statement):
+    """Indica se o comando sempre termina com return"""
+    if type(statement) is ReturnStatement:
+        return True
+    if type(statement) is Block:
+        return any(always_returns(child) for child in statement.statements)
+    if type(statement) is IfStatement:
+        return statement.else_stmt is not None and \
+            always_returns(statement.then_stmt) and always_returns(statement.else_stmt)
+    return False
+
+class OptimizationStats:
+    def __init__(self):
+        self.folded = 0
+        self.propagated = 0
+        self.branches = 0
+        self.unreachable = 0
+
+    @property
+    def total(self):
+        return self.folded + self.propagated + self.branches + self.unreachable
+
+    def report(self):
+        return "\n".join([
+            "Otimizações:",
+            f"  expressões constantes dobradas: {self.folded}",
+            f"  constantes propagadas: {self.propagated}",
+            f"  desvios mortos removidos: {self.branches}",
+            f"  comandos inalcançáveis removidos: {self.unreachable}",
+        ])
+
+class Optimizer(Visitor):
+    def __init__(self, analyzer, stats=None):
+        super().__init__()
+        self.stats = stats if stats is not None else OptimizationStats()
+        # Símbolo lido por cada identificador e símbolos reatribuídos
+        self.bindings = {node: symbol for node, symbol in analyzer.typed_nodes
+                         if type(node) is Identifier and symbol is not None}
+        self.reassigned = {symbol for symbol, _, declaration in analyzer.assignments
+                           if not declaration}
+        # Declaração -> valor constante da variável
+        self.constants = {}
+
+    def optimize(self, ast):
+        """Otimiza a AST no lugar e devolve as estatísticas"""
+        self.visit(ast)
+        return self.stats
+
+    def literal(self, value, node):
+        literal = Literal(value, LITERAL_TYPES[type(value)], node.line, node.column)
+        literal.static_type = literal.type
+        return literal
+
+    def optional(self, node):
+        return self.visit(node) if node is not None else None
+
+    def optimize_statements(self, statements):
+        optimized = []
+        for index, statement in enumerate(statements):
+            statement = self.visit(statement)
+            if statement is None:
+                continue
+            optimized.append(statement)
+            if always_returns(statement):
+                self.stats.unreachable += len(statements) - index - 1
+                break
+        return optimized
+
+    def optimize_body(self, statement):
+        """Corpo de if/laço: um comando removido vira bloco vazio"""
+        statement = self.visit(statement)
+        return statement if statement is not None else Block([], None, None)
+
+    def visit_program(self, node):
+        node.statements = self.optimize_statements(node.statements)
+        return node
+
+    def visit_var_declaration(self, node):
+        node.initializer = self.optional(node.initializer)
+        initializer = node.initializer
+        if type(initializer) is Literal:
+            value = coerce(node.type, initializer.value)
+            if type(value) in LITERAL_TYPES:
+                self.constants[node] = value
+        return node
+
+    def visit_array_declaration(self, node):
+        node.size = self.optional(node.size)
+        node.initializer = self.optional(node.initializer)
+        return node
+
+    def visit_function_declaration(self, node):
+        node.body.statements = self.optimize_statements(node.body.statements)
+        return node
+
+    def visit_assignment(self, node):
+        node.value = self.visit(node.value)
+        target = node.target
+        if not hasattr(target, 'name'):
+            # O alvo continua sendo acesso a array; só os operandos mudam
+            target.array = self.visit(target.array)
+            target.index = self.visit(target.index)
+        return node
+
+    def visit_if_statement(self, node):
+        node.condition = self.visit(node.condition)
+        if type(node.condition) is Literal:
+            self.stats.branches += 1
+            if is_truthy(node.condition.value):
+                return self.visit(node.then_stmt)
+            return self.optional(node.else_stmt)
+
+        node.then_stmt = self.optimize_body(node.then_stmt)
+        if node.else_stmt is not None:
+            node.else_stmt = self.visit(node.else_stmt)
+        return node
+
+    def visit_while_statement(self, node):
+        node.condition = self.visit(node.condition)
+        if type(node.condition) is Literal and not is_truthy(node.condition.value):
+            self.stats.branches += 1
+            return None
+        node.body = self.optimize_body(node.body)
+        return node
+
+    def visit_for_statement(self, node):
+        node.init = self.optional(node.init)
+        node.condition = self.optional(node.condition)
+        if type(node.condition) is Literal and not is_truthy(node.condition.value):
+            self.stats.branches += 1
+            # Só a inicialização executa, no escopo próprio do for
+            return Block([node.init], node.line, node.column) if node.init else None
+        node.update = self.optional(node.update)
+        node.body = self.optimize_body(node.body)
+        return node
+
+    def visit_return_statement(self, node):
+        node.value = self.optional(node.value)
+        return node
+
+    def visit_print_statement(self, node):
+        node.expression = self.visit(node.expression)
+        return node
+
+    def visit_expression_statement(self, node):
+        node.expression = self.visit(node.expression)
+        return node
+
+    def visit_block(self, node):
+        node.statements = self.optimize_statements(node.statements)
+        return node
+
+    def visit_binary_op(self, node):
+        node.left = left = self.visit(node.left)
+        if node.operator in ('and', 'or') and type(left) is Literal:
+            # Curto-circuito: com o lado esquerdo constante, o direito ou
+            # nunca executa ou é o próprio valor (se já for bool)
+            decided = node.operator == 'or'
+            if is_truthy(left.value) == decided:
+                self.stats.folded += 1
+                return self.literal(decided, node)
+            node.right = right = self.visit(node.right)
+            if right.static_type == 'bool':
+                self.stats.folded += 1
+                return right
+            return node
+
+        node.right = right = self.visit(node.right)
+        if type(left) is Literal and type(right) is Literal:
+            try:
+                value = fold_binary(node.operator, left.value, right.value)
+            except Exception:
+                return node
+            if type(value) in LITERAL_TYPES:
+                self.stats.folded += 1
+                return self.literal(value, node)
+        return node
+
+    def visit_unary_op(self, node):
+        node.operand = operand = self.visit(node.operand)
+        if type(operand) is Literal:
+            try:
+                value = fold_unary(node.operator, operand.value)
+            except Exception:
+                return node
+            if type(value) in LITERAL_TYPES:
+                self.stats.folded += 1
+                return self.literal(value, node)
+        return node
+
+    def visit_literal(self, node):
+        return node
+
+    def visit_identifier(self, node):
+        symbol = self.bindings.get(node)
+        if symbol is None or symbol in self.reassigned:
+            return node
+        declaration = symbol.declaration
+        if declaration not in self.constants:
+            return node
+        self.stats.propagated += 1
+        return self.literal(self.constants[declaration], node)
+
+    def visit_function_call(self, node):
+        node.arguments = [self.visit(argument) for argument in node.arguments]
+        return node
+
+    def visit_array_access(self, node):
+        node.array = self.visit(node.array)
+        node.index = self.visit(node.index)
+        return node
+
+    def visit_array_literal(self, node):
+        node.elements = [self.visit(element) for element in node.elements]
+        return node
@@ -1,11 +1,48 @@
-from .lexer import TokenType
+from collections import deque
+from .lexer import Token, TokenType
 from .ast_nodes import *
 from .errors import ParserError
 
+# Precedência dos operadores binários (maior valor = liga mais forte)
+BINARY_PRECEDENCE = {
+    TokenType.OR: 1,
+    TokenType.AND: 2,
+    TokenType.EQUAL: 3,
+    TokenType.NOT_EQUAL: 3,
+    TokenType.LESS: 4,
+    TokenType.LESS_EQUAL: 4,
+    TokenType.GREATER: 4,
+    TokenType.GREATER_EQUAL: 4,
+    TokenType.PLUS: 5,
+    TokenType.MINUS: 5,
+    TokenType.MULTIPLY: 6,
+    TokenType.DIVIDE: 6,
+    TokenType.MODULO: 6,
+}
+
+UNARY_OPERATORS = frozenset({TokenType.NOT, TokenType.MINUS})
+
+TYPE_KEYWORDS = frozenset({TokenType.INT, TokenType.FLOAT, TokenType.STRING_TYPE, TokenType.BOOL})
+
+# Primeiro token de um comando -> método que o analisa. Os demais tokens
+# iniciam uma atribuição ou expressão.
+STATEMENT_PARSERS = {
+    **{token_type: 'parse_declaration' for token_type in TYPE_KEYWORDS},
+    TokenType.FUNCTION: 'parse_function_declaration',
+    TokenType.IF: 'parse_if_statement',
+    TokenType.WHILE: 'parse_while_statement',
+    TokenType.FOR: 'parse_for_statement',
+    TokenType.RETURN: 'parse_return_statement',
+    TokenType.PRINT: 'parse_print_statement',
+    TokenType.LBRACE: 'parse_block',
+}
+
 class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
         self.current = 0
+        self.statement_parsers = {token_type: getattr(self, name)
+                                  for token_type, name in STATEMENT_PARSERS.items()}
     
     def current_token(self):
         if self.current >= len(self.tokens):
@@ -37,45 +74,21 @@ class Parser:
         raise ParserError(message, current.line, current.column)
     
     def parse(self):
-        statements = []
+        return Program(list(self.iter_statements()))
+    
+    def iter_statements(self):
+        """Gera os comandos de nível superior à medida que são reconhecidos"""
         while self.current_token().type != TokenType.EOF:
             stmt = self.parse_statement()
             if stmt:
-                statements.append(stmt)
-        return Program(statements)
+                yield stmt
     
     def parse_statement(self):
-        # Declarações de variáveis
-        if self.current_token().type in [TokenType.INT, TokenType.FLOAT, 
-                                       TokenType.STRING_TYPE, TokenType.BOOL]:
-            return self.parse_declaration()
-        
-        # Declaração de função
-        if self.current_token().type == TokenType.FUNCTION:
-            return self.parse_function_declaration()
-        
-        # Comandos de controle
-        if self.current_token().type == TokenType.IF:
-            return self.parse_if_statement()
-        
-        if self.current_token().type == TokenType.WHILE:
-            return self.parse_while_statement()
-        
-        if self.current_token().type == TokenType.FOR:
-            return self.parse_for_statement()
-        
-        if self.current_token().type == TokenType.RETURN:
-            return self.parse_return_statement()
-        
-        if self.current_token().type == TokenType.PRINT:
-            return self.parse_print_statement()
-        
-        # Bloco
-        if self.current_token().type == TokenType.LBRACE:
-            return self.parse_block()
-        
-        # Atribuição ou expressão
-        return self.parse_expression_statement()
+        handler = self.statement_parsers.get(self.current_token().type)
+        if handler is None:
+            # Atribuição ou expressão
+            return self.parse_expression_statement()
+        return handler()
     
     def parse_declaration(self):
         type_token = self.advance()
@@ -166,6 +179,18 @@ class Parser:
         )
     
     def parse_function_declaration(self):
+        func_token, name_token, parameters = self.parse_function_header()
+        body = self.parse_block()
+        
+        return FunctionDeclaration(
+            name_token.value,
+            parameters,
+            body,
+            func_token.line,
+            func_token.column
+        )
+    
+    def parse_function_header(self):
         func_token = self.advance()  # consome 'function'
         name_token = self.consume(TokenType.IDENTIFIER, "Esperado nome da função")
 
@@ -175,8 +200,7 @@ class Parser:
         if self.current_token().type != TokenType.RPAREN:
             # Primeiro parâmetro
             param_type = None
-            if self.current_token().type in [TokenType.INT, TokenType.FLOAT, 
-                                           TokenType.STRING_TYPE, TokenType.BOOL]:
+            if self.current_token().type in TYPE_KEYWORDS:
                 param_type = self.advance().value
             
             param_name = self.consume(TokenType.IDENTIFIER, "Esperado nome do parâmetro")
@@ -187,8 +211,7 @@ class Parser:
                 self.advance()  # consome ','
                 
                 param_type = None
-                if self.current_token().type in [TokenType.INT, TokenType.FLOAT, 
-                                               TokenType.STRING_TYPE, TokenType.BOOL]:
+                if self.current_token().type in TYPE_KEYWORDS:
                     param_type = self.advance().value
                 
                 param_name = self.consume(TokenType.IDENTIFIER, "Esperado nome do parâmetro")
@@ -196,22 +219,17 @@ class Parser:
         
         self.consume(TokenType.RPAREN, "Esperado ')' após parâmetros")
         
-        body = self.parse_block()
-        
-        return FunctionDeclaration(
-            name_token.value,
-            parameters,
-            body,
-            func_token.line,
-            func_token.column
-        )
+        return func_token, name_token, parameters
 
-    def parse_if_statement(self):
-        if_token = self.advance()  # consome 'if'
-        
-        self.consume(TokenType.LPAREN, "Esperado '(' após 'if'")
+    def parse_condition(self, keyword):
+        self.consume(TokenType.LPAREN, f"Esperado '(' após '{keyword}'")
         condition = self.parse_expression()
         self.consume(TokenType.RPAREN, "Esperado ')' após condição")
+        return condition
+    
+    def parse_if_statement(self):
+        if_token = self.advance()  # consome 'if'
+        condition = self.parse_condition('if')
         
         then_stmt = self.parse_statement()
         
@@ -224,16 +242,19 @@ class Parser:
     
     def parse_while_statement(self):
         while_token = self.advance()  # consome 'while'
-        
-        self.consume(TokenType.LPAREN, "Esperado '(' após 'while'")
-        condition = self.parse_expression()
-        self.consume(TokenType.RPAREN, "Esperado ')' após condição")
+        condition = self.parse_condition('while')
         
         body = self.parse_statement()
         
         return WhileStatement(condition, body, while_token.line, while_token.column)
     
     def parse_for_statement(self):
+        for_token, init, condition, update = self.parse_for_header()
+        body = self.parse_statement()
+        
+        return ForStatement(init, condition, update, body, for_token.line, for_token.column)
+    
+    def parse_for_header(self):
         for_token = self.advance()  # consome 'for'
         
         self.consume(TokenType.LPAREN, "Esperado '(' após 'for'")
@@ -241,8 +262,7 @@ class Parser:
         # Inicialização
         init = None
         if self.current_token().type != TokenType.SEMICOLON:
-            if self.current_token().type in [TokenType.INT, TokenType.FLOAT, 
-                                           TokenType.STRING_TYPE, TokenType.BOOL]:
+            if self.current_token().type in TYPE_KEYWORDS:
                 init = self.parse_declaration_no_semicolon()
             else:
                 init = self.parse_expression_statement_no_semicolon()
@@ -261,9 +281,7 @@ class Parser:
         
         self.consume(TokenType.RPAREN, "Esperado ')' após for")
         
-        body = self.parse_statement()
-        
-        return ForStatement(init, condition, update, body, for_token.line, for_token.column)
+        return for_token, init, condition, update
 
     def parse_expression_statement_no_semicolon(self):
         expr = self.parse_expression()
@@ -324,75 +342,25 @@ class Parser:
         self.consume(TokenType.SEMICOLON, "Esperado ';' após expressão")
         return ExpressionStatement(expr, expr.line, expr.column)
     
-    def parse_expression(self):
-        return self.parse_logical_or()
-    
-    def parse_logical_or(self):
-        expr = self.parse_logical_and()
-        
-        while self.current_token().type == TokenType.OR:
-            operator = self.advance()
-            right = self.parse_logical_and()
-            expr = BinaryOp(expr, operator.value, right, expr.line, expr.column)
-        
-        return expr
-    
-    def parse_logical_and(self):
-        expr = self.parse_equality()
-        
-        while self.current_token().type == TokenType.AND:
-            operator = self.advance()
-            right = self.parse_equality()
-            expr = BinaryOp(expr, operator.value, right, expr.line, expr.column)
-        
-        return expr
-    
-    def parse_equality(self):
-        expr = self.parse_comparison()
-        
-        while self.current_token().type in [TokenType.EQUAL, TokenType.NOT_EQUAL]:
-            operator = self.advance()
-            right = self.parse_comparison()
-            expr = BinaryOp(expr, operator.value, right, expr.line, expr.column)
-        
-        return expr
-    
-    def parse_comparison(self):
-        expr = self.parse_term()
-        
-        while self.current_token().type in [TokenType.GREATER, TokenType.GREATER_EQUAL,
-                                          TokenType.LESS, TokenType.LESS_EQUAL]:
-            operator = self.advance()
-            right = self.parse_term()
-            expr = BinaryOp(expr, operator.value, right, expr.line, expr.column)
-        
-        return expr
-    
-    def parse_term(self):
-        expr = self.parse_factor()
-        
-        while self.current_token().type in [TokenType.PLUS, TokenType.MINUS]:
-            operator = self.advance()
-            right = self.parse_factor()
-            expr = BinaryOp(expr, operator.value, right, expr.line, expr.column)
-        
-        return expr
-    
-    def parse_factor(self):
+    def parse_expression(self, min_precedence=1):
+        # Precedence climbing: um único laço guiado pela tabela de precedência
         expr = self.parse_unary()
         
-        while self.current_token().type in [TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO]:
+        while True:
+            precedence = BINARY_PRECEDENCE.get(self.current_token().type)
+            if precedence is None or precedence < min_precedence:
+                return expr
             operator = self.advance()
-            right = self.parse_unary()
+            # Operadores associativos à esquerda: o lado direito liga mais forte
+            right = self.parse_expression(precedence + 1)
             expr = BinaryOp(expr, operator.value, right, expr.line, expr.column)
-        
-        return expr
     
     def parse_unary(self):
-        if self.current_token().type in [TokenType.NOT, TokenType.MINUS]:
-            operator = self.advance()
+        token = self.current_token()
+        if token.type in UNARY_OPERATORS:
+            self.advance()
             operand = self.parse_unary()
-            return UnaryOp(operator.value, operand, operator.line, operator.column)
+            return UnaryOp(token.value, operand, token.line, token.column)
         
         return self.parse_postfix()
     
@@ -400,14 +368,15 @@ class Parser:
         expr = self.parse_primary()
         
         while True:
-            if self.current_token().type == TokenType.LBRACKET:
+            token_type = self.current_token().type
+            if token_type == TokenType.LBRACKET:
                 # Acesso a array
                 self.advance()  # consome '['
                 index = self.parse_expression()
                 self.consume(TokenType.RBRACKET, "Esperado ']' após índice")
                 expr = ArrayAccess(expr, index, expr.line, expr.column)
             
-            elif self.current_token().type == TokenType.LPAREN:
+            elif token_type == TokenType.LPAREN:
                 # Chamada de função
                 self.advance()  # consome '('
                 arguments = []
@@ -426,44 +395,45 @@ class Parser:
                 else:
                     raise ParserError("Chamada de função inválida", expr.line, expr.column)
             else:
-                break
-        
-        return expr
+                return expr
     
     def parse_primary(self):
+        token = self.current_token()
+        token_type = token.type
+        
+        # Identificadores
+        if token_type == TokenType.IDENTIFIER:
+            self.advance()
+            return Identifier(token.value, token.line, token.column)
+        
         # Números
-        if self.current_token().type == TokenType.NUMBER:
-            token = self.advance()
+        if token_type == TokenType.NUMBER:
+            self.advance()
             if '.' in token.value:
                 return Literal(float(token.value), 'float', token.line, token.column)
             else:
                 return Literal(int(token.value), 'int', token.line, token.column)
         
         # Strings
-        if self.current_token().type == TokenType.STRING:
-            token = self.advance()
+        if token_type == TokenType.STRING:
+            self.advance()
             return Literal(token.value, 'string', token.line, token.column)
         
         # Booleanos
-        if self.current_token().type in [TokenType.TRUE, TokenType.FALSE]:
-            token = self.advance()
+        if token_type == TokenType.TRUE or token_type == TokenType.FALSE:
+            self.advance()
             value = token.value == 'true'
             return Literal(value, 'bool', token.line, token.column)
         
-        # Identificadores
-        if self.current_token().type == TokenType.IDENTIFIER:
-            token = self.advance()
-            return Identifier(token.value, token.line, token.column)
-        
         # Expressões entre parênteses
-        if self.current_token().type == TokenType.LPAREN:
+        if token_type == TokenType.LPAREN:
             self.advance()  # consome '('
             expr = self.parse_expression()
             self.consume(TokenType.RPAREN, "Esperado ')' após expressão")
             return expr
         
         # Arrays literais
-        if self.current_token().type == TokenType.LBRACKET:
+        if token_type == TokenType.LBRACKET:
             bracket_token = self.advance()  # consome '['
             elements = []
             
@@ -478,6 +448,50 @@ class Parser:
             return ArrayLiteral(elements, bracket_token.line, bracket_token.column)
         
         # Erro
-        current = self.current_token()
-        raise ParserError(f"Token inesperado: {current.value}", current.line, current.column)
+        raise ParserError(f"Token inesperado: {token.value}", token.line, token.column)
+
 
+class StreamingParser(Parser):
+    """Parser que lê tokens sob demanda de um iterador (ex.: Lexer.iter_tokens()),
+    mantendo apenas uma pequena janela de lookahead em memória"""
+    
+    def __init__(self, tokens):
+        super().__init__([])
+        self.stream = iter(tokens)
+        self.buffer = deque()
+        self.previous = None
+        self.eof = None
+    
+    def fill(self, count):
+        buffer = self.buffer
+        while len(buffer) < count:
+            if self.eof is None:
+                token = next(self.stream, None)
+                if token is None:
+                    # Iterador terminou sem EOF explícito
+                    line = self.previous.line if self.previous else 1
+                    token = Token(TokenType.EOF, None, line, 0)
+                if token.type == TokenType.EOF:
+                    self.eof = token
+            else:
+                token = self.eof
+            buffer.append(token)
+    
+    def current_token(self):
+        if not self.buffer:
+            self.fill(1)
+        return self.buffer[0]
+    
+    def peek_token(self, offset=1):
+        if len(self.buffer) <= offset:
+            self.fill(offset + 1)
+        return self.buffer[offset]
+    
+    def advance(self):
+        token = self.current_token()
+        if token.type == TokenType.EOF:
+            return self.previous or token
+        self.buffer.popleft()
+        self.current += 1
+        self.previous = token
+        return token
@@ -0,0 +1,177 @@
+"""
+Análise de pureza das funções, usada pela memoização (--memoize).
+
+Uma função é pura quando o resultado depende só dos argumentos e a chamada
+não tem efeitos visíveis: não usa print, não lê nem escreve variáveis de
+fora do próprio quadro, não altera elementos de arrays (nem com nativas
+como fill e sort) e só chama funções puras que nunca são reatribuídas.
+Executa depois da análise semântica, com os endereços léxicos (depth, slot)
+já anotados, e marca o resultado em FunctionDeclaration.pure. Funções que
+declaram funções aninhadas são impuras: cada chamada cria uma closure nova
+sobre o próprio quadro.
+"""
+
+from .ast_nodes import Visitor
+from .natives import NATIVES
+
+class PurityAnalyzer(Visitor):
+    def __init__(self):
+        super().__init__()
+        # Funções declaradas em cada quadro (programa e funções): slot -> nó
+        self.frames = []
+        # Índices em self.frames dos quadros abertos, do global ao atual
+        self.scopes = []
+        self.function = None
+        # Declaração -> funções que ela chama, como (quadro, slot)
+        self.calls = {}
+        self.impure = set()
+        # Posições (quadro, slot) que recebem atribuição
+        self.rebound = set()
+
+    def analyze(self, ast):
+        """Marca pure nas declarações de função e devolve as puras"""
+        self.visit(ast)
+
+        # Ponto fixo otimista: funções recursivas começam puras e deixam de
+        # ser se alguma função chamada não for
+        pure = set(self.calls) - self.impure
+        changed = True
+        while changed:
+            changed = False
+            for declaration in list(pure):
+                for frame, slot in self.calls[declaration]:
+                    if (self.frames[frame].get(slot) not in pure
+                            or (frame, slot) in self.rebound):
+                        pure.discard(declaration)
+                        changed = True
+                        break
+
+        for declaration in self.calls:
+            declaration.pure = declaration in pure
+        return pure
+
+    def mark_impure(self):
+        if self.function is not None:
+            self.impure.add(self.function)
+
+    def frame_of(self, node):
+        """Índice do quadro de uma variável, ou None se ela não tem endereço"""
+        if node.depth is None:
+            return None
+        return self.scopes[-1 - node.depth]
+
+    def optional(self, node):
+        if node is not None:
+            self.dispatch[type(node)](node)
+
+    def visit_statements(self, statements):
+        dispatch = self.dispatch
+        for statement in statements:
+            dispatch[type(statement)](statement)
+
+    def visit_program(self, node):
+        self.frames.append({})
+        self.scopes.append(len(self.frames) - 1)
+        self.visit_statements(node.statements)
+        self.scopes.pop()
+
+    def visit_var_declaration(self, node):
+        self.optional(node.initializer)
+
+    def visit_array_declaration(self, node):
+        self.optional(node.size)
+        self.optional(node.initializer)
+
+    def visit_function_declaration(self, node):
+        self.frames[self.scopes[-1]][node.slot] = node
+        self.calls[node] = []
+        # A função aninhada captura o quadro de quem a declara: um resultado
+        # guardado na cache seria a mesma closure, com o mesmo estado
+        self.mark_impure()
+
+        outer = self.function
+        self.function = node
+        self.frames.append({})
+        self.scopes.append(len(self.frames) - 1)
+        self.visit_statements(node.body.statements)
+        self.scopes.pop()
+        self.function = outer
+
+    def visit_assignment(self, node):
+        self.visit(node.value)
+        target = node.target
+        if hasattr(target, 'name'):
+            frame = self.frame_of(target)
+            if frame is not None:
+                self.rebound.add((frame, target.slot))
+            if target.depth != 0:
+                # Escrita fora do quadro da função
+                self.mark_impure()
+        else:
+            self.mark_impure()
+            self.visit(target.array)
+            self.visit(target.index)
+
+    def visit_if_statement(self, node):
+        self.visit(node.condition)
+        self.visit(node.then_stmt)
+        self.optional(node.else_stmt)
+
+    def visit_while_statement(self, node):
+        self.visit(node.condition)
+        self.visit(node.body)
+
+    def visit_for_statement(self, node):
+        self.optional(node.init)
+        self.optional(node.condition)
+        self.optional(node.update)
+        self.visit(node.body)
+
+    def visit_return_statement(self, node):
+        self.optional(node.value)
+
+    def visit_print_statement(self, node):
+        self.mark_impure()
+        self.visit(node.expression)
+
+    def visit_expression_statement(self, node):
+        self.visit(node.expression)
+
+    def visit_block(self, node):
+        self.visit_statements(node.statements)
+
+    def visit_binary_op(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_unary_op(self, node):
+        self.visit(node.operand)
+
+    def visit_literal(self, node):
+        pass
+
+    def visit_identifier(self, node):
+        if node.depth != 0:
+            # Leitura fora do quadro: o valor pode mudar entre chamadas
+            self.mark_impure()
+
+    def visit_function_call(self, node):
+        frame = self.frame_of(node)
+        if node.native is not None:
+            # Nativas que alteram arrays contam como atribuir a elementos
+            if not NATIVES[node.native].pure:
+                self.mark_impure()
+        elif frame is None:
+            self.mark_impure()
+        elif self.function is not None:
+            self.calls[self.function].append((frame, node.slot))
+        for argument in node.arguments:
+            self.visit(argument)
+
+    def visit_array_access(self, node):
+        self.visit(node.array)
+        self.visit(node.index)
+
+    def visit_array_literal(self, node):
+        for element in node.elements:
+            self.visit(element)
@@ -0,0 +1,337 @@
+"""
+Semântica de execução compartilhada pelos motores do MiniLang: as regras
+que todos seguem e os auxiliares que eles chamam em tempo de execução.
+"""
+
+import array
+import math
+import operator
+from collections import OrderedDict
+from .errors import RuntimeError
+
+def is_truthy(value):
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    return True
+
+def stringify(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        text = str(value)
+        if text.endswith(".0"):
+            return text[:-2]
+        return text
+    return str(value)
+
+def add(a, b):
+    """a + b do MiniLang: com uma string, concatena as representações"""
+    if isinstance(a, str) or isinstance(b, str):
+        return str(a) + str(b)
+    return a + b
+
+def to_int(value):
+    return int(value) if isinstance(value, float) else value
+
+def to_float(value):
+    return float(value) if isinstance(value, int) else value
+
+def to_string(value):
+    return str(value) if value is not None else value
+
+def to_bool(value):
+    return bool(value) if value is not None else value
+
+# Conversão aplicada ao valor inicial de uma variável declarada com o tipo
+COERCIONS = {
+    'int': to_int,
+    'float': to_float,
+    'string': to_string,
+    'bool': to_bool,
+}
+
+def coerce(type_, value):
+    conversion = COERCIONS.get(type_)
+    return conversion(value) if conversion else value
+
+# Valor inicial dos elementos de um array declarado com tamanho
+DEFAULT_VALUES = {
+    'int': 0,
+    'float': 0.0,
+    'bool': False,
+    'string': "",
+}
+
+class TypedArray:
+    """
+    Array de um tipo primitivo declarado com tamanho. Enquanto todos os
+    elementos têm exatamente o tipo declarado (e os int cabem em 64 bits),
+    eles ficam num buffer do módulo array em vez de objetos Python apontados
+    por uma lista. Um elemento que não cabe (int grande, float num array de
+    int, null...) passa o array para uma lista, sem converter nada: os
+    valores guardados são os mesmos de um array comum. Para o programa se
+    comporta como a lista equivalente (print, ==, concatenação).
+    """
+    
+    __slots__ = ('items',)
+    element_type = None
+    element_class = None
+    typecode = None
+    
+    def __init__(self, items):
+        # items: array.array compacto ou, depois de promovido, uma lista
+        self.items = items
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __getitem__(self, index):
+        return self.items[index]
+    
+    def __setitem__(self, index, value):
+        items = self.items
+        if type(value) is self.element_class or type(items) is list:
+            try:
+                items[index] = value
+                return
+            except OverflowError:
+                pass
+        self.promote()
+        self.items[index] = value
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def tolist(self):
+        return list(self)
+    
+    def promote(self):
+        """Passa os elementos para uma lista, que aceita qualquer valor"""
+        self.items = self.tolist()
+    
+    def assign(self, values):
+        """Troca todos os elementos por values, compactos se todos couberem"""
+        if set(map(type, values)) <= {self.element_class}:
+            try:
+                self.items = array.array(self.typecode, values)
+                return
+            except OverflowError:
+                pass
+        self.items = list(values)
+    
+    def copy(self):
+        return type(self)(self.items[:])
+    
+    def __repr__(self):
+        return repr(self.tolist())
+    
+    __str__ = __repr__
+    
+    def __eq__(self, other):
+        if isinstance(other, (list, TypedArray)):
+            return self.tolist() == list(other)
+        return NotImplemented
+    
+    def __ne__(self, other):
+        if isinstance(other, (list, TypedArray)):
+            return self.tolist() != list(other)
+        return NotImplemented
+    
+    __hash__ = None
+
+class IntArray(TypedArray):
+    __slots__ = ()
+    element_type = 'int'
+    element_class = int
+    typecode = 'q'
+
+class FloatArray(TypedArray):
+    __slots__ = ()
+    element_type = 'float'
+    element_class = float
+    typecode = 'd'
+
+class BoolArray(TypedArray):
+    """Array de bool: um byte 0/1 por elemento, lido como bool"""
+    
+    __slots__ = ()
+    element_type = 'bool'
+    element_class = bool
+    typecode = 'b'
+    
+    def __getitem__(self, index):
+        items = self.items
+        if type(items) is list:
+            return items[index]
+        return items[index] != 0
+    
+    def __iter__(self):
+        items = self.items
+        if type(items) is list:
+            return iter(items)
+        return map(bool, items)
+
+# Arrays compactos por tipo do elemento
+TYPED_ARRAYS = {
+    'int': IntArray,
+    'float': FloatArray,
+    'bool': BoolArray,
+}
+
+# Tipos que o programa vê como array
+ARRAY_TYPES = frozenset([list, IntArray, FloatArray, BoolArray])
+
+def new_array(element_type, size, line, column):
+    if not isinstance(size, int) or size < 0:
+        raise RuntimeError("Tamanho do array deve ser um inteiro não negativo", line, column)
+    cls = TYPED_ARRAYS.get(element_type)
+    if cls is None:
+        return [DEFAULT_VALUES.get(element_type)] * size
+    # Repetição no lugar: não cria uma lista nem um buffer temporário
+    items = array.array(cls.typecode, [DEFAULT_VALUES[element_type]])
+    items *= size
+    return cls(items)
+
+def check_index(array, index, line, column):
+    """Valida array[index] com as mensagens de erro da linguagem"""
+    if type(array) not in ARRAY_TYPES:
+        raise RuntimeError("Tentativa de indexar não-array", line, column)
+    
+    if not isinstance(index, int):
+        raise RuntimeError("Índice deve ser inteiro", line, column)
+    
+    if index < 0 or index >= len(array):
+        raise RuntimeError("Índice fora dos limites", line, column)
+
+# Condições do for contado: comparação e ajuste do fim do range
+COUNTED_COMPARISONS = {
+    '<': (operator.lt, 0),
+    '<=': (operator.le, 1),
+    '>': (operator.gt, 0),
+    '>=': (operator.ge, -1),
+}
+
+class CountedValues:
+    """Valores de um for contado cujos limites não são inteiros"""
+    
+    __slots__ = ('value', 'stop', 'compare', 'update', 'amount')
+    
+    def __init__(self, start, stop, comparison, step):
+        self.value = start
+        self.stop = stop
+        self.compare = COUNTED_COMPARISONS[comparison][0]
+        # A mesma operação da atualização i = i + passo ou i = i - passo
+        self.update = add if step > 0 else operator.sub
+        self.amount = abs(step)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        value = self.value
+        if not self.compare(value, self.stop):
+            raise StopIteration
+        self.value = self.update(value, self.amount)
+        return value
+
+def counted_values(start, stop, comparison, step):
+    """Valores da variável de um for contado: um range se os limites são inteiros"""
+    if type(start) is int and type(stop) is int:
+        return range(start, stop + COUNTED_COMPARISONS[comparison][1], step)
+    return CountedValues(start, stop, comparison, step)
+
+def loop_end(values):
+    """Valor da variável ao fim do laço: o primeiro que não passa na condição"""
+    if type(values) is range:
+        return values.start + len(values) * values.step
+    return values.value
+
+class TailCall:
+    """Chamada em posição de cauda pendente, executada por quem chamou a função"""
+    
+    __slots__ = ('function', 'arguments')
+    
+    def __init__(self, function, arguments):
+        self.function = function
+        self.arguments = arguments
+
+# Resultados guardados por função com --memoize, se não indicado outro limite
+DEFAULT_MEMO_SIZE = 1024
+
+class MemoCache:
+    """Resultados de uma função pura, do menos ao mais usado recentemente"""
+    
+    def __init__(self, name, limit=DEFAULT_MEMO_SIZE):
+        self.name = name
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def call(self, run, arguments, *context):
+        """Devolve run(*context, arguments), guardado pelos valores dos argumentos"""
+        # O tipo entra na chave: 1, 1.0 e true são iguais para o Python
+        kinds = tuple(map(type, arguments))
+        if not ARRAY_TYPES.isdisjoint(kinds):
+            # Arrays são mutáveis: a chamada não usa a cache
+            return run(*context, arguments)
+        
+        key = (*arguments, *kinds)
+        if float in kinds:
+            # 0.0 == -0.0 para o Python: o sinal também entra na chave
+            key += tuple(math.copysign(1.0, value) for value in arguments if type(value) is float)
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        
+        self.misses += 1
+        result = run(*context, arguments)
+        if type(result) not in ARRAY_TYPES:
+            entries[key] = result
+            if len(entries) > self.limit:
+                entries.popitem(last=False)
+        return result
+
+class Memoizer:
+    """Caches LRU das funções puras de um programa, uma por declaração"""
+    
+    def __init__(self, limit=DEFAULT_MEMO_SIZE):
+        self.limit = limit
+        self.caches = {}
+    
+    def cache(self, function):
+        """Cache de function (FunctionDeclaration ou CodeObject)"""
+        cache = self.caches.get(function)
+        if cache is None:
+            cache = self.caches[function] = MemoCache(function.name, self.limit)
+        return cache
+    
+    def report(self):
+        lines = [f"Memoização (até {self.limit} resultados por função):"]
+        for cache in self.caches.values():
+            lines.append(f"  {cache.name}: {cache.hits} acertos, {cache.misses} faltas, "
+                         f"{len(cache.entries)} guardados")
+        if not self.caches:
+            lines.append("  nenhuma função pura")
+        return "\n".join(lines)
+
+def undefined_variable(name):
+    return RuntimeError(f"Variável '{name}' não definida", 0, 0)
+
+class GlobalsView:
+    """Acesso por nome às variáveis de um quadro em lista (pai na posição 0)"""
+    
+    def __init__(self, names, frame):
+        self.names = names
+        self.frame = frame
+    
+    def get(self, name):
+        if name not in self.names:
+            raise undefined_variable(name)
+        return self.frame[self.names.index(name) + 1]
@@ -1,29 +1,55 @@
-from .ast_nodes import Visitor
+from .ast_nodes import (Visitor, Identifier, UnaryOp, BinaryOp, Literal, FunctionCall,
+                        VarDeclaration, Assignment)
 from .symbol_table import Symbol, SymbolTable
+from .natives import NATIVES
 from .errors import SemanticError
 
 class SemanticAnalyzer(Visitor):
     def __init__(self):
+        super().__init__()
         self.symbol_table = SymbolTable()
         self.current_function = None
         self.errors = []
+        # Nós cujo tipo exato é fixado após a análise (em pós-ordem) e
+        # atribuições a variáveis escalares, usados por infer_static_types
+        self.typed_nodes = []
+        self.assignments = []
+        # Laços for candidatos a laço contado, os símbolos atribuídos no
+        # corpo de cada for aberto e os atribuídos por funções aninhadas
+        self.counted_loops = []
+        self.loop_writes = []
+        self.outer_writes = set()
+        # Escopo em que foi declarada cada função aberta, da mais externa
+        # à atual
+        self.function_scopes = []
 
     def analyze(self, ast):
         try:
-            ast.accept(self)
+            self.visit(ast)
         except SemanticError as e:
             self.errors.append(e)
         
         if self.errors:
             raise self.errors[0]
+        
+        self.infer_static_types()
+        self.mark_counted_loops()
 
-    def enter_scope(self):
-        self.symbol_table = SymbolTable(self.symbol_table)
+    def enter_scope(self, frame=True):
+        self.symbol_table = SymbolTable(self.symbol_table, frame)
 
     def exit_scope(self):
+        """Sai do escopo e devolve os nomes das posições do seu quadro"""
+        names = tuple(self.symbol_table.names)
         self.symbol_table = self.symbol_table.parent
+        return names
 
     def declare_symbol(self, name, type_, line, column):
+        if name in self.symbol_table.captured:
+            # Em execução, a função chamada depois desta declaração leria a
+            # nova variável, mas o endereço léxico já aponta para a externa
+            raise SemanticError(f"Variável '{name}' declarada depois de ser usada por uma "
+                                f"função deste escopo", line, column)
         symbol = Symbol(name, type_)
         try:
             self.symbol_table.define(symbol)
@@ -31,12 +57,146 @@ class SemanticAnalyzer(Visitor):
             raise SemanticError(f"Variável '{name}' já declarada neste escopo", line, column)
         return symbol
 
+    def bind(self, node, name):
+        """Anota em node o endereço léxico (depth, slot) lido em execução"""
+        # Ignora símbolos cuja declaração ainda não terminou: dentro do
+        # próprio inicializador o nome ainda se refere à variável externa
+        table = self.symbol_table
+        # Escopos entre a declaração da função atual e o do símbolo: uma
+        # declaração posterior do nome neles mudaria o que a função lê
+        captured = None
+        defined_in = self.function_scopes[-1] if self.function_scopes else None
+        while table is not None:
+            symbol = table.symbols.get(name)
+            if symbol is not None and symbol.initialized:
+                node.depth = self.symbol_table.level - symbol.level
+                node.slot = symbol.slot
+                for scope in captured or ():
+                    scope.captured.add(name)
+                return symbol
+            if table is defined_in:
+                captured = []
+            if captured is not None:
+                captured.append(table)
+            table = table.parent
+        # Sem endereço: o interpretador acusa variável não definida
+        node.depth = node.slot = None
+        return None
+
     def resolve_symbol(self, name, line, column):
         symbol = self.symbol_table.resolve(name)
         if not symbol:
             raise SemanticError(f"Variável '{name}' não declarada", line, column)
         return symbol
 
+    def infer_static_types(self):
+        """Anota static_type nas expressões cujo tipo é garantido em execução"""
+        # Ponto fixo otimista: cada variável escalar inicializada começa com
+        # o tipo declarado e o perde se alguma atribuição puder mudá-lo
+        changed = True
+        while changed:
+            for node, symbol in self.typed_nodes:
+                node.static_type = self.exact_type(node, symbol)
+            
+            changed = False
+            for symbol, value, declaration in self.assignments:
+                if symbol.exact_type is None:
+                    continue
+                if declaration:
+                    # A declaração converte o valor, desde que não seja nulo
+                    if symbol.exact_type in ('int', 'float'):
+                        kept = value.static_type in ('int', 'float')
+                    else:
+                        kept = value.static_type is not None
+                else:
+                    kept = value.static_type == symbol.exact_type
+                if not kept:
+                    symbol.exact_type = None
+                    changed = True
+
+    def exact_type(self, node, symbol):
+        if isinstance(node, Identifier):
+            return symbol.exact_type if symbol else None
+        
+        if isinstance(node, UnaryOp):
+            operand_type = node.operand.static_type
+            if node.operator == 'not':
+                return 'bool'
+            return operand_type if operand_type in ('int', 'float') else None
+        
+        left_type = node.left.static_type
+        right_type = node.right.static_type
+        if node.operator in ('-', '*', '/', '%', '+'):
+            if node.operator == '+' and 'string' in (left_type, right_type):
+                return 'string'
+            if left_type not in ('int', 'float') or right_type not in ('int', 'float'):
+                return None
+            if node.operator == '/' or 'float' in (left_type, right_type):
+                return 'float'
+            return 'int'
+        return 'bool'
+
+    def mark_counted_loops(self):
+        """Anota step nos for canônicos cujo limite não muda durante o laço"""
+        bindings = {node: symbol for node, symbol in self.typed_nodes if type(node) is Identifier}
+        for node, symbol, step, writes in self.counted_loops:
+            if symbol in writes:
+                continue
+            # O limite é avaliado uma vez: nada que ele lê pode mudar no
+            # corpo, nem por funções chamadas nele, nem ser a própria variável
+            bound = self.invariant_symbols(node.condition.right, bindings)
+            if bound is not None and symbol not in bound \
+                    and not bound & (writes | self.outer_writes):
+                node.step = step
+
+    def invariant_symbols(self, expression, bindings):
+        """Símbolos lidos por uma expressão aritmética simples, ou None"""
+        if type(expression) is Literal:
+            return set()
+        if type(expression) is Identifier:
+            symbol = bindings.get(expression)
+            return {symbol} if symbol is not None else None
+        if type(expression) is UnaryOp and expression.operator == '-':
+            return self.invariant_symbols(expression.operand, bindings)
+        if type(expression) is FunctionCall and expression.native == 'len':
+            # O tamanho de um array não muda: basta a variável não mudar
+            return self.invariant_symbols(expression.arguments[0], bindings)
+        if type(expression) is BinaryOp and expression.operator in ('+', '-', '*'):
+            left = self.invariant_symbols(expression.left, bindings)
+            right = self.invariant_symbols(expression.right, bindings)
+            if left is not None and right is not None:
+                return left | right
+        return None
+
+    def counted_loop_step(self, node):
+        """Passo de for (int i = a; i < b; i = i + passo), ou None para outras formas"""
+        init, condition, update = node.init, node.condition, node.update
+        if type(init) is not VarDeclaration or init.type != 'int' or init.initializer is None:
+            return None
+        
+        def is_variable(expression):
+            return type(expression) is Identifier and expression.depth == 0 and \
+                expression.slot == init.slot
+        
+        if type(condition) is not BinaryOp or condition.operator not in ('<', '<=', '>', '>=') \
+                or not is_variable(condition.left):
+            return None
+        if type(update) is not Assignment or not is_variable(update.target):
+            return None
+        value = update.value
+        if type(value) is not BinaryOp or value.operator not in ('+', '-') \
+                or not is_variable(value.left):
+            return None
+        amount = value.right
+        if type(amount) is not Literal or type(amount.value) is not int or amount.value <= 0:
+            return None
+        
+        # O passo precisa andar em direção ao limite
+        step = amount.value if value.operator == '+' else -amount.value
+        if (step > 0) != (condition.operator in ('<', '<=')):
+            return None
+        return step
+
     def check_type_compatibility(self, left_type, right_type, operation, line, column):
         if left_type == 'any' or right_type == 'any':
             return left_type if left_type != 'any' else right_type
@@ -55,92 +215,130 @@ class SemanticAnalyzer(Visitor):
         raise SemanticError(f"Tipos incompatíveis: {left_type} e {right_type} para operação {operation}", line, column)
 
     def visit_program(self, node):
+        dispatch = self.dispatch
         for stmt in node.statements:
-            stmt.accept(self)
+            dispatch[type(stmt)](stmt)
+        node.scope_names = tuple(self.symbol_table.names)
 
     def visit_var_declaration(self, node):
         symbol = self.declare_symbol(node.name, node.type, node.line, node.column)
+        symbol.declaration = node
+        node.slot = symbol.slot
         
         if node.initializer:
-            init_type = node.initializer.accept(self)
+            init_type = self.visit(node.initializer)
             self.check_type_compatibility(node.type, init_type, '=', node.line, node.column)
+            if node.type in ('int', 'float', 'string', 'bool'):
+                symbol.exact_type = node.type
+                self.assignments.append((symbol, node.initializer, True))
+        symbol.initialized = True
 
     def visit_array_declaration(self, node):
         array_type = f"{node.element_type}[]"
         symbol = self.declare_symbol(node.name, array_type, node.line, node.column)
+        node.slot = symbol.slot
         
         if node.size:
-            size_type = node.size.accept(self)
+            size_type = self.visit(node.size)
             if size_type != 'int':
                 raise SemanticError("Tamanho do array deve ser um inteiro", node.line, node.column)
 
         if node.initializer:
-            init_type = node.initializer.accept(self)
+            init_type = self.visit(node.initializer)
             if not init_type.startswith(node.element_type):
                 raise SemanticError(f"Tipo do inicializador incompatível com array de {node.element_type}", 
                                       node.line, node.column)
+        symbol.initialized = True
 
     def visit_function_declaration(self, node):
         param_types = [param.type if param.type is not None else 'any' for param in node.parameters]
         func_type = f"function({','.join(param_types)})"
-        self.declare_symbol(node.name, func_type, node.line, node.column)
+        function_symbol = self.declare_symbol(node.name, func_type, node.line, node.column)
+        function_symbol.initialized = True
+        node.slot = function_symbol.slot
         
         old_function = self.current_function
         self.current_function = node.name
+        self.function_scopes.append(self.symbol_table)
         self.enter_scope()
         
         for param in node.parameters:
-            self.declare_symbol(param.name, param.type if param.type is not None else 'any', param.line, param.column)
-        
-        node.body.accept(self)
-        
+            symbol = self.declare_symbol(param.name, param.type if param.type is not None else 'any', param.line, param.column)
+            symbol.initialized = True
+        
+        # O corpo é executado no quadro dos parâmetros: escopo próprio para
+        # os nomes, mas posições no quadro da chamada
+        self.enter_scope(frame=False)
+        dispatch = self.dispatch
+        for stmt in node.body.statements:
+            dispatch[type(stmt)](stmt)
         self.exit_scope()
+        
+        node.scope_names = self.exit_scope()
+        self.function_scopes.pop()
         self.current_function = old_function
 
     def visit_assignment(self, node):
         if hasattr(node.target, 'name'):
             symbol = self.resolve_symbol(node.target.name, node.target.line, node.target.column)
             target_type = symbol.type
+            self.bind(node.target, node.target.name)
+            node.rebinds_function = target_type.startswith('function')
         elif hasattr(node.target, 'array'):
-            array_type = node.target.accept(self)
+            array_type = self.visit(node.target)
             target_type = array_type
         else:
             raise SemanticError("Target de atribuição inválido", node.line, node.column)
         
-        value_type = node.value.accept(self)
+        value_type = self.visit(node.value)
         self.check_type_compatibility(target_type, value_type, '=', node.line, node.column)
+        if hasattr(node.target, 'name'):
+            self.assignments.append((symbol, node.value, False))
+            for writes in self.loop_writes:
+                writes.add(symbol)
+            if self.symbol_table.level > symbol.level:
+                self.outer_writes.add(symbol)
 
     def visit_if_statement(self, node):
-        condition_type = node.condition.accept(self)
+        condition_type = self.visit(node.condition)
         if condition_type != 'bool' and condition_type != 'any':
             raise SemanticError("Condição do if deve ser booleana", node.condition.line, node.condition.column)
         
-        node.then_stmt.accept(self)
+        self.visit(node.then_stmt)
         if node.else_stmt:
-            node.else_stmt.accept(self)
+            self.visit(node.else_stmt)
 
     def visit_while_statement(self, node):
-        condition_type = node.condition.accept(self)
+        condition_type = self.visit(node.condition)
         if condition_type != 'bool' and condition_type != 'any':
             raise SemanticError("Condição do while deve ser booleana", node.condition.line, node.condition.column)
         
-        node.body.accept(self)
+        self.visit(node.body)
 
     def visit_for_statement(self, node):
-        self.enter_scope()
+        self.enter_scope(frame=False)
         
         if node.init:
-            node.init.accept(self)
+            self.visit(node.init)
         
         if node.condition:
-            condition_type = node.condition.accept(self)
+            condition_type = self.visit(node.condition)
             if condition_type != 'bool' and condition_type != 'any':
                 raise SemanticError("Condição do for deve ser booleana", node.condition.line, node.condition.column)
         
         if node.update:
-            node.update.accept(self)
+            self.visit(node.update)
+        
+        writes = set()
+        self.loop_writes.append(writes)
+        self.visit(node.body)
+        self.loop_writes.pop()
         
-        node.body.accept(self)
+        node.step = None
+        step = self.counted_loop_step(node)
+        if step is not None:
+            symbol = self.symbol_table.symbols[node.init.name]
+            self.counted_loops.append((node, symbol, step, writes))
         
         self.exit_scope()
 
@@ -149,23 +347,31 @@ class SemanticAnalyzer(Visitor):
             raise SemanticError("Return fora de função", node.line, node.column)
         
         if node.value:
-            node.value.accept(self)
+            self.visit(node.value)
+            # O valor de return f(...) é o da chamada: nada resta a fazer
+            # no quadro atual depois dela
+            if type(node.value) is FunctionCall and node.value.native is None:
+                node.value.tail = True
 
     def visit_print_statement(self, node):
-        node.expression.accept(self)
+        self.visit(node.expression)
 
     def visit_expression_statement(self, node):
-        node.expression.accept(self)
+        self.visit(node.expression)
 
     def visit_block(self, node):
-        self.enter_scope()
+        # Blocos e for têm escopo de nomes próprio, mas suas variáveis
+        # ocupam posições no quadro da função (ou no global)
+        self.enter_scope(frame=False)
+        dispatch = self.dispatch
         for stmt in node.statements:
-            stmt.accept(self)
+            dispatch[type(stmt)](stmt)
         self.exit_scope()
 
     def visit_binary_op(self, node):
-        left_type = node.left.accept(self)
-        right_type = node.right.accept(self)
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
+        self.typed_nodes.append((node, None))
         
         if left_type is None: left_type = 'any'
         if right_type is None: right_type = 'any'
@@ -198,7 +404,8 @@ class SemanticAnalyzer(Visitor):
         raise SemanticError(f"Operador desconhecido: {node.operator}", node.line, node.column)
 
     def visit_unary_op(self, node):
-        operand_type = node.operand.accept(self)
+        operand_type = self.visit(node.operand)
+        self.typed_nodes.append((node, None))
         
         if node.operator == '-':
             if operand_type in ['int', 'float', 'any']:
@@ -215,26 +422,61 @@ class SemanticAnalyzer(Visitor):
         raise SemanticError(f"Operador unário desconhecido: {node.operator}", node.line, node.column)
 
     def visit_literal(self, node):
+        node.static_type = node.type
         return node.type
 
     def visit_identifier(self, node):
         symbol = self.resolve_symbol(node.name, node.line, node.column)
+        # O tipo exato vem do símbolo lido em execução (ver bind)
+        self.typed_nodes.append((node, self.bind(node, node.name)))
         return symbol.type
 
     def visit_function_call(self, node):
+        node.native = None
+        if node.name in NATIVES and self.symbol_table.resolve(node.name) is None:
+            return self.visit_native_call(node, NATIVES[node.name])
         symbol = self.resolve_symbol(node.name, node.line, node.column)
         
         if not symbol.type.startswith('function'):
             raise SemanticError(f"'{node.name}' não é uma função", node.line, node.column)
+        self.bind(node, node.name)
         
         for arg in node.arguments:
-            arg.accept(self)
+            self.visit(arg)
         
         return 'any'
 
+    def visit_native_call(self, node, native):
+        """Confere os argumentos pela assinatura da nativa e devolve o tipo do resultado"""
+        if len(node.arguments) != len(native.parameters):
+            raise SemanticError(f"'{native.name}' espera {len(native.parameters)} argumento(s)",
+                                node.line, node.column)
+        node.native = native.name
+        node.depth = node.slot = None
+        
+        types = [self.visit(argument) for argument in node.arguments]
+        element_type = types[0][:-2] if types[0].endswith('[]') else 'any'
+        for parameter, type_ in zip(native.parameters, types):
+            if parameter == 'element':
+                self.check_type_compatibility(element_type, type_, native.name,
+                                              node.line, node.column)
+            elif type_ == 'any':
+                continue
+            elif not type_.endswith('[]'):
+                raise SemanticError(f"'{native.name}' espera um array", node.line, node.column)
+            elif parameter == 'numbers' and type_[:-2] not in ('int', 'float', 'any'):
+                raise SemanticError(f"'{native.name}' espera um array de números",
+                                    node.line, node.column)
+        
+        if native.result == 'array':
+            return types[0]
+        if native.result == 'element' or native.result == 'number':
+            return element_type
+        return native.result or 'any'
+
     def visit_array_access(self, node):
-        array_type = node.array.accept(self)
-        index_type = node.index.accept(self)
+        array_type = self.visit(node.array)
+        index_type = self.visit(node.index)
         
         if array_type == 'any':
             return 'any'
@@ -251,9 +493,9 @@ class SemanticAnalyzer(Visitor):
         if not node.elements:
             return 'any[]'
         
-        first_type = node.elements[0].accept(self)
+        first_type = self.visit(node.elements[0])
         for element in node.elements[1:]:
-            element_type = element.accept(self)
+            element_type = self.visit(element)
             self.check_type_compatibility(first_type, element_type, "elemento de array", node.line, node.column)
         
         return f"{first_type}[]"
\ No newline at end of file
@@ -3,19 +3,43 @@ class Symbol:
         self.name = name
         self.type = type
         self.value = value
+        # Preenchidos pela análise semântica (tipos estáticos exatos)
+        self.initialized = False
+        self.exact_type = None
+        # Endereço em tempo de execução: nível do escopo e posição nele
+        self.level = None
+        self.slot = None
+        # Nó VarDeclaration que criou a variável (usado pelo otimizador)
+        self.declaration = None
 
     def __repr__(self):
         return f"<Symbol: {self.name}, Type: {self.type}, Value: {self.value}>"
 
 class SymbolTable:
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, frame=True):
         self.symbols = {}
         self.parent = parent
+        # Só escopos com quadro próprio em execução (global e funções) contam
+        # um nível e têm posições próprias; blocos alocam no quadro do pai
+        if parent is None:
+            self.level = 0
+            self.names = []
+        elif frame:
+            self.level = parent.level + 1
+            self.names = []
+        else:
+            self.level = parent.level
+            self.names = parent.names
+        # Nomes que funções declaradas neste escopo leem de escopos externos
+        self.captured = set()
 
     def define(self, symbol):
         if symbol.name in self.symbols:
             raise Exception(f"Símbolo '{symbol.name}' já definido neste escopo.")
         self.symbols[symbol.name] = symbol
+        symbol.level = self.level
+        symbol.slot = len(self.names)
+        self.names.append(symbol.name)
 
     def resolve(self, name):
         symbol = self.symbols.get(name)
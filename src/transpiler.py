@@ -0,0 +1,440 @@
+"""
+Motor de execução por tradução para Python.
+
+O programa já validado pela análise semântica vira código-fonte Python
+compilado com compile(): funções viram def, while/for viram laços nativos e
+o programa principal vira a função program(). Assim o próprio interpretador
+de bytecode do CPython executa o programa.
+
+Cada variável vira um nome Python único, nome_nível_slot, em que o nível é a
+profundidade de aninhamento de funções do quadro que a declara; atribuições a
+variáveis de quadros externos usam nonlocal. A semântica do MiniLang que o
+Python não reproduz sozinho (verdade, soma com strings, divisão por zero,
+verificação de índices e de chamadas) fica nos auxiliares deste módulo e de
+runtime.py, que recebem a linha e a coluna do nó de origem.
+"""
+
+import math
+import types
+from .ast_nodes import Visitor, Literal, IfStatement
+from .closure_compiler import ClosureCompiler
+from .errors import RuntimeError
+from .natives import NATIVES
+from .runtime import (is_truthy, stringify, add, COERCIONS, new_array, check_index,
+                      undefined_variable, counted_values, loop_end, ARRAY_TYPES, GlobalsView,
+                      TailCall)
+
+# Precedência das expressões Python geradas, da menor para a maior
+(CONDITIONAL, OR, AND, NOT, COMPARISON, SUM, PRODUCT, UNARY, ATOM) = range(9)
+
+# Operadores que viram o operador Python equivalente: (texto, precedência)
+OPERATORS = {
+    '-': ('-', SUM),
+    '*': ('*', PRODUCT),
+    '%': ('%', PRODUCT),
+    '<': ('<', COMPARISON),
+    '>': ('>', COMPARISON),
+    '<=': ('<=', COMPARISON),
+    '>=': ('>=', COMPARISON),
+    '==': ('==', COMPARISON),
+    '!=': ('!=', COMPARISON),
+    # and/or do Python sobre bools: curto-circuito e resultado bool
+    'and': ('and', AND),
+    'or': ('or', OR),
+}
+
+def divide(a, b, line, column):
+    if b == 0:
+        raise RuntimeError("Divisão por zero", line, column)
+    return a / b
+
+def index(array, position, line, column):
+    check_index(array, position, line, column)
+    return array[position]
+
+def undefined(name):
+    raise undefined_variable(name)
+
+def not_function(name, line, column):
+    raise RuntimeError(f"'{name}' não é uma função", line, column)
+
+def fail(error, *operands):
+    raise error
+
+def program_locals(error, program):
+    """Variáveis locais de program() no ponto em que error foi lançado"""
+    traceback = error.__traceback__
+    while traceback is not None:
+        if traceback.tb_frame.f_code is program.__code__:
+            return traceback.tb_frame.f_locals
+        traceback = traceback.tb_next
+    return {}
+
+def trampoline(body):
+    """Envolve uma função com chamadas de cauda, que executa em laço"""
+    def function(*arguments):
+        result = body(*arguments)
+        while type(result) is TailCall:
+            # Funções com chamadas de cauda são chamadas pelo corpo (body),
+            # que devolve o próximo TailCall em vez de empilhar a chamada
+            callee = result.function
+            result = getattr(callee, 'body', callee)(*result.arguments)
+        return result
+    function.body = body
+    return function
+
+def memoize(function, memo):
+    """Função pura com os resultados guardados numa MemoCache (--memoize)"""
+    run = lambda arguments: function(*arguments)
+    def memoized(*arguments):
+        return memo.call(run, arguments)
+    # Chamadas de cauda executam o corpo direto, sem passar pela cache
+    memoized.body = getattr(function, 'body', function)
+    return memoized
+
+# Nomes disponíveis para o código gerado
+RUNTIME = {
+    'is_truthy': is_truthy,
+    'stringify': stringify,
+    'new_array': new_array,
+    'check_index': check_index,
+    'ARRAY_TYPES': ARRAY_TYPES,
+    'undefined_variable': undefined_variable,
+    'counted_values': counted_values,
+    'loop_end': loop_end,
+    'Function': types.FunctionType,
+    'add': add,
+    'divide': divide,
+    'index': index,
+    'undefined': undefined,
+    'not_function': not_function,
+    'fail': fail,
+    'TailCall': TailCall,
+    'trampoline': trampoline,
+    'memoize': memoize,
+}
+RUNTIME.update((conversion.__name__, conversion) for conversion in COERCIONS.values())
+RUNTIME.update((native.function.__name__, native.function) for native in NATIVES.values())
+
+class PythonTranspiler(Visitor):
+    def __init__(self, memoizer=None):
+        super().__init__()
+        self.globals = None
+        self.memoizer = memoizer
+        self.lines = []
+        self.indent = ""
+        self.level = 0
+        self.nonlocals = None
+        self.has_tail_calls = False
+        self.constants = {}
+        self.temporaries = 0
+
+    def translate(self, ast):
+        """Código-fonte Python equivalente ao programa"""
+        self.lines = []
+        self.constants = {}
+        self.temporaries = 0
+        self.visit(ast)
+        return "\n".join(self.lines) + "\n"
+
+    def compile(self, ast):
+        """Compila o programa; devolve o código e as constantes que ele usa"""
+        source = self.translate(ast)
+        return compile(source, "<minilang>", "exec"), dict(self.constants)
+
+    def interpret(self, ast):
+        try:
+            code, constants = self.compile(ast)
+        except (SyntaxError, RecursionError):
+            # Limites do compilador do CPython para um programa válido (como
+            # mais de 20 laços aninhados): executa no motor closure
+            fallback = ClosureCompiler(self.memoizer)
+            try:
+                fallback.interpret(ast)
+            finally:
+                self.globals = fallback.globals
+            return
+        
+        namespace = dict(RUNTIME, **constants)
+        exec(code, namespace)
+        program = namespace['program']
+        try:
+            values = program()
+        except BaseException as error:
+            self.export(ast.scope_names, program_locals(error, program))
+            if isinstance(error, RuntimeError):
+                print(f"Erro em tempo de execução: {error}")
+            raise
+        self.export(ast.scope_names, values)
+
+    def export(self, names, values):
+        """Expõe as variáveis globais no formato dos outros motores"""
+        frame = [None] + [values.get(f"{name}_0_{slot}") for slot, name in enumerate(names)]
+        self.globals = GlobalsView(names, frame)
+
+    def emit(self, line):
+        self.lines.append(self.indent + line)
+
+    def variable(self, name, depth, slot):
+        return f"{name}_{self.level - depth}_{slot}"
+
+    def temporary(self):
+        self.temporaries += 1
+        return f"_t{self.temporaries}"
+
+    def constant(self, value):
+        name = f"_k{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def expression(self, node, precedence=CONDITIONAL):
+        """Texto da expressão, entre parênteses se não tiver a precedência mínima"""
+        text, own = self.dispatch[type(node)](node)
+        return text if own >= precedence else f"({text})"
+
+    def truth(self, node, precedence):
+        """Expressão Python bool com a verdade do MiniLang para o valor do nó"""
+        if node.static_type == 'bool':
+            return self.expression(node, precedence)
+        return f"is_truthy({self.expression(node)})"
+
+    def condition(self, node):
+        if node.static_type == 'bool':
+            return self.expression(node)
+        value = self.temporary()
+        return f"({value} := {self.expression(node)}) is not None and {value} is not False"
+
+    def block(self, statements):
+        """Emite os comandos num nível de indentação a mais"""
+        outer = self.indent
+        self.indent += "    "
+        start = len(self.lines)
+        self.translate_statements(statements)
+        if len(self.lines) == start:
+            self.emit("pass")
+        self.indent = outer
+
+    def body(self, statement):
+        self.block(statement.statements if hasattr(statement, 'statements') else [statement])
+
+    def translate_statements(self, statements):
+        dispatch = self.dispatch
+        for statement in statements:
+            dispatch[type(statement)](statement)
+
+    def translate_function(self, name, parameters, statements):
+        """Emite um def; nonlocal só é conhecido depois de traduzir o corpo"""
+        outer = self.lines, self.nonlocals, self.has_tail_calls
+        self.lines, self.nonlocals, self.has_tail_calls = [], set(), False
+        self.level += 1
+        self.block(statements)
+        body, nonlocals, has_tail_calls = self.lines, self.nonlocals, self.has_tail_calls
+        self.level -= 1
+        self.lines, self.nonlocals, self.has_tail_calls = outer
+
+        self.emit(f"def {name}({', '.join(parameters)}):")
+        if nonlocals:
+            self.emit(f"    nonlocal {', '.join(sorted(nonlocals))}")
+        self.lines.extend(body)
+        if has_tail_calls:
+            self.emit(f"{name} = trampoline({name})")
+
+    def visit_program(self, node):
+        # Sem try em volta do corpo, que contaria no limite de blocos aninhados
+        # do CPython; num erro, interpret lê as variáveis no traceback
+        self.emit("def program():")
+        self.block(node.statements)
+        self.emit("    return locals()")
+
+    def visit_var_declaration(self, node):
+        target = self.variable(node.name, 0, node.slot)
+        initializer = node.initializer
+        if not initializer:
+            self.emit(f"{target} = None")
+            return
+
+        value = self.expression(initializer)
+        conversion = COERCIONS.get(node.type)
+        if conversion is not None and initializer.static_type != node.type:
+            value = f"{conversion.__name__}({value})"
+        self.emit(f"{target} = {value}")
+
+    def visit_array_declaration(self, node):
+        target = self.variable(node.name, 0, node.slot)
+        if node.size:
+            size = self.expression(node.size)
+            self.emit(f"{target} = new_array({node.element_type!r}, {size}, {node.line}, {node.column})")
+        elif node.initializer:
+            self.emit(f"{target} = {self.expression(node.initializer)}")
+        else:
+            self.emit(f"{target} = []")
+
+    def visit_function_declaration(self, node):
+        # Argumentos a menos ficam None e os excedentes são ignorados
+        level = self.level + 1
+        parameters = [f"{parameter.name}_{level}_{slot}=None"
+                      for slot, parameter in enumerate(node.parameters)]
+        parameters.append("*_")
+        name = self.variable(node.name, 0, node.slot)
+        self.translate_function(name, parameters, node.body.statements)
+        if node.pure and self.memoizer is not None:
+            memo = self.constant(self.memoizer.cache(node))
+            self.emit(f"{name} = memoize({name}, {memo})")
+
+    def visit_assignment(self, node):
+        value = self.expression(node.value)
+        target = node.target
+
+        if hasattr(target, 'name'):
+            if target.depth is None:
+                self.emit(value)
+                self.emit(f"raise undefined_variable({target.name!r})")
+                return
+            name = self.variable(target.name, target.depth, target.slot)
+            if target.depth > 0:
+                self.nonlocals.add(name)
+            self.emit(f"{name} = {value}")
+            return
+
+        stored, array, position = self.temporary(), self.temporary(), self.temporary()
+        self.emit(f"{stored} = {value}")
+        self.emit(f"{array} = {self.expression(target.array)}")
+        self.emit(f"{position} = {self.expression(target.index)}")
+        self.emit(f"if not (type({array}) in ARRAY_TYPES and type({position}) is int "
+                  f"and 0 <= {position} < len({array})):")
+        self.emit(f"    check_index({array}, {position}, {node.line}, {node.column})")
+        self.emit(f"{array}[{position}] = {stored}")
+
+    def visit_if_statement(self, node, keyword="if"):
+        self.emit(f"{keyword} {self.condition(node.condition)}:")
+        self.body(node.then_stmt)
+        else_stmt = node.else_stmt
+        if else_stmt is None:
+            return
+        if type(else_stmt) is IfStatement:
+            self.visit_if_statement(else_stmt, "elif")
+        else:
+            self.emit("else:")
+            self.body(else_stmt)
+
+    def visit_while_statement(self, node):
+        self.emit(f"while {self.condition(node.condition)}:")
+        self.body(node.body)
+
+    def visit_for_statement(self, node):
+        if node.init:
+            self.visit(node.init)
+        if node.step is not None:
+            self.counted_for(node)
+            return
+        condition = self.condition(node.condition) if node.condition else "True"
+        self.emit(f"while {condition}:")
+        statements = node.body.statements if hasattr(node.body, 'statements') else [node.body]
+        self.block(statements + [node.update] if node.update else statements)
+
+    def counted_for(self, node):
+        """Laço contado: for nativo do Python sobre um range"""
+        variable = self.variable(node.init.name, 0, node.init.slot)
+        condition = node.condition
+        values = self.temporary()
+        self.emit(f"{values} = counted_values({variable}, {self.expression(condition.right)}, "
+                  f"{condition.operator!r}, {node.step})")
+        self.emit(f"for {variable} in {values}:")
+        self.body(node.body)
+        self.emit(f"{variable} = loop_end({values})")
+
+    def visit_return_statement(self, node):
+        if node.value:
+            self.emit(f"return {self.expression(node.value)}")
+        else:
+            self.emit("return None")
+
+    def visit_print_statement(self, node):
+        expression = node.expression
+        # str() já formata int e string como stringify
+        if expression.static_type in ('int', 'string'):
+            self.emit(f"print({self.expression(expression)})")
+        else:
+            self.emit(f"print(stringify({self.expression(expression)}))")
+
+    def visit_expression_statement(self, node):
+        self.emit(self.expression(node.expression))
+
+    def visit_block(self, node):
+        self.translate_statements(node.statements)
+
+    def visit_binary_op(self, node):
+        operator = node.operator
+        left, right = node.left, node.right
+
+        if operator == '+':
+            if node.static_type in ('int', 'float') or \
+                    (left.static_type == 'string' and right.static_type == 'string'):
+                return f"{self.expression(left, SUM)} + {self.expression(right, SUM + 1)}", SUM
+            return f"add({self.expression(left)}, {self.expression(right)})", ATOM
+        if operator == '/':
+            if type(right) is Literal and type(right.value) in (int, float) and right.value != 0:
+                return f"{self.expression(left, PRODUCT)} / {self.expression(right, PRODUCT + 1)}", PRODUCT
+            return (f"divide({self.expression(left)}, {self.expression(right)}, "
+                    f"{node.line}, {node.column})"), ATOM
+        if operator in ('and', 'or'):
+            symbol, precedence = OPERATORS[operator]
+            return f"{self.truth(left, precedence)} {symbol} {self.truth(right, precedence + 1)}", precedence
+        if operator in OPERATORS:
+            symbol, precedence = OPERATORS[operator]
+            # Comparações do Python encadeiam: os dois lados precisam de parênteses
+            left_precedence = precedence + 1 if precedence == COMPARISON else precedence
+            return (f"{self.expression(left, left_precedence)} {symbol} "
+                    f"{self.expression(right, precedence + 1)}"), precedence
+
+        error = RuntimeError(f"Operador binário desconhecido: {operator}", node.line, node.column)
+        return f"fail({self.constant(error)}, {self.expression(left)}, {self.expression(right)})", ATOM
+
+    def visit_unary_op(self, node):
+        if node.operator == '-':
+            return f"-{self.expression(node.operand, UNARY)}", UNARY
+        if node.operator == 'not':
+            return f"not {self.truth(node.operand, NOT)}", NOT
+
+        error = RuntimeError(f"Operador unário desconhecido: {node.operator}", node.line, node.column)
+        return f"fail({self.constant(error)}, {self.expression(node.operand)})", ATOM
+
+    def visit_literal(self, node):
+        value = node.value
+        if isinstance(value, float) and not math.isfinite(value):
+            return self.constant(value), ATOM
+        return repr(value), ATOM
+
+    def visit_identifier(self, node):
+        if node.depth is None:
+            return f"undefined({node.name!r})", ATOM
+        return self.variable(node.name, node.depth, node.slot), ATOM
+
+    def visit_function_call(self, node):
+        if node.native is not None:
+            arguments = "".join(f"{self.expression(argument)}, " for argument in node.arguments)
+            function = NATIVES[node.native].function.__name__
+            return f"{function}({arguments}{node.line}, {node.column})", ATOM
+        if node.depth is None:
+            return f"undefined({node.name!r})", ATOM
+
+        callee = self.variable(node.name, node.depth, node.slot)
+        arguments = ", ".join(self.expression(argument) for argument in node.arguments)
+        call = f"{callee}({arguments})"
+        if node.tail:
+            # return f(...): a chamada é feita pelo trampolim de quem chamou
+            self.has_tail_calls = True
+            call = f"TailCall({callee}, ({arguments}{',' if node.arguments else ''}))"
+        return (f"{call} if type({callee}) is Function "
+                f"else not_function({node.name!r}, {node.line}, {node.column})"), CONDITIONAL
+
+    def visit_array_access(self, node):
+        array, position = self.temporary(), self.temporary()
+        # Os dois lados são avaliados (&) antes de qualquer verificação
+        return (f"{array}[{position}] if (type({array} := {self.expression(node.array)}) in ARRAY_TYPES) & "
+                f"(type({position} := {self.expression(node.index)}) is int) "
+                f"and 0 <= {position} < len({array}) "
+                f"else index({array}, {position}, {node.line}, {node.column})"), CONDITIONAL
+
+    def visit_array_literal(self, node):
+        return f"[{', '.join(self.expression(element) for element in node.elements)}]", ATOM
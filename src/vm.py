@@ -0,0 +1,288 @@
+"""
+Máquina virtual de pilha para o bytecode gerado por bytecode.py.
+
+Cada chamada executa o CodeObject da função num laço de despacho próprio,
+com a pilha de operandos numa lista local. Os quadros seguem o formato do
+compilador para closures: uma lista com o quadro pai na posição 0 e a
+variável de slot s em s + 1.
+"""
+
+import operator
+from .bytecode import (
+    BytecodeCompiler, OPCODES, JUMPS,
+    LOAD_CONST, LOAD_LOCAL, LOAD_DEREF, STORE_LOCAL, STORE_DEREF,
+    RAISE_UNDEFINED, RAISE_ERROR, ADD, ADD_FAST, SUB, MUL, DIV, MOD, LT, GT,
+    LE, GE, EQ, NE, NEG, NOT, TO_BOOL, JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE_OR_POP, FOR_RANGE, FOR_NEXT, POP, PRINT,
+    COERCE, NEW_ARRAY, BUILD_ARRAY, INDEX, STORE_INDEX, MAKE_FUNCTION,
+    CHECK_FUNCTION, CALL, CALL_NATIVE, RETURN, TAIL_CALL,
+)
+from .errors import RuntimeError
+from .runtime import (is_truthy, stringify, new_array, check_index,
+                      undefined_variable, counted_values, loop_end, ARRAY_TYPES, GlobalsView)
+
+# Superinstruções criadas na decodificação (não aparecem no bytecode)
+(LOAD_LOCAL_LOCAL, LOAD_LOCAL_CONST, BINARY_JUMP_IF_FALSE,
+ BINARY_STORE_LOCAL) = range(len(OPCODES), len(OPCODES) + 4)
+
+# Operadores binários sem checagem extra, indexados pelo opcode
+BINARY_FUNCTIONS = [None] * (len(OPCODES) + 4)
+for opcode, function in ((ADD_FAST, operator.add), (SUB, operator.sub), (MUL, operator.mul),
+                         (MOD, operator.mod), (LT, operator.lt), (GT, operator.gt),
+                         (LE, operator.le), (GE, operator.ge), (EQ, operator.eq),
+                         (NE, operator.ne)):
+    BINARY_FUNCTIONS[opcode] = function
+
+def decode(code_object):
+    """
+    Lista de pares (opcode, operando) com saltos em índices de instrução.
+    
+    Pares frequentes viram superinstruções no lugar da primeira, que executa
+    as duas e pula a segunda; a segunda continua na lista, então os índices
+    não mudam. Só se funde quando a segunda não é destino de salto.
+    """
+    code = code_object.code
+    instructions = [(code[offset], code[offset + 1]) for offset in range(0, len(code), 2)]
+    targets = set()
+    for index, (op, argument) in enumerate(instructions):
+        if op in JUMPS:
+            instructions[index] = (op, argument // 2)
+            targets.add(argument // 2)
+    
+    for index in range(len(instructions) - 1):
+        if index + 1 in targets:
+            continue
+        (op, argument), (following, following_argument) = instructions[index:index + 2]
+        if op == LOAD_LOCAL and following == LOAD_LOCAL:
+            instructions[index] = (LOAD_LOCAL_LOCAL, (argument, following_argument))
+        elif op == LOAD_LOCAL and following == LOAD_CONST:
+            instructions[index] = (LOAD_LOCAL_CONST, (argument, following_argument))
+        elif BINARY_FUNCTIONS[op] is not None and following == JUMP_IF_FALSE:
+            instructions[index] = (BINARY_JUMP_IF_FALSE, (BINARY_FUNCTIONS[op], following_argument))
+        elif BINARY_FUNCTIONS[op] is not None and following == STORE_LOCAL:
+            instructions[index] = (BINARY_STORE_LOCAL, (BINARY_FUNCTIONS[op], following_argument))
+    return instructions
+
+class VMFunction:
+    def __init__(self, code_object, closure, memo=None):
+        self.code_object = code_object
+        self.closure = closure
+        # MemoCache das funções puras com --memoize
+        self.memo = memo
+
+class VirtualMachine:
+    def __init__(self, memoizer=None):
+        self.globals = None
+        self.memoizer = memoizer
+
+    def interpret(self, ast):
+        code_object = BytecodeCompiler().compile(ast)
+        frame = [None] * (code_object.frame_size + 1)
+        self.globals = GlobalsView(code_object.names, frame)
+        try:
+            self.run(code_object, frame)
+        except RuntimeError as e:
+            print(f"Erro em tempo de execução: {e}")
+            raise
+
+    def call(self, function, arguments):
+        code_object = function.code_object
+        frame = [function.closure]
+        frame += arguments[:code_object.parameter_count]
+        frame += [None] * (code_object.frame_size + 1 - len(frame))
+        return self.run(code_object, frame)
+
+    def run(self, code_object, frame):
+        instructions = code_object.instructions
+        if instructions is None:
+            instructions = code_object.instructions = decode(code_object)
+        constants = code_object.constants
+        binary = BINARY_FUNCTIONS
+        arrays = ARRAY_TYPES
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        # Opcodes mais frequentes primeiro: o despacho é uma cadeia de ifs
+        while True:
+            op, argument = instructions[pc]
+            pc += 1
+
+            if op == LOAD_LOCAL:
+                push(frame[argument])
+            elif op == LOAD_LOCAL_LOCAL:
+                push(frame[argument[0]])
+                push(frame[argument[1]])
+                pc += 1
+            elif op == LOAD_LOCAL_CONST:
+                push(frame[argument[0]])
+                push(constants[argument[1]])
+                pc += 1
+            elif op == BINARY_JUMP_IF_FALSE:
+                right = pop()
+                value = argument[0](pop(), right)
+                if value is None or value is False:
+                    pc = argument[1]
+                else:
+                    pc += 1
+            elif op == BINARY_STORE_LOCAL:
+                right = pop()
+                frame[argument[1]] = argument[0](pop(), right)
+                pc += 1
+            elif op == LOAD_CONST:
+                push(constants[argument])
+            elif op == STORE_LOCAL:
+                frame[argument] = pop()
+            elif binary[op] is not None:
+                right = pop()
+                stack[-1] = binary[op](stack[-1], right)
+            elif op == JUMP_IF_FALSE:
+                value = pop()
+                if value is None or value is False:
+                    pc = argument
+            elif op == JUMP:
+                pc = argument
+            elif op == FOR_NEXT:
+                # Abaixo do iterador ficam os valores, para o valor final
+                value = next(stack[-1], stack)
+                if value is stack:
+                    pop()
+                    stack[-1] = loop_end(stack[-1])
+                    pc = argument
+                else:
+                    push(value)
+            elif op == INDEX:
+                index = pop()
+                array = stack[-1]
+                if type(array) not in arrays or type(index) is not int or \
+                        not 0 <= index < len(array):
+                    check_index(array, index, *code_object.position(2 * pc - 2))
+                stack[-1] = array[index]
+            elif op == STORE_INDEX:
+                index = pop()
+                array = pop()
+                value = pop()
+                if type(array) not in arrays or type(index) is not int or \
+                        not 0 <= index < len(array):
+                    check_index(array, index, *code_object.position(2 * pc - 2))
+                array[index] = value
+            elif op == LOAD_DEREF:
+                depth, slot = constants[argument]
+                outer = frame
+                for _ in range(depth):
+                    outer = outer[0]
+                push(outer[slot])
+            elif op == ADD:
+                right = pop()
+                left = stack[-1]
+                if isinstance(left, str) or isinstance(right, str):
+                    stack[-1] = str(left) + str(right)
+                else:
+                    stack[-1] = left + right
+            elif op == CHECK_FUNCTION:
+                if not isinstance(stack[-1], VMFunction):
+                    raise RuntimeError(f"'{constants[argument]}' não é uma função",
+                                       *code_object.position(2 * pc - 2))
+            elif op == CALL:
+                if argument:
+                    arguments = stack[-argument:]
+                    del stack[-argument:]
+                else:
+                    arguments = []
+                function = pop()
+                if function.memo is None:
+                    push(self.call(function, arguments))
+                else:
+                    push(function.memo.call(self.call, arguments, function))
+            elif op == CALL_NATIVE:
+                native = constants[argument]
+                count = len(native.parameters)
+                arguments = stack[-count:]
+                del stack[-count:]
+                push(native.function(*arguments, *code_object.position(2 * pc - 2)))
+            elif op == RETURN:
+                return pop()
+            elif op == TAIL_CALL:
+                if argument:
+                    arguments = stack[-argument:]
+                    del stack[-argument:]
+                else:
+                    arguments = []
+                function = pop()
+                # Sobras de laços contados interrompidos pelo return
+                stack.clear()
+                # A função chamada passa a executar neste mesmo laço, no
+                # lugar da atual: a pilha Python não cresce
+                code_object = function.code_object
+                frame = [function.closure]
+                frame += arguments[:code_object.parameter_count]
+                frame += [None] * (code_object.frame_size + 1 - len(frame))
+                instructions = code_object.instructions
+                if instructions is None:
+                    instructions = code_object.instructions = decode(code_object)
+                constants = code_object.constants
+                pc = 0
+            elif op == STORE_DEREF:
+                depth, slot = constants[argument]
+                outer = frame
+                for _ in range(depth):
+                    outer = outer[0]
+                outer[slot] = pop()
+            elif op == DIV:
+                right = pop()
+                if right == 0:
+                    raise RuntimeError("Divisão por zero", *code_object.position(2 * pc - 2))
+                stack[-1] = stack[-1] / right
+            elif op == JUMP_IF_FALSE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    stack[-1] = False
+                    pc = argument
+                else:
+                    pop()
+            elif op == JUMP_IF_TRUE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    pop()
+                else:
+                    stack[-1] = True
+                    pc = argument
+            elif op == FOR_RANGE:
+                bound = pop()
+                values = counted_values(stack[-1], bound, *constants[argument])
+                stack[-1] = values
+                push(iter(values))
+            elif op == TO_BOOL:
+                stack[-1] = is_truthy(stack[-1])
+            elif op == NEG:
+                stack[-1] = -stack[-1]
+            elif op == NOT:
+                stack[-1] = not is_truthy(stack[-1])
+            elif op == POP:
+                pop()
+            elif op == PRINT:
+                print(stringify(pop()))
+            elif op == COERCE:
+                stack[-1] = constants[argument](stack[-1])
+            elif op == BUILD_ARRAY:
+                if argument:
+                    elements = stack[-argument:]
+                    del stack[-argument:]
+                else:
+                    elements = []
+                push(elements)
+            elif op == NEW_ARRAY:
+                stack[-1] = new_array(constants[argument], stack[-1], *code_object.position(2 * pc - 2))
+            elif op == MAKE_FUNCTION:
+                function_code = constants[argument]
+                if function_code.pure and self.memoizer is not None:
+                    push(VMFunction(function_code, frame, self.memoizer.cache(function_code)))
+                else:
+                    push(VMFunction(function_code, frame))
+            elif op == RAISE_UNDEFINED:
+                raise undefined_variable(constants[argument])
+            elif op == RAISE_ERROR:
+                raise constants[argument]
+            else:
+                raise RuntimeError(f"Opcode desconhecido: {op}", *code_object.position(2 * pc - 2))
@@ -0,0 +1,131 @@
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.optimizer import Optimizer
+from src.bytecode import (
+    BytecodeCompiler, CodeObject, OPCODES, disassemble,
+    LOAD_LOCAL, LOAD_DEREF, ADD, ADD_FAST, DIV, MAKE_FUNCTION, RETURN, CALL, TAIL_CALL,
+    JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, TO_BOOL, PRINT, LT, JUMP,
+    STORE_LOCAL, FOR_RANGE, FOR_NEXT,
+)
+
+def compile_code(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return BytecodeCompiler().compile(ast)
+
+def instructions(code_object):
+    code = code_object.code
+    return [(code[i], code[i + 1]) for i in range(0, len(code), 2)]
+
+def opcodes(code_object):
+    return [op for op, _ in instructions(code_object)]
+
+def test_opcodes_are_consecutive():
+    assert TAIL_CALL == len(OPCODES) - 1
+    assert OPCODES[DIV] == 'DIV'
+
+def test_code_is_array_of_pairs_ending_in_return():
+    code_object = compile_code("int x = 1; print(x);")
+    assert code_object.code.typecode == 'l'
+    assert len(code_object.code) % 2 == 0
+    assert opcodes(code_object)[-1] == RETURN
+    assert code_object.frame_size == 1
+
+def test_constants_are_deduplicated_by_type():
+    code_object = compile_code("print(1); print(1); print(1.0); print(true);")
+    constants = [c for c in code_object.constants if c is not None]
+    assert len(constants) == 3
+    assert [type(c) for c in constants] == [int, float, bool]
+
+def test_functions_get_their_own_code_objects():
+    code_object = compile_code("""
+        int base = 10;
+        function add(n) {
+            int total = n + base;
+            return total;
+        }
+        print(add(1));
+    """)
+    assert MAKE_FUNCTION in opcodes(code_object)
+    function = next(c for c in code_object.constants if isinstance(c, CodeObject))
+    assert function.name == "add"
+    assert function.parameter_count == 1
+    assert function.names == ('n', 'total')
+    assert LOAD_LOCAL in opcodes(function)
+    assert LOAD_DEREF in opcodes(function)
+
+def test_static_types_select_fast_add():
+    assert ADD_FAST in opcodes(compile_code("int a = 1; int b = a + 2;"))
+    code_object = compile_code("int a = 1; string s = \"x\"; print(s + a);")
+    assert ADD in opcodes(code_object)
+    assert ADD_FAST not in opcodes(code_object)
+
+def test_logical_operators_jump_over_right_side():
+    code_object = compile_code("""
+        function f(x) { return x; }
+        bool a = true;
+        print(a and a);
+        print(a or f(1));
+    """)
+    code = instructions(code_object)
+    ops = [op for op, _ in code]
+    first, second = ops.index(JUMP_IF_FALSE_OR_POP), ops.index(JUMP_IF_TRUE_OR_POP)
+    # O salto vai direto para o print, depois do lado direito
+    assert ops[code[first][1] // 2] == PRINT
+    # Só o lado direito sem tipo estático bool precisa de conversão
+    assert ops[first:second].count(TO_BOOL) == 0
+    assert ops[code[second][1] // 2 - 1] == TO_BOOL
+
+def test_line_table_maps_offsets_to_source():
+    code_object = compile_code("int x = 1;\nint y = 0;\n\nprint(x / y);")
+    offset = 2 * opcodes(code_object).index(DIV)
+    assert code_object.position(offset)[0] == 4
+
+def test_disassemble_lists_nested_functions():
+    listing = disassemble(compile_code("""
+        function twice(n) { return n * 2; }
+        print(twice(4));
+    """))
+    assert "Código de <programa>" in listing
+    assert "Código de twice" in listing
+    assert "MAKE_FUNCTION" in listing
+    assert "CALL" in listing
+    assert "LOAD_LOCAL" in listing and "(n)" in listing
+
+def test_tail_calls_use_tail_call_opcode():
+    code_object = compile_code("""
+        function count(n, total) {
+            if (n == 0) { return total; }
+            return count(n - 1, total + n);
+        }
+        print(count(3, 0));
+    """)
+    function = next(c for c in code_object.constants if isinstance(c, CodeObject))
+    assert TAIL_CALL in opcodes(function) and CALL not in opcodes(function)
+    assert CALL in opcodes(code_object)
+
+def test_counted_for_iterates_a_range():
+    code_object = compile_code("""
+        int n = 4;
+        for (int i = 0; i < n; i = i + 1) { print(i); }
+    """)
+    code = instructions(code_object)
+    ops = [op for op, _ in code]
+    assert LT not in ops
+    loop = ops.index(FOR_NEXT)
+    assert ops[loop - 1] == FOR_RANGE
+    assert code_object.constants[code[loop - 1][1]] == ('<', 1)
+    assert ops[loop + 1] == STORE_LOCAL
+    # O fim do laço volta ao FOR_NEXT, que ao terminar salta para guardar o valor final
+    exit = code[loop][1] // 2
+    assert code[exit - 1] == (JUMP, 2 * loop)
+    assert code[exit] == (STORE_LOCAL, code[loop + 1][1])
+
+def test_constants_keep_the_sign_of_zero():
+    ast = Parser(Lexer("print(-0.0); print(0.0);").tokenize()).parse()
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(ast)
+    Optimizer(analyzer).optimize(ast)
+    constants = BytecodeCompiler().compile(ast).constants
+    assert [str(value) for value in constants if type(value) is float] == ['-0.0', '0.0']
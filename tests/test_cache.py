@@ -0,0 +1,79 @@
+import os
+import pickle
+from src import minilang
+from src.cache import ASTCache, CACHE_DIRNAME, CACHE_SUFFIX, source_key
+
+PROGRAM = "int x = 2;\nfunction dobro(int n) { return n * 2; }\nprint(dobro(x));"
+
+def write_program(tmp_path, code, name="programa.ml"):
+    path = tmp_path / name
+    path.write_text(code, encoding="utf-8")
+    return str(path)
+
+def cache_entries(tmp_path):
+    directory = tmp_path / CACHE_DIRNAME
+    if not directory.exists():
+        return []
+    return sorted(entry.name for entry in directory.iterdir())
+
+def test_source_key_depends_on_content():
+    assert source_key("print(1);") == source_key(b"print(1);")
+    assert source_key("print(1);") != source_key("print(2);")
+
+def test_cli_writes_and_reuses_cache(tmp_path, capsys, monkeypatch):
+    path = write_program(tmp_path, PROGRAM)
+    minilang.main([path])
+    entries = cache_entries(tmp_path)
+    assert len(entries) == 1 and entries[0].endswith(CACHE_SUFFIX)
+    
+    # Na segunda execução o fonte não é recompilado
+    def fail(source_code):
+        raise AssertionError("compilou de novo")
+    monkeypatch.setattr(minilang, "compile_source", fail)
+    minilang.main([path])
+    assert capsys.readouterr().out.split() == ["4", "4"]
+
+def test_changed_source_replaces_stale_entry(tmp_path, capsys):
+    path = write_program(tmp_path, PROGRAM)
+    minilang.main([path])
+    first = cache_entries(tmp_path)
+    write_program(tmp_path, PROGRAM.replace("2;", "5;", 1))
+    minilang.main([path])
+    second = cache_entries(tmp_path)
+    assert len(second) == 1 and second != first
+    assert capsys.readouterr().out.split() == ["4", "10"]
+
+def test_no_cache_flag(tmp_path, capsys):
+    path = write_program(tmp_path, PROGRAM)
+    minilang.main(["--no-cache", path])
+    assert cache_entries(tmp_path) == []
+    assert capsys.readouterr().out.strip() == "4"
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    cache = ASTCache(str(tmp_path / CACHE_DIRNAME))
+    key = source_key(PROGRAM)
+    ast = minilang.compile_source(PROGRAM)
+    assert cache.store("p.ml", key, ast)
+    with open(cache.entry_path("p.ml", key), "wb") as file:
+        file.write(b"lixo")
+    assert cache.load("p.ml", key) is None
+    assert cache_entries(tmp_path) == []
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = ASTCache(str(tmp_path / CACHE_DIRNAME))
+    ast = minilang.compile_source(PROGRAM)
+    size = len(pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL))
+    cache.max_bytes = 2 * size
+    
+    keys = {name: source_key(name) for name in ("a.ml", "b.ml", "c.ml")}
+    cache.store("a.ml", keys["a.ml"], ast)
+    cache.store("b.ml", keys["b.ml"], ast)
+    os.utime(cache.entry_path("a.ml", keys["a.ml"]), (1, 1))
+    os.utime(cache.entry_path("b.ml", keys["b.ml"]), (2, 2))
+    # Usar "a" o torna o mais recente; "b" deve sair
+    assert cache.load("a.ml", keys["a.ml"]) is not None
+    cache.store("c.ml", keys["c.ml"], ast)
+    
+    assert cache.load("b.ml", keys["b.ml"]) is None
+    assert cache.load("a.ml", keys["a.ml"]) is not None
+    assert cache.load("c.ml", keys["c.ml"]) is not None
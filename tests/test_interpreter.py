@@ -1,13 +1,22 @@
 import pytest
+import array
 import io
 import sys
 from src.lexer import Lexer
 from src.parser import Parser
 from src.semantic import SemanticAnalyzer
 from src.interpreter import Interpreter
-from src.errors import RuntimeError
+from src.errors import RuntimeError, SemanticError
+from src.minilang import ENGINES
+from src.purity import PurityAnalyzer
+from src.runtime import Memoizer
 
-def run_code(code):
+@pytest.fixture(params=sorted(ENGINES))
+def engine(request):
+    """Motor de execução: os testes que o recebem rodam com todos os motores"""
+    return ENGINES[request.param]
+
+def run_code(engine, code):
     """Helper para executar código MiniLang"""
     lexer = Lexer(code)
     tokens = lexer.tokenize()
@@ -15,22 +24,27 @@ def run_code(code):
     ast = parser.parse()
     semantic_analyzer = SemanticAnalyzer()
     semantic_analyzer.analyze(ast)
-    interpreter = Interpreter()
+    interpreter = engine()
     interpreter.interpret(ast)
     return interpreter
 
-def capture_output(code):
+def capture_output(engine, code):
     """Helper para capturar saída do print"""
     old_stdout = sys.stdout
     sys.stdout = captured_output = io.StringIO()
     try:
-        run_code(code)
+        run_code(engine, code)
         return captured_output.getvalue().strip()
     finally:
         sys.stdout = old_stdout
 
-def test_variable_declaration_and_assignment():
-    interpreter = run_code("""
+def analyze(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def test_variable_declaration_and_assignment(engine):
+    interpreter = run_code(engine, """
         int x = 10;
         float y = 3.14;
         string name = "MiniLang";
@@ -42,8 +56,8 @@ def test_variable_declaration_and_assignment():
     assert interpreter.globals.get("name") == "MiniLang"
     assert interpreter.globals.get("active") == True
 
-def test_arithmetic_operations():
-    output = capture_output("""
+def test_arithmetic_operations(engine):
+    output = capture_output(engine, """
         int a = 10;
         int b = 5;
         print(a + b);
@@ -60,8 +74,8 @@ def test_arithmetic_operations():
     assert lines[3] == "2"
     assert lines[4] == "0"
 
-def test_comparison_operations():
-    output = capture_output("""
+def test_comparison_operations(engine):
+    output = capture_output(engine, """
         int x = 10;
         int y = 5;
         print(x > y);
@@ -80,8 +94,8 @@ def test_comparison_operations():
     assert lines[4] == "false"
     assert lines[5] == "true"
 
-def test_logical_operations():
-    output = capture_output("""
+def test_logical_operations(engine):
+    output = capture_output(engine, """
         bool a = true;
         bool b = false;
         print(a and b);
@@ -96,8 +110,36 @@ def test_logical_operations():
     assert lines[2] == "false"
     assert lines[3] == "true"
 
-def test_string_concatenation():
-    output = capture_output("""
+def test_logical_operators_short_circuit(engine):
+    output = capture_output(engine, """
+        function side(v) {
+            print(v);
+            return v;
+        }
+        
+        function nothing() {
+        }
+        
+        int[3] a = [1, 2, 3];
+        int i = 3;
+        print(i < 3 and a[i] > 0);
+        print(i >= 3 or a[i] > 0);
+        print(side(false) and side(true));
+        print(side(true) or side(false));
+        print(side(true) and side(1));
+        print(side(nothing()) or side(false));
+    """)
+    
+    assert output.split("\n") == [
+        "false", "true",
+        "false", "false",
+        "true", "true",
+        "true", "1", "true",
+        "null", "false", "false",
+    ]
+
+def test_string_concatenation(engine):
+    output = capture_output(engine, """
         string first = "Hello";
         string second = "World";
         print(first + " " + second);
@@ -105,8 +147,8 @@ def test_string_concatenation():
     
     assert output == "Hello World"
 
-def test_if_statement():
-    output = capture_output("""
+def test_if_statement(engine):
+    output = capture_output(engine, """
         int x = 10;
         if (x > 5) {
             print("x é maior que 5");
@@ -117,8 +159,8 @@ def test_if_statement():
     
     assert output == "x é maior que 5"
 
-def test_while_loop():
-    output = capture_output("""
+def test_while_loop(engine):
+    output = capture_output(engine, """
         int i = 0;
         while (i < 3) {
             print(i);
@@ -131,8 +173,8 @@ def test_while_loop():
     assert lines[1] == "1"
     assert lines[2] == "2"
 
-def test_function_declaration_and_call():
-    output = capture_output("""
+def test_function_declaration_and_call(engine):
+    output = capture_output(engine, """
         function add(x, y) {
             return x + y;
         }
@@ -143,8 +185,8 @@ def test_function_declaration_and_call():
     
     assert output == "30"
 
-def test_recursive_function():
-    output = capture_output("""
+def test_recursive_function(engine):
+    output = capture_output(engine, """
         function factorial(n) {
             if (n <= 1) {
                 return 1;
@@ -157,8 +199,225 @@ def test_recursive_function():
     
     assert output == "120"
 
-def test_array_operations():
-    output = capture_output("""
+def test_tail_calls_run_in_constant_stack(engine):
+    output = capture_output(engine, """
+        function soma(n, acc) {
+            if (n == 0) {
+                return acc;
+            }
+            return soma(n - 1, acc + n);
+        }
+        
+        function dobra(x) {
+            return x * 2;
+        }
+        
+        function conta(n) {
+            if (n > 0) {
+                return conta(n - 1);
+            }
+            return dobra(n + 21);
+        }
+        
+        print(soma(20000, 0));
+        print(conta(20000));
+    """)
+    
+    assert output == "200010000\n42"
+
+def test_only_calls_in_return_position_are_tail_calls():
+    ast = analyze("""
+        function f(n) {
+            if (n == 0) {
+                return 0;
+            }
+            f(n - 1);
+            return 1 + f(n - 1);
+        }
+        
+        function g(n) {
+            return f(n);
+        }
+    """)
+    f, g = ast.statements
+    call, ret = f.body.statements[1:]
+    assert not call.expression.tail
+    assert not ret.value.right.tail
+    assert g.body.statements[0].value.tail
+
+def test_counted_for_loops_keep_generic_semantics(engine):
+    output = capture_output(engine, """
+        function nada() {
+        }
+        function ultimo() {
+        }
+        
+        function conta(n) {
+            int total = 0;
+            for (int i = 0; i < n; i = i + 1) { total = total + i; }
+            for (int i = 1; i <= n; i = i + 3) { total = total * 2 + i; }
+            for (int i = n; i > 0; i = i - 2) { total = total - i; }
+            for (int i = n; i >= -n; i = i - 5) { total = total + i * i; }
+            for (int i = 0; i < n / 2; i = i + 1) { total = total + 1; }
+            return total;
+        }
+        
+        function busca(n, alvo) {
+            for (int i = 0; i < n * 2; i = i + 1) {
+                if (i * i >= alvo) {
+                    return i;
+                }
+            }
+            return -1;
+        }
+        
+        function cauda(n) {
+            for (int i = 0; i < 5; i = i + 1) {
+                if (n > 0) {
+                    return cauda(n - 1);
+                }
+            }
+            return n;
+        }
+        
+        for (int i = 0; i < 7; i = i + 3) {
+            function fim() { return i; }
+            ultimo = fim;
+        }
+        
+        print(conta(10));
+        print(busca(10, 50));
+        print(busca(3, 50));
+        print(cauda(2000));
+        print(ultimo());
+    """)
+    
+    assert output == "993\n8\n-1\n0\n9"
+
+def test_for_bound_that_reads_the_loop_variable_is_reevaluated(engine):
+    output = capture_output(engine, """
+        function f() {
+            for (int i = 0; i < i + 1; i = i + 1) {
+                if (i == 10) {
+                    return i;
+                }
+            }
+            return -1;
+        }
+        print(f());
+    """)
+    assert output == "10"
+
+def test_counted_for_loops_require_an_invariant_bound():
+    from src.ast_nodes import ForStatement
+    ast = analyze("""
+        int n = 5;
+        int[3] a;
+        function muda() {
+            n = 2;
+        }
+        function f(x) {
+            return x;
+        }
+        
+        for (int i = 0; i < n + 1; i = i + 2) { print(i); }
+        for (int i = 0; i < n; i = i + 1) { i = i + 1; }
+        for (int i = 0; i < 10; i = i + 1) { int m = i; }
+        for (int i = 0; i < a[0]; i = i + 1) { print(i); }
+        for (int i = 0; i < f(3); i = i + 1) { print(i); }
+        for (int i = 10; i < 3; i = i - 1) { print(i); }
+        for (int i = 0; i < 3; i = i * 2) { print(i); }
+        for (int i = 0; i != 3; i = i + 1) { print(i); }
+        for (float i = 0; i < 3; i = i + 1) { print(i); }
+        for (int i = 0; i <= 3; i = i + 1) {
+            for (int j = i; j < 3; j = j + 1) { print(j); }
+        }
+    """)
+    loops = [node for node in ast.statements if type(node) is ForStatement]
+    inner = loops[-1].body.statements[0]
+    assert [loop.step for loop in loops + [inner]] == \
+        [None, None, 1, None, None, None, None, None, None, 1, 1]
+
+def test_memoize_caches_only_pure_functions(engine):
+    ast = analyze("""
+        function fibonacci(n) {
+            if (n <= 1) {
+                return n;
+            }
+            return fibonacci(n - 1) + fibonacci(n - 2);
+        }
+        
+        function mostra(x) {
+            print(x);
+            return x;
+        }
+        
+        print(fibonacci(30));
+        print(mostra(1) + mostra(1));
+    """)
+    PurityAnalyzer().analyze(ast)
+    memoizer = Memoizer()
+    old_stdout = sys.stdout
+    sys.stdout = captured_output = io.StringIO()
+    try:
+        engine(memoizer).interpret(ast)
+    finally:
+        sys.stdout = old_stdout
+    
+    assert captured_output.getvalue().split() == ["832040", "1", "1", "2"]
+    [memo] = memoizer.caches.values()
+    assert memo.name == "fibonacci"
+    assert (memo.hits, memo.misses) == (28, 31)
+
+def test_memoize_keeps_closures_with_their_own_state(engine):
+    ast = analyze("""
+        function mk(x) {
+            int c = 0;
+            function g() {
+                c = c + 1;
+                return c;
+            }
+            return g;
+        }
+        
+        function h() {
+        }
+        function k() {
+        }
+        h = mk(1);
+        k = mk(1);
+        print(h());
+        print(k());
+        print(h());
+    """)
+    PurityAnalyzer().analyze(ast)
+    old_stdout = sys.stdout
+    sys.stdout = captured_output = io.StringIO()
+    try:
+        engine(Memoizer()).interpret(ast)
+    finally:
+        sys.stdout = old_stdout
+    
+    assert captured_output.getvalue().split() == ["1", "1", "2"]
+
+def test_memoize_keeps_the_sign_of_zero(engine):
+    ast = analyze("""
+        function ident(float x) { return x; }
+        print(ident(0.0));
+        print(ident(-0.0));
+    """)
+    PurityAnalyzer().analyze(ast)
+    old_stdout = sys.stdout
+    sys.stdout = captured_output = io.StringIO()
+    try:
+        engine(Memoizer()).interpret(ast)
+    finally:
+        sys.stdout = old_stdout
+    
+    assert captured_output.getvalue().split() == ["0", "-0"]
+
+def test_array_operations(engine):
+    output = capture_output(engine, """
         int[] numbers = [1, 2, 3, 4, 5];
         print(numbers[0]);
         print(numbers[2]);
@@ -171,8 +430,8 @@ def test_array_operations():
     assert lines[1] == "3"
     assert lines[2] == "10"
 
-def test_array_assignment():
-    interpreter = run_code("""
+def test_array_assignment(engine):
+    interpreter = run_code(engine, """
         int[] arr = [1, 2, 3];
         arr[0] = 10;
         arr[2] = 30;
@@ -183,8 +442,159 @@ def test_array_assignment():
     assert arr[1] == 2
     assert arr[2] == 30
 
-def test_scope_in_function():
-    output = capture_output("""
+def test_sized_primitive_arrays_are_compact(engine):
+    from src.runtime import IntArray, FloatArray, BoolArray
+    interpreter = run_code(engine, """
+        int[3] inteiros;
+        float[2] reais;
+        bool[2] flags;
+        string[2] textos;
+        inteiros[0] = 7;
+        reais[0] = 1.5;
+        flags[1] = true;
+        textos[0] = "a";
+    """)
+    
+    get = interpreter.globals.get
+    assert type(get("inteiros")) is IntArray and get("inteiros") == [7, 0, 0]
+    assert type(get("reais")) is FloatArray and get("reais") == [1.5, 0.0]
+    assert type(get("flags")) is BoolArray and get("flags").tolist() == [False, True]
+    assert get("flags")[1] is True
+    assert all(type(get(name).items) is array.array for name in ("inteiros", "reais", "flags"))
+    assert get("textos") == ["a", ""]
+
+def test_compact_arrays_print_like_lists(engine):
+    output = capture_output(engine, """
+        int[3] a;
+        bool[2] b;
+        a[2] = 4;
+        b[0] = true;
+        print(a);
+        print(b[0]);
+        print("a = " + a);
+        print(a == [0, 0, 4]);
+    """)
+    
+    assert output == "[0, 0, 4]\ntrue\na = [0, 0, 4]\ntrue"
+
+def test_values_that_do_not_fit_compact_arrays_are_kept(engine):
+    interpreter = run_code(engine, """
+        function nada() {
+        }
+        function fatorial(n) {
+            if (n <= 1) { return 1; }
+            return n * fatorial(n - 1);
+        }
+        int[3] a;
+        int[] alias = a;
+        for (int i = 0; i < 3; i = i + 1) {
+            a[i] = fatorial(19 + i);
+        }
+        int[2] b;
+        b[0] = 7 / 2;
+        float[2] f;
+        f[0] = 3;
+        bool[2] c;
+        c[1] = nada();
+    """)
+    
+    # Os mesmos valores de um array comum: o array passa a ser uma lista
+    get = interpreter.globals.get
+    assert get("alias") == [121645100408832000, 2432902008176640000, 51090942171709440000]
+    assert get("b") == [3.5, 0]
+    assert [type(value) for value in get("f")] == [int, float]
+    assert get("c").tolist() == [False, None]
+    assert type(get("a").items) is list
+
+def test_native_array_functions(engine):
+    output = capture_output(engine, """
+        int[6] a;
+        for (int i = 0; i < len(a); i = i + 1) {
+            a[i] = (i * 5) % 7;
+        }
+        int[] b = copy(a);
+        sort(b);
+        float[6] f;
+        fill(f, 0.5);
+        add(f, f, a);
+        mul(a, a, a);
+        string[] s = ["b", "c", "a"];
+        sort(s);
+        print(b);
+        print(sum(a) + " " + min(b) + " " + max(b));
+        print(f);
+        print(dot(f, b));
+        print(a);
+        print(s);
+    """)
+    
+    assert output.split("\n") == [
+        "[0, 1, 3, 4, 5, 6]",
+        "87 0 6",
+        "[0.5, 5.5, 3.5, 1.5, 6.5, 4.5]",
+        "81.5",
+        "[0, 25, 9, 1, 36, 16]",
+        "['a', 'b', 'c']",
+    ]
+
+def test_declarations_hide_native_functions(engine):
+    output = capture_output(engine, """
+        int[3] a;
+        print(len(a));
+        function len(x) {
+            return 42;
+        }
+        print(len(a));
+    """)
+    assert output == "3\n42"
+
+def test_rebinding_a_function_invalidates_call_caches(engine):
+    output = capture_output(engine, """
+        function id(x) { return x; }
+        function dobra(x) { return x * 2; }
+        function triplica(x) { return x * 3; }
+        function usa(x) { return dobra(x) + 1; }
+        
+        for (int i = 0; i < 3; i = i + 1) {
+            print(usa(i));
+            if (i == 1) {
+                dobra = triplica;
+            }
+        }
+        for (int i = 0; i < 2; i = i + 1) {
+            function local(x) { return x + i; }
+            print(local(10));
+        }
+    """)
+    
+    assert output == "1\n3\n7\n10\n11"
+    with pytest.raises(RuntimeError, match="'dobra' não é uma função"):
+        run_code(engine, """
+            function id(x) { return x; }
+            function dobra(x) { return x * 2; }
+            for (int i = 0; i < 2; i = i + 1) {
+                print(dobra(i));
+                dobra = id(0);
+            }
+        """)
+
+def test_call_sites_cache_only_global_functions():
+    ast = analyze("""
+        function soma(n) {
+            function passo(x) { return x + 1; }
+            if (n == 0) { return 0; }
+            return passo(soma(n - 1));
+        }
+        print(soma(5));
+    """)
+    interpreter = Interpreter()
+    interpreter.interpret(ast)
+    assert {node.name: callee.declaration.name
+            for node, (_, callee) in interpreter.call_sites.items()} == {'soma': 'soma'}
+    assert len(interpreter.call_sites) == 2
+
+def test_scope_in_function(engine):
+    output = capture_output(engine, """
         int global_var = 100;
         
         function test() {
@@ -200,8 +610,8 @@ def test_scope_in_function():
     assert lines[0] == "100"
     assert lines[1] == "50"
 
-def test_for_loop():
-    output = capture_output("""
+def test_for_loop(engine):
+    output = capture_output(engine, """
         for (int i = 0; i < 3; i = i + 1) {
             print(i);
         }
@@ -212,23 +622,23 @@ def test_for_loop():
     assert lines[1] == "1"
     assert lines[2] == "2"
 
-def test_division_by_zero():
+def test_division_by_zero(engine):
     with pytest.raises(RuntimeError):
-        run_code("int x = 10 / 0;")
+        run_code(engine, "int x = 10 / 0;")
 
-def test_array_index_out_of_bounds():
+def test_array_index_out_of_bounds(engine):
     with pytest.raises(RuntimeError):
-        run_code("""
+        run_code(engine, """
             int[] arr = [1, 2, 3];
             print(arr[5]);
         """)
 
-def test_undefined_variable():
+def test_undefined_variable(engine):
     with pytest.raises(Exception):  # Pode ser SemanticError ou RuntimeError
-        run_code("print(undefined_var);")
+        run_code(engine, "print(undefined_var);")
 
-def test_type_conversions():
-    output = capture_output("""
+def test_type_conversions(engine):
+    output = capture_output(engine, """
         int x = 10;
         float y = 3.14;
         print(x + y);
@@ -236,8 +646,8 @@ def test_type_conversions():
     
     assert output == "13.14"
 
-def test_complex_program():
-    output = capture_output("""
+def test_complex_program(engine):
+    output = capture_output(engine, """
         function fibonacci(n) {
             if (n <= 1) {
                 return n;
@@ -262,3 +672,179 @@ def test_complex_program():
     assert "Fibonacci(3) = 2" in lines[3]
     assert "Fibonacci(4) = 3" in lines[4]
 
+
+def test_dispatch_table_covers_all_nodes():
+    from src.ast_nodes import node_classes, Literal
+    interpreter = Interpreter()
+    for node_class in node_classes():
+        assert interpreter.dispatch[node_class].__name__ == node_class.visit_method
+    
+    # Subclasses de nós criadas depois do visitor são resolvidas na primeira visita
+    class TaggedLiteral(Literal):
+        __slots__ = ()
+    assert interpreter.visit(TaggedLiteral(7, 'int')) == 7
+    assert TaggedLiteral in interpreter.dispatch
+
+def test_dispatch_uses_overridden_methods():
+    class TracingInterpreter(Interpreter):
+        def __init__(self):
+            super().__init__()
+            self.visited = 0
+        
+        def visit_literal(self, node):
+            self.visited += 1
+            return super().visit_literal(node)
+    
+    ast = analyze("int x = 1 + 2; print(x * 3);")
+    interpreter = TracingInterpreter()
+    interpreter.interpret(ast)
+    assert interpreter.visited == 3
+
+def print_types(code):
+    """Tipos estáticos das expressões de cada print, em ordem"""
+    from src.ast_nodes import PrintStatement
+    return [stmt.expression.static_type for stmt in analyze(code).statements
+            if isinstance(stmt, PrintStatement)]
+
+def test_static_types_for_stable_variables():
+    assert print_types("""
+        int a = 2.5;
+        float b = 1;
+        string s = "x";
+        print(a + 1);
+        print(a / 2);
+        print(b * a);
+        print(s + a);
+        print(a < b);
+        print(-a);
+    """) == ['int', 'float', 'float', 'string', 'bool', 'int']
+
+def test_static_types_are_dropped_when_not_guaranteed():
+    assert print_types("""
+        int a = 1;
+        int b;
+        int c = 1;
+        function f(x) { return x; }
+        int d = f(1);
+        int e = 0;
+        print(a);
+        print(b + 1);
+        print(c);
+        print(d);
+        print(e);
+        print(f(1) + 1);
+        c = 2.5;
+        while (e < 3) { e = e + 1; }
+    """) == ['int', None, None, None, 'int', None]
+
+def test_static_types_come_from_the_variable_read_at_run_time(engine):
+    from src.ast_nodes import FunctionDeclaration
+    # O x lido por f em execução seria o string declarado depois: o programa
+    # é recusado em vez de somar com o tipo do x global
+    with pytest.raises(SemanticError):
+        run_code(engine, """
+            int x = 1;
+            { function f() { return x + 1; } string x = "s"; print(f()); }
+        """)
+    
+    code = """
+        int x = 1;
+        { string x = "s"; function f() { return x + 1; } print(f()); }
+        function g() { return x + 1; }
+        { string x = "t"; print(g()); }
+    """
+    ast = analyze(code)
+    f = [stmt for stmt in ast.statements[1].statements if type(stmt) is FunctionDeclaration][0]
+    g = ast.statements[2]
+    assert [function.body.statements[0].value.static_type for function in (f, g)] == \
+        ['string', 'int']
+    assert capture_output(engine, code).split() == ["s1", "2"]
+
+def test_static_type_fast_paths_keep_semantics(engine):
+    output = capture_output(engine, """
+        int i = 0;
+        string s = "";
+        float total = 0;
+        while (i < 3) {
+            s = s + "ab";
+            total = total + i / 2;
+            i = i + 1;
+        }
+        int j = i;
+        print(s + j + total);
+    """)
+    assert output == "ababab31.5"
+
+def test_lexical_addresses():
+    from src.ast_nodes import FunctionDeclaration
+    ast = analyze("""
+        int g = 1;
+        function f(a) {
+            for (int i = 0; i < a; i = i + 1) {
+                g = g + i;
+            }
+            return f(a - 1);
+        }
+    """)
+    assert ast.scope_names == ('g', 'f')
+    function = ast.statements[1]
+    assert isinstance(function, FunctionDeclaration) and function.slot == 1
+    # Variáveis de blocos e do for ficam no quadro da função
+    assert function.scope_names == ('a', 'i')
+    
+    assignment = function.body.statements[0].body.statements[0]
+    assert (assignment.target.depth, assignment.target.slot) == (1, 0)
+    assert (assignment.value.left.depth, assignment.value.left.slot) == (1, 0)
+    assert (assignment.value.right.depth, assignment.value.right.slot) == (0, 1)
+    
+    call = function.body.statements[1].value
+    assert (call.depth, call.slot) == (1, 1)
+
+def test_shadowing_reads_outer_variable_in_initializer(engine):
+    output = capture_output(engine, """
+        int x = 1;
+        { int x = x + 10; print(x); }
+        function f(a, b) { int a = a * 2; return a + b; }
+        print(f(3, 4));
+        print(x);
+    """)
+    assert output.split() == ["11", "10", "1"]
+
+@pytest.mark.parametrize("code", [
+    'int x = 1; { function f() { return x + 1; } string x = "s"; print(f()); }',
+    'int x = 1; function g() { function f() { return x; } int x = 2; return f(); }',
+    'int x = 1; { { function f() { x = 3; } } int x = 2; }',
+])
+def test_declarations_after_a_function_reads_the_name_are_rejected(code):
+    # A função leria a nova variável quando chamada depois da declaração
+    with pytest.raises(SemanticError, match="'x' declarada depois de ser usada por uma função"):
+        analyze(code)
+
+def test_functions_read_variables_of_their_own_scope_chain(engine):
+    output = capture_output(engine, """
+        int x = 1;
+        { string x = "s"; function f() { return x + 1; } print(f()); }
+        function h() { return x; }
+        { int x = 5; print(h()); }
+        function g() { print(x); int x = 2; print(x); }
+        g();
+    """)
+    assert output.split() == ["s1", "1", "1", "2"]
+
+def test_runtime_errors_report_source_position(engine):
+    code = """
+        function get(values, i) {
+            return values[i];
+        }
+        int[] values = [1, 2];
+        int x = 1;
+        print(get(values, 1));
+        print(x / (x - 1));
+    """
+    with pytest.raises(RuntimeError) as error:
+        run_code(engine, code)
+    assert (error.value.line, error.value.column) == (8, 15)
+    
+    with pytest.raises(RuntimeError) as error:
+        run_code(engine, code.replace("values, 1", "values, 2"))
+    assert error.value.line == 3
@@ -104,3 +104,73 @@ def test_unterminated_string_error():
         lexer.tokenize()
 
 
+
+def token_tuples(code, engine):
+    return [(t.type, t.value, t.line, t.column) for t in Lexer(code, engine).tokenize()]
+
+@pytest.mark.parametrize("code", [
+    "int x = 10 + (5 * 2); // calcula\nprint(\"Resultado: \" + x);",
+    "function f(a, b) {\n\treturn a >= b or a != 1.5;\n}\n",
+    "string s = \"linha1\nlinha2\"; bool b = not true;",
+    "x = 'a\\'b' + \"c\\\\d\\te\";\r\n  // fim",
+    "12 __a1 é3 12.5",
+])
+def test_regex_engine_matches_classic(code):
+    assert token_tuples(code, 'regex') == token_tuples(code, 'classic')
+
+@pytest.mark.parametrize("code", ["$", "x\n  !y", "int a;\n\"abc", "a = 'x\ny"])
+def test_regex_engine_error_messages(code):
+    messages = []
+    for engine in ('classic', 'regex'):
+        with pytest.raises(LexerError) as info:
+            Lexer(code, engine).tokenize()
+        messages.append(str(info.value))
+    assert messages[0] == messages[1]
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        Lexer("", "fast")
+
+@pytest.mark.parametrize("code", [
+    "",
+    "int x = 10 + (5 * 2); // calcula\nprint(\"Resultado: \" + x);",
+    "string s = 'multi\nlinha' + \"\\t\";\n\n  x",
+])
+def test_compact_stream_matches_tokens(code):
+    stream = Lexer(code).tokenize_compact()
+    compact = [(t.type, t.value, t.line, t.column) for t in stream]
+    assert compact == token_tuples(code, 'regex')
+    assert stream[-1].type == TokenType.EOF
+
+def test_compact_stream_buffers():
+    stream = Lexer("a = 1;\nb = 'x';").tokenize_compact()
+    assert stream.types.typecode == 'B'
+    assert len(stream) == len(stream.starts) == len(stream.ends) == 9
+    assert list(stream.line_starts) == [0, 7]
+    assert stream.value(6) == "x"
+    assert stream.position(6) == (2, 5)
+
+@pytest.mark.parametrize("code", ["x\n  !y", "int a;\n\"abc"])
+def test_compact_stream_errors(code):
+    with pytest.raises(LexerError) as compact:
+        Lexer(code).tokenize_compact()
+    with pytest.raises(LexerError) as regular:
+        Lexer(code).tokenize()
+    assert str(compact.value) == str(regular.value)
+
+@pytest.mark.parametrize("code", [
+    "int x = 10 + (5 * 2); // calcula\nprint(\"Resultado: \" + x);",
+    "string ação = \"olá\\tmundo\"; print(ação + 'ü');",
+    "s = 'multi\nlinhá' + é; // comentário ç\n  日本 = 1.5;",
+])
+def test_bytes_input_matches_text(code):
+    from_bytes = [(t.type, t.value, t.line, t.column) for t in Lexer(code.encode('utf-8')).tokenize()]
+    assert from_bytes == token_tuples(code, 'regex')
+
+@pytest.mark.parametrize("code", ["ação €", "x = 'olá\n  $", "é\n\"abc"])
+def test_bytes_input_errors(code):
+    with pytest.raises(LexerError) as from_bytes:
+        Lexer(code.encode('utf-8')).tokenize()
+    with pytest.raises(LexerError) as from_text:
+        Lexer(code).tokenize()
+    assert str(from_bytes.value) == str(from_text.value)
@@ -0,0 +1,75 @@
+import os
+import mmap
+import pytest
+from src import minilang
+
+def write_program(tmp_path, code, name="programa.ml"):
+    path = tmp_path / name
+    path.write_text(code, encoding="utf-8")
+    return str(path)
+
+def test_read_file_small_returns_text(tmp_path):
+    path = write_program(tmp_path, "print(1);")
+    assert minilang.read_file(path) == "print(1);"
+
+def test_read_file_large_is_memory_mapped(tmp_path, capsys):
+    path = write_program(tmp_path, "string s = \"olá\";\nprint(s + \" ação\");")
+    source = minilang.read_file(path, mmap_threshold=1)
+    try:
+        assert isinstance(source, mmap.mmap)
+        minilang.run_code(source, path)
+    finally:
+        source.close()
+    assert capsys.readouterr().out.strip() == "olá ação"
+
+def test_mapped_lexer_error_reports_character_columns(tmp_path, capsys):
+    path = write_program(tmp_path, "string ação = \"é\"; $")
+    source = minilang.read_file(path, mmap_threshold=1)
+    with pytest.raises(SystemExit):
+        minilang.run_code(source, path)
+    source.close()
+    assert "coluna 20" in capsys.readouterr().out
+
+EXAMPLES = sorted(os.listdir(os.path.join(os.path.dirname(__file__), "..", "exemplos")))
+
+@pytest.mark.parametrize("example", EXAMPLES)
+@pytest.mark.parametrize("engine", sorted(minilang.ENGINES))
+def test_examples_match_tree_interpreter(example, engine, capsys):
+    path = os.path.join(os.path.dirname(__file__), "..", "exemplos", example)
+    minilang.main(["--no-cache", path])
+    expected = capsys.readouterr().out
+    minilang.main(["--no-cache", "--engine", engine, path])
+    assert capsys.readouterr().out == expected != ""
+
+def test_disassemble_prints_bytecode_without_running(tmp_path, capsys):
+    path = write_program(tmp_path, "function f(x) { return x * 3; }\nprint(f(2));")
+    minilang.main(["--no-cache", "--disassemble", path])
+    output = capsys.readouterr().out
+    assert "Código de <programa>" in output and "Código de f" in output
+    assert "MUL" in output and "PRINT" in output
+    assert "\n6\n" not in output
+
+def test_stats_reports_optimizations(tmp_path, capsys):
+    path = write_program(tmp_path, "int x = 2 * 3;\nif (false) { print(0); }\nprint(x);")
+    minilang.main(["--stats", path])
+    captured = capsys.readouterr()
+    assert captured.out.strip() == "6"
+    assert "expressões constantes dobradas: 1" in captured.err
+    assert "constantes propagadas: 1" in captured.err
+    assert "desvios mortos removidos: 1" in captured.err
+
+def test_memoize_reports_hits_with_stats(tmp_path, capsys):
+    path = write_program(tmp_path, """
+        function fibonacci(n) {
+            if (n <= 1) {
+                return n;
+            }
+            return fibonacci(n - 1) + fibonacci(n - 2);
+        }
+        print(fibonacci(10));
+    """)
+    minilang.main(["--memoize", "--memoize-size", "4", "--stats", path])
+    captured = capsys.readouterr()
+    assert captured.out.strip() == "55"
+    assert "Memoização (até 4 resultados por função):" in captured.err
+    assert "fibonacci: 8 acertos, 11 faltas, 4 guardados" in captured.err
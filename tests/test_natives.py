@@ -0,0 +1,94 @@
+import pytest
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.purity import PurityAnalyzer
+from src.minilang import ENGINES
+from src.ast_nodes import ForStatement, FunctionDeclaration
+from src.natives import NATIVES
+from src.errors import SemanticError, RuntimeError
+
+def analyze(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def test_natives_have_signatures():
+    assert sorted(NATIVES) == ['add', 'copy', 'dot', 'fill', 'len', 'max', 'min', 'mul',
+                               'sort', 'sum']
+    assert NATIVES['len'].parameters == ('array',)
+    assert not NATIVES['sort'].pure and NATIVES['sum'].pure
+
+@pytest.mark.parametrize("code, message", [
+    ("int x = 1; print(len(x));", "'len' espera um array"),
+    ("int[2] a; print(len(a, a));", "'len' espera 1 argumento"),
+    ("string[2] s; print(sum(s));", "'sum' espera um array de números"),
+    ("int[2] a; fill(a, \"x\");", "Tipos incompatíveis: int e string"),
+    ("int[2] a; string s = min(a);", "Tipos incompatíveis"),
+])
+def test_native_calls_are_checked_by_signature(code, message):
+    with pytest.raises(SemanticError, match=message):
+        analyze(code)
+
+def test_native_result_types():
+    analyze("""
+        int[3] a;
+        float[3] f;
+        int[] b = copy(a);
+        int n = len(a) + sum(a) + max(a);
+        float x = dot(f, a) + min(f);
+    """)
+
+@pytest.mark.parametrize("code, message", [
+    ("function id(x) { return x; }\nprint(len(id(1)));", "'len' espera um array"),
+    ("int[0] a;\nprint(min(a));", "'min' de array vazio"),
+    ("int[2] a;\nint[3] b;\nprint(dot(a, b));", "'dot' espera arrays do mesmo tamanho"),
+    ("function id(x) { return x; }\nint[2] a;\nadd(a, a, id(1));", "'add' espera um array"),
+])
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_native_runtime_errors_report_the_call(code, message, engine):
+    with pytest.raises(RuntimeError, match=message) as error:
+        ENGINES[engine]().interpret(analyze(code))
+    assert error.value.line == code.count("\n") + 1
+
+def test_native_calls_are_not_tail_calls_and_keep_purity():
+    ast = analyze("""
+        function tamanho(a) { return len(a); }
+        function ordena(a) { sort(a); return 0; }
+    """)
+    PurityAnalyzer().analyze(ast)
+    tamanho, ordena = [node for node in ast.statements if type(node) is FunctionDeclaration]
+    assert not tamanho.body.statements[0].value.tail
+    assert tamanho.pure and not ordena.pure
+
+def test_len_of_unchanged_array_is_an_invariant_bound():
+    ast = analyze("""
+        int[4] a;
+        int[] b = [1, 2];
+        for (int i = 0; i < len(a); i = i + 1) { a[i] = i; }
+        for (int i = 0; i < len(b); i = i + 1) { b = a; }
+    """)
+    loops = [node for node in ast.statements if type(node) is ForStatement]
+    assert [loop.step for loop in loops] == [1, None]
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_natives_keep_values_that_do_not_fit_compact_arrays(engine, capsys):
+    ENGINES[engine]().interpret(analyze("""
+        int[3] a;
+        float[2] f;
+        fill(a, 2.5);
+        a[1] = 99999999999999999999;
+        sort(a);
+        int[] b = copy(a);
+        b[0] = 1;
+        fill(f, 3);
+        print(a);
+        print(sum(a) + " " + max(b));
+        print(f);
+    """))
+    assert capsys.readouterr().out.split("\n") == [
+        "[2.5, 2.5, 99999999999999999999]",
+        "1e+20 99999999999999999999",
+        "[3, 3]",
+        "",
+    ]
@@ -0,0 +1,108 @@
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.optimizer import Optimizer
+from src.ast_nodes import BinaryOp, Identifier, VarDeclaration, PrintStatement, Block
+from src.minilang import compile_source
+
+def optimize(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(ast)
+    stats = Optimizer(analyzer).optimize(ast)
+    return ast, stats
+
+def initializer(ast, index=0):
+    return ast.statements[index].initializer
+
+def test_folds_arithmetic_and_strings():
+    ast, stats = optimize('int a = 2 * 3 + 4; string s = "a" + "b" + 1; bool b = not (1 < 2);')
+    assert [initializer(ast, i).value for i in range(3)] == [10, "ab1", False]
+    assert [initializer(ast, i).type for i in range(3)] == ['int', 'string', 'bool']
+    assert stats.folded == 6
+
+def test_never_folds_expressions_that_fail():
+    ast, stats = optimize("float a = 1 / 0; int b = 5 % 0;")
+    assert type(initializer(ast, 0)) is BinaryOp
+    assert type(initializer(ast, 1)) is BinaryOp
+    assert stats.folded == 0
+
+def test_propagates_constants_never_reassigned():
+    ast, stats = optimize("""
+        int n = 4;
+        float half = 1;
+        int m = 1;
+        m = 2;
+        int a = n * 2;
+        float b = half;
+        int c = m;
+    """)
+    assert initializer(ast, 4).value == 8
+    assert initializer(ast, 5).value == 1.0 and initializer(ast, 5).type == 'float'
+    assert type(initializer(ast, 6)) is Identifier
+    assert stats.propagated == 2
+
+def test_shadowed_initializer_reads_outer_constant():
+    ast, _ = optimize("int x = 1; { int x = x + 1; print(x); }")
+    block = ast.statements[1]
+    assert block.statements[0].initializer.value == 2
+    assert block.statements[1].expression.value == 2
+
+def test_removes_dead_branches():
+    ast, stats = optimize("""
+        bool debug = false;
+        if (debug) { print(1); } else { print(2); }
+        if (true) print(3);
+        while (debug) { print(4); }
+        for (int i = 0; 1 > 2; i = i + 1) { print(i); }
+    """)
+    kinds = [type(statement) for statement in ast.statements]
+    assert kinds == [VarDeclaration, Block, PrintStatement, Block]
+    assert ast.statements[1].statements[0].expression.value == 2
+    assert stats.branches == 4
+
+def test_removes_statements_after_return():
+    ast, stats = optimize("""
+        function f(k) {
+            if (k > 1) {
+                return 1;
+                print("a");
+            } else {
+                return 2;
+            }
+            print("b");
+        }
+    """)
+    body = ast.statements[0].body.statements
+    assert len(body) == 1
+    assert len(body[0].then_stmt.statements) == 1
+    assert stats.unreachable == 2
+
+def test_pipeline_reanalyzes_optimized_program(capsys):
+    from src.interpreter import Interpreter
+    ast = compile_source("""
+        int n = 3;
+        if (n > 5) { int unused = 1; }
+        int total = 0;
+        for (int i = 0; i < n; i = i + 1) { total = total + i; }
+        print(total);
+    """)
+    assert ast.scope_names == ('n', 'total', 'i')
+    Interpreter().interpret(ast)
+    assert capsys.readouterr().out.strip() == "3"
+
+def test_folds_logical_operators_with_constant_left_side():
+    ast, stats = optimize("""
+        function f(x) { print(x); return x; }
+        bool p = true;
+        p = false;
+        bool a = false and f(true);
+        bool b = true or f(false);
+        bool c = true and p;
+        bool d = false or f(true);
+    """)
+    assert [initializer(ast, i).value for i in (3, 4)] == [False, True]
+    assert type(initializer(ast, 5)) is Identifier
+    # f(true) não tem tipo estático: o or continua convertendo o valor
+    assert type(initializer(ast, 6)) is BinaryOp
+    assert stats.folded == 3
@@ -1,8 +1,8 @@
 import pytest
-from src.lexer import Lexer
-from src.parser import Parser
+from src.lexer import Lexer, TokenType
+from src.parser import Parser, StreamingParser
 from src.ast_nodes import *
-from src.errors import ParserError
+from src.errors import ParserError, LexerError
 
 def parse_code(code):
     lexer = Lexer(code)
@@ -10,6 +10,20 @@ def parse_code(code):
     parser = Parser(tokens)
     return parser.parse()
 
+def dump(node):
+    """Representação estrutural de uma AST, para comparar parsers"""
+    if isinstance(node, list):
+        return [dump(item) for item in node]
+    if isinstance(node, (ASTNode, Parameter)):
+        fields = {}
+        for cls in type(node).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(node, name):
+                    fields[name] = getattr(node, name)
+        fields.update(getattr(node, '__dict__', {}))
+        return (type(node).__name__, {name: dump(value) for name, value in sorted(fields.items())})
+    return node
+
 def test_simple_variable_declaration():
     ast = parse_code("int x = 10;")
     assert isinstance(ast, Program)
@@ -143,3 +157,101 @@ def test_unmatched_parentheses():
     with pytest.raises(ParserError):
         parse_code("int x = (10 + 5;")  # Parênteses não fechados
 
+
+STREAMING_PROGRAMS = [
+    "int x = 10; float y = x * 2.5 - 1;",
+    "function f(int a, b) { if (a > b) { return a; } else return b; }",
+    "int[3] v; for (int i = 0; i < 3; i = i + 1) v[i] = f(i, -i)[0];",
+    "while (not (x == 1 or y != 2)) { print(\"oi\" + x); x = x + 1; }",
+]
+
+@pytest.mark.parametrize("code", STREAMING_PROGRAMS)
+def test_streaming_parser_matches_list_parser(code):
+    streamed = StreamingParser(Lexer(code).iter_tokens()).parse()
+    assert dump(streamed) == dump(parse_code(code))
+
+def test_streaming_parser_bounded_lookahead():
+    code = "int x = 0;\n" + "x = x + (1 * 2) - 3;\n" * 2000
+    parser = StreamingParser(Lexer(code).iter_tokens())
+    largest = 0
+    for _ in parser.iter_statements():
+        largest = max(largest, len(parser.buffer))
+    assert largest <= 2
+
+def test_streaming_parser_yields_before_lexing_finishes():
+    parser = StreamingParser(Lexer("int x = 1;\nint y = $;").iter_tokens())
+    statements = parser.iter_statements()
+    first = next(statements)
+    assert isinstance(first, VarDeclaration) and first.name == "x"
+    with pytest.raises(LexerError):
+        next(statements)
+
+def test_streaming_parser_error():
+    with pytest.raises(ParserError):
+        StreamingParser(Lexer("int x = (10 + 5;").iter_tokens()).parse()
+
+@pytest.mark.parametrize("code", STREAMING_PROGRAMS)
+def test_parser_over_compact_stream(code):
+    compact = Parser(Lexer(code).tokenize_compact()).parse()
+    assert dump(compact) == dump(parse_code(code))
+
+def test_precedence_table():
+    expr = parse_code("x = a or b and c == d < e + f * -g;").statements[0].value
+    assert expr.operator == "or"
+    assert expr.right.operator == "and"
+    assert expr.right.right.operator == "=="
+    assert expr.right.right.right.operator == "<"
+    assert expr.right.right.right.right.operator == "+"
+    product = expr.right.right.right.right.right
+    assert product.operator == "*"
+    assert isinstance(product.right, UnaryOp)
+
+def test_left_associativity():
+    expr = parse_code("x = a - b - c;").statements[0].value
+    assert expr.operator == "-"
+    assert isinstance(expr.left, BinaryOp) and expr.left.left.name == "a"
+    assert expr.right.name == "c"
+
+def test_statement_dispatch_table():
+    parser = Parser(Lexer("").tokenize())
+    assert parser.statement_parsers[TokenType.WHILE] == parser.parse_while_statement
+    assert parser.statement_parsers[TokenType.BOOL] == parser.parse_declaration
+    assert TokenType.IDENTIFIER not in parser.statement_parsers
+
+def test_statement_kinds():
+    ast = parse_code("""
+        int a = 1; float[2] f; function g() { return; }
+        if (a) { } else print(a);
+        while (a) a = a;
+        for (; ;) { }
+        { g(); }
+    """)
+    kinds = [type(stmt).__name__ for stmt in ast.statements]
+    assert kinds == ["VarDeclaration", "ArrayDeclaration", "FunctionDeclaration", "IfStatement",
+                     "WhileStatement", "ForStatement", "Block"]
+
+def test_ast_nodes_have_no_instance_dict():
+    ast = parse_code("""
+        function f(int a) { return -a; }
+        int[2] v; v[0] = f(1) + 2.5; f(2);
+        if (true) { print([1][0]); } else while (false) { }
+        for (int i = 0; i < 1; i = i + 1) print("s");
+    """)
+    stack = [ast]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        seen.add(type(node).__name__)
+        assert not hasattr(node, "__dict__")
+        for name in dump(node)[1]:
+            value = getattr(node, name)
+            values = value if isinstance(value, list) else [value]
+            stack.extend(item for item in values if isinstance(item, (ASTNode, Parameter)))
+    assert len(seen) == 20
+
+def test_nodes_without_accept_cannot_be_created():
+    class Incompleto(Expression):
+        __slots__ = ()
+    
+    with pytest.raises(TypeError, match="accept"):
+        Incompleto()
@@ -0,0 +1,126 @@
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.purity import PurityAnalyzer
+from src.runtime import MemoCache, new_array
+
+def pure_functions(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return {declaration.name for declaration in PurityAnalyzer().analyze(ast)}
+
+def test_recursive_functions_of_their_arguments_are_pure():
+    assert pure_functions("""
+        function fibonacci(n) {
+            if (n <= 1) {
+                return n;
+            }
+            return fibonacci(n - 1) + fibonacci(n - 2);
+        }
+
+        function soma(n) {
+            int total = 0;
+            for (int i = 0; i < n; i = i + 1) {
+                total = total + fibonacci(i);
+            }
+            return total;
+        }
+    """) == {'fibonacci', 'soma'}
+
+def test_side_effects_and_outer_variables_make_functions_impure():
+    assert pure_functions("""
+        int contador = 0;
+        int[3] valores;
+
+        function mostra(x) {
+            print(x);
+            return x;
+        }
+
+        function conta(x) {
+            contador = contador + 1;
+            return x;
+        }
+
+        function le(x) {
+            return x + contador;
+        }
+
+        function altera(a) {
+            a[0] = 1;
+            return 0;
+        }
+
+        function local(x) {
+            int y = x * 2;
+            return y;
+        }
+    """) == {'local'}
+
+def test_calling_impure_or_reassigned_functions_is_impure():
+    assert pure_functions("""
+        function mostra(x) {
+            print(x);
+            return x;
+        }
+
+        function dobra(x) {
+            return x * 2;
+        }
+
+        function usa_mostra(x) {
+            return mostra(x);
+        }
+
+        function usa_dobra(x) {
+            return dobra(x);
+        }
+
+        function troca(f) {
+            dobra = f;
+        }
+    """) == {'dobra'}
+
+def test_functions_that_declare_closures_are_impure():
+    assert pure_functions("""
+        function mk(x) {
+            int c = 0;
+            function g() {
+                c = c + 1;
+                return c;
+            }
+            return g;
+        }
+
+        function usa(x) {
+            return mk(x);
+        }
+    """) == set()
+
+def test_memo_cache_evicts_least_recently_used():
+    memo = MemoCache('f', limit=2)
+    calls = []
+    def run(arguments):
+        calls.append(arguments[0])
+        return arguments[0] * 2
+
+    assert [memo.call(run, [x]) for x in (1, 2, 1, 3, 2, 1)] == [2, 4, 2, 6, 4, 2]
+    # 2 foi descartado ao guardar 3, e 1 ao guardar 2 de novo
+    assert calls == [1, 2, 3, 2, 1]
+    assert (memo.hits, memo.misses) == (1, 5)
+    assert len(memo.entries) == 2
+
+def test_memo_cache_keys_on_argument_types_and_skips_arrays():
+    memo = MemoCache('f')
+    run = lambda arguments: arguments[0]
+    assert [memo.call(run, [x]) for x in (1, 1.0, True)] == [1, 1.0, True]
+    assert [type(memo.call(run, [x])) for x in (1, 1.0, True)] == [int, float, bool]
+    assert memo.call(run, [[1, 2]]) == [1, 2]
+    assert memo.call(run, [new_array('int', 2, 0, 0)]) == [0, 0]
+    assert (memo.hits, memo.misses) == (3, 3)
+
+def test_memo_cache_keeps_the_sign_of_zero():
+    memo = MemoCache('f')
+    run = lambda arguments: arguments[0]
+    assert [str(memo.call(run, [x])) for x in (0.0, -0.0, 0.0, -0.0)] == ['0.0', '-0.0', '0.0', '-0.0']
+    assert (memo.hits, memo.misses) == (2, 2)
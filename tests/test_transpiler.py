@@ -0,0 +1,128 @@
+import pytest
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+from src.transpiler import PythonTranspiler
+from src.errors import RuntimeError
+
+def analyze(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+def translate(code):
+    return PythonTranspiler().translate(analyze(code))
+
+def run(code, capsys):
+    transpiler = PythonTranspiler()
+    transpiler.interpret(analyze(code))
+    return transpiler, capsys.readouterr().out.split()
+
+def test_functions_and_loops_become_python_constructs():
+    source = translate("""
+        function soma(n) {
+            int total = 0;
+            for (int i = 0; i < n; i = i + 1) {
+                total = total + i;
+            }
+            return total;
+        }
+        function pares(n) {
+            int total = 0;
+            for (int i = 0; i < n; i = i + 1) {
+                i = i + 1;
+                total = total + 1;
+            }
+            return total;
+        }
+        print(soma(4) + pares(4));
+    """)
+    assert "def soma_0_0(n_1_0=None, *_):" in source
+    assert "while i_1_2 < n_1_0:" in source
+    assert "_t1 = counted_values(i_1_2, n_1_0, '<', 1)" in source
+    assert "for i_1_2 in _t1:" in source
+    assert "total_1_1 = total_1_1 + i_1_2" in source
+    compile(source, "<teste>", "exec")
+
+def test_outer_assignments_use_nonlocal(capsys):
+    code = """
+        int count = 0;
+        function counter() {
+            int calls = 0;
+            function tick() {
+                calls = calls + 1;
+                count = count + calls;
+                return calls;
+            }
+            tick();
+            return tick();
+        }
+        print(counter());
+    """
+    assert "nonlocal calls_1_0, count_0_0" in translate(code)
+    transpiler, output = run(code, capsys)
+    assert output == ["2"]
+    assert transpiler.globals.get("count") == 3
+
+def test_comparisons_are_not_chained(capsys):
+    source = translate("bool a = 1 < 2 == true; print(a);")
+    assert "(1 < 2) == True" in source
+    assert run("print(1 < 2 == true);", capsys)[1] == ["true"]
+
+def test_only_needed_parentheses(capsys):
+    source = translate("int x = 1; print(x - (x - 1) * 2 - x % 3 * 4);")
+    assert "x_0_0 - (x_0_0 - 1) * 2 - x_0_0 % 3 * 4" in source
+    long_sum = " + ".join(["x"] * 300)
+    assert run(f"int x = 1; print({long_sum});", capsys)[1] == ["300"]
+
+def test_logical_operators_use_python_short_circuit(capsys):
+    code = """
+        function side(v) { print(v); return v; }
+        bool a = true;
+        bool b = false;
+        print(side(false) and side(true));
+        print(side(true) or side(false));
+        print(not a or b and a);
+    """
+    assert "not a_0_1 or b_0_2 and a_0_1" in translate(code)
+    _, output = run(code, capsys)
+    assert output == ["false", "false", "true", "true", "false"]
+
+def test_missing_and_extra_arguments(capsys):
+    _, output = run("""
+        function f(a, b) { print(b); return a; }
+        print(f(1));
+        print(f(1, 2, 3));
+    """, capsys)
+    assert output == ["null", "1", "2", "1"]
+
+def test_errors_keep_source_position():
+    with pytest.raises(RuntimeError) as error:
+        PythonTranspiler().interpret(analyze("int[] a = [1];\n\na[1] = 2;"))
+    assert error.value.line == 3
+    
+    with pytest.raises(RuntimeError) as error:
+        PythonTranspiler().interpret(analyze("float x = 1.0;\nprint(x / 0.0);"))
+    assert "Divisão por zero" in str(error.value)
+    assert error.value.line == 2
+
+def nested_loops(depth):
+    loops = "".join(f"for (int i{n} = 0; i{n} < 2; i{n} = i{n} + 2) {{\n" for n in range(depth))
+    return f"int count = 0;\n{loops}count = count + 1;\n{'}' * depth}\nprint(count);"
+
+def test_deeply_nested_loops_still_run(capsys):
+    compile(translate(nested_loops(20)), "<teste>", "exec")
+    assert run(nested_loops(20), capsys)[1] == ["1"]
+    
+    # Acima do limite do CPython, o programa executa no motor closure
+    with pytest.raises(SyntaxError, match="too many statically nested blocks"):
+        compile(translate(nested_loops(21)), "<teste>", "exec")
+    transpiler, output = run(nested_loops(21), capsys)
+    assert output == ["1"]
+    assert transpiler.globals.get("count") == 1
+
+def test_globals_are_exported_after_errors():
+    transpiler = PythonTranspiler()
+    with pytest.raises(RuntimeError):
+        transpiler.interpret(analyze("int x = 1;\nx = 2;\nprint(x / 0);"))
+    assert transpiler.globals.get("x") == 2